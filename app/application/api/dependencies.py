@@ -0,0 +1,10 @@
+from fastapi import Depends
+
+from punq import Container
+
+from logic.init import init_container
+from logic.mediator.base import Mediator
+
+
+async def get_mediator(container: Container = Depends(init_container)) -> Mediator:
+    return container.resolve(Mediator)
@@ -1,26 +1,160 @@
-from infra.message_brokers.base import BaseMessageBroker
-from logic.events.messages import NewMessageReceivedFromBrokerEvent
+import asyncio
+import logging
+
+from infra.integrations.notifications.delivery import NotificationDeliveryWorker
+from infra.message_brokers.base import (
+    BaseMessageBroker,
+    BrokerRecord,
+)
+from infra.message_brokers.codecs import EventCodecRegistry
+from infra.message_brokers.converters import get_record_chat_oid
+from infra.message_brokers.outbox import OutboxRelay
+from infra.metrics import MetricsRegistry
+from infra.repositories.messages.base import BaseMessagesRepository
+from infra.repositories.messages.batching import BatchingMessagesRepository
+from infra.repositories.messages.mongo import MongoDBChatsRepository
+from infra.repositories.mongo import MongoDBIndexManager
+from infra.websockets.managers import BaseConnectionManager
+from infra.workers import KeyedWorkerPool
+from logic.events.messages import (
+    ChatDeletedFromBrokerEvent,
+    ChatListenersNotificationEvent,
+    MessageRecordReceivedFromBrokerEvent,
+)
 from logic.init import init_container
 from logic.mediator.base import Mediator
 from settings.config import Config
 
 
+logger = logging.getLogger(__name__)
+
+
 async def init_message_broker():
     container = init_container()
     message_broker: BaseMessageBroker = container.resolve(BaseMessageBroker)
     await message_broker.start()
 
 
+async def warm_up_mediator():
+    # Builds the mediator with all of its handlers once, so the first requests don't pay for it.
+    container = init_container()
+    container.resolve(Mediator)
+
+
+async def init_mongodb_indexes():
+    container = init_container()
+    config: Config = container.resolve(Config)
+
+    if not config.mongodb_ensure_indexes:
+        return
+
+    index_manager: MongoDBIndexManager = container.resolve(MongoDBIndexManager)
+
+    for report in await index_manager.ensure_indexes():
+        if report.created:
+            logger.info('Created indexes on %s: %s', report.collection_name, report.created)
+
+        if report.extra:
+            logger.warning('Undeclared indexes on %s: %s', report.collection_name, report.extra)
+
+        if not report.is_consistent:
+            logger.error(
+                'Indexes on %s are inconsistent: conflicting=%s, failed=%s',
+                report.collection_name,
+                report.conflicting,
+                report.failed,
+            )
+
+
+async def move_embedded_chat_listeners():
+    container = init_container()
+    config: Config = container.resolve(Config)
+
+    if not config.mongodb_move_embedded_listeners:
+        return
+
+    chats_repository: MongoDBChatsRepository = container.resolve(MongoDBChatsRepository)
+
+    moved_count = await chats_repository.move_embedded_listeners()
+
+    if moved_count:
+        logger.info('Moved %s embedded chat listeners to their own collection', moved_count)
+
+
 async def consume_in_background():
     container = init_container()
     config: Config = container.resolve(Config)
     message_broker: BaseMessageBroker = container.resolve(BaseMessageBroker)
 
     mediator: Mediator = container.resolve(Mediator)
+    metrics_registry: MetricsRegistry = container.resolve(MetricsRegistry)
+    event_codecs: EventCodecRegistry = container.resolve(EventCodecRegistry)
+    topic = config.new_messages_received_topic
+
+    async def handle_record(item: tuple[str, BrokerRecord]):
+        chat_oid, record = item
+
+        # JSON records reach websockets exactly as they were produced, other encodings are transcoded to JSON.
+        await mediator.publish([
+            MessageRecordReceivedFromBrokerEvent(chat_oid=chat_oid, payload=event_codecs.to_json(record)),
+        ])
+
+    # Records of one chat stay on one worker, so they are delivered in order while other chats proceed.
+    worker_pool = KeyedWorkerPool(
+        handle=handle_record,
+        workers_count=config.consumer_workers_count,
+        max_in_flight=config.consumer_max_in_flight,
+        metrics=metrics_registry.get_consumer_metrics(topic),
+    )
+    worker_pool.start()
+
+    connection_manager: BaseConnectionManager = container.resolve(BaseConnectionManager)
+    routes_locally = config.websocket_routing_mode == 'local'
+
+    try:
+        async for record in message_broker.start_consuming_records(topic):
+            worker_pool.metrics.lag = message_broker.get_consumer_lag(topic)
+            chat_oid = get_record_chat_oid(record, event_codecs=event_codecs)
+
+            # Chats nobody here listens to are dropped on the key alone, before their payload is touched.
+            if routes_locally and not connection_manager.has_connections(chat_oid):
+                worker_pool.metrics.skipped += 1
+                continue
+
+            await worker_pool.submit(key=chat_oid, item=(chat_oid, record))
+    finally:
+        await worker_pool.close()
+
+
+async def consume_chat_deleted_in_background():
+    container = init_container()
+    config: Config = container.resolve(Config)
+    message_broker: BaseMessageBroker = container.resolve(BaseMessageBroker)
+
+    mediator: Mediator = container.resolve(Mediator)
+    event_codecs: EventCodecRegistry = container.resolve(EventCodecRegistry)
 
-    async for msg in message_broker.start_consuming(config.new_messages_received_topic):
+    async for record in message_broker.start_consuming_records(config.chat_deleted_topic):
+        msg = event_codecs.decode(record)
+        await mediator.publish([ChatDeletedFromBrokerEvent(chat_oid=msg['chat_oid'])])
+
+
+async def deliver_notifications_in_background():
+    container = init_container()
+    config: Config = container.resolve(Config)
+    message_broker: BaseMessageBroker = container.resolve(BaseMessageBroker)
+
+    mediator: Mediator = container.resolve(Mediator)
+    event_codecs: EventCodecRegistry = container.resolve(EventCodecRegistry)
+
+    # A shared consumer group makes every message notify listeners once, however many instances run.
+    async for record in message_broker.start_consuming_records(
+        config.new_messages_received_topic,
+        group_id=config.notifications_consumer_group,
+    ):
+        msg = event_codecs.decode(record)
         await mediator.publish([
-            NewMessageReceivedFromBrokerEvent(
+            ChatListenersNotificationEvent(
                 message_text=msg['message_text'],
                 message_oid=msg['message_oid'],
                 chat_oid=msg['chat_oid'],
@@ -28,7 +162,71 @@ async def consume_in_background():
         ])
 
 
+async def relay_outbox_in_background():
+    container = init_container()
+    outbox_relay: OutboxRelay = container.resolve(OutboxRelay)
+
+    await outbox_relay.run()
+
+
+async def refresh_presence_in_background():
+    container = init_container()
+    config: Config = container.resolve(Config)
+    connection_manager: BaseConnectionManager = container.resolve(BaseConnectionManager)
+
+    while True:
+        await asyncio.sleep(config.websocket_presence_ttl_seconds / 3)
+
+        try:
+            await connection_manager.refresh_presence()
+        except Exception:
+            logger.warning('Failed to refresh websocket presence', exc_info=True)
+
+
+async def send_websocket_heartbeats_in_background():
+    container = init_container()
+    config: Config = container.resolve(Config)
+    connection_manager: BaseConnectionManager = container.resolve(BaseConnectionManager)
+
+    while True:
+        await asyncio.sleep(config.websocket_heartbeat_interval_seconds)
+
+        try:
+            await connection_manager.send_heartbeats()
+        except Exception:
+            logger.warning('Failed to send websocket heartbeats', exc_info=True)
+
+
+async def clear_presence():
+    container = init_container()
+    config: Config = container.resolve(Config)
+
+    if config.websocket_presence_enabled:
+        connection_manager: BaseConnectionManager = container.resolve(BaseConnectionManager)
+        await connection_manager.clear_presence()
+
+
 async def close_message_broker():
     container = init_container()
     message_broker: BaseMessageBroker = container.resolve(BaseMessageBroker)
     await message_broker.close()
+
+
+async def close_messages_repository():
+    container = init_container()
+    messages_repository: BaseMessagesRepository = container.resolve(BaseMessagesRepository)
+
+    if isinstance(messages_repository, BatchingMessagesRepository):
+        await messages_repository.close()
+
+
+async def close_notification_worker():
+    container = init_container()
+    config: Config = container.resolve(Config)
+
+    if not config.telegram_notifications_enabled:
+        return
+
+    notification_worker: NotificationDeliveryWorker = container.resolve(NotificationDeliveryWorker)
+    await notification_worker.close()
+    await notification_worker.client.close()
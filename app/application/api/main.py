@@ -6,27 +6,65 @@ from aiojobs import Scheduler
 from punq import Container
 
 from application.api.lifespan import (
+    clear_presence,
     close_message_broker,
+    close_messages_repository,
+    close_notification_worker,
+    consume_chat_deleted_in_background,
     consume_in_background,
+    deliver_notifications_in_background,
     init_message_broker,
+    init_mongodb_indexes,
+    move_embedded_chat_listeners,
+    refresh_presence_in_background,
+    relay_outbox_in_background,
+    send_websocket_heartbeats_in_background,
+    warm_up_mediator,
 )
 from application.api.messages.handlers import router as message_router
 from application.api.messages.websockets.messages import router as message_ws_router
+from application.api.metrics.handlers import router as metrics_router
 from logic.init import init_container
+from settings.config import Config
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    await init_mongodb_indexes()
+    await move_embedded_chat_listeners()
     await init_message_broker()
+    await warm_up_mediator()
 
     container: Container = init_container()
     scheduler = container.resolve(Scheduler)
+    config: Config = container.resolve(Config)
 
-    job = await scheduler.spawn(consume_in_background())
+    jobs = [await scheduler.spawn(consume_in_background())]
+
+    if config.chats_cache_enabled:
+        jobs.append(await scheduler.spawn(consume_chat_deleted_in_background()))
+
+    if config.outbox_enabled:
+        jobs.append(await scheduler.spawn(relay_outbox_in_background()))
+
+    if config.telegram_notifications_enabled:
+        jobs.append(await scheduler.spawn(deliver_notifications_in_background()))
+
+    if config.websocket_presence_enabled:
+        jobs.append(await scheduler.spawn(refresh_presence_in_background()))
+
+    if config.websocket_idle_timeout_seconds:
+        jobs.append(await scheduler.spawn(send_websocket_heartbeats_in_background()))
 
     yield
+    await close_messages_repository()
     await close_message_broker()
-    await job.close()
+
+    for job in jobs:
+        await job.close()
+
+    await close_notification_worker()
+    await clear_presence()
 
 
 def create_app() -> FastAPI:
@@ -39,5 +77,6 @@ def create_app() -> FastAPI:
     )
     app.include_router(message_router, prefix='/chats')
     app.include_router(message_ws_router, prefix='/chats')
+    app.include_router(metrics_router, prefix='/metrics')
 
     return app
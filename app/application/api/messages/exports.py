@@ -0,0 +1,38 @@
+from typing import AsyncIterator
+
+import orjson
+
+from domain.entities.messages import Message
+
+
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+
+
+def convert_message_to_ndjson_line(message: Message) -> bytes:
+    return orjson.dumps(
+        {
+            'oid': message.oid,
+            'text': message.text.as_generic_type(),
+            'created_at': message.created_at,
+            'chat_oid': message.chat_oid,
+        },
+        option=orjson.OPT_APPEND_NEWLINE,
+    )
+
+
+async def encode_messages_as_ndjson(
+    messages: AsyncIterator[Message],
+    lines_per_chunk: int = 100,
+) -> AsyncIterator[bytes]:
+    # Lines are sent in small chunks instead of one by one, so each body message carries more than a single line.
+    lines = []
+
+    async for message in messages:
+        lines.append(convert_message_to_ndjson_line(message))
+
+        if len(lines) >= lines_per_chunk:
+            yield b''.join(lines)
+            lines.clear()
+
+    if lines:
+        yield b''.join(lines)
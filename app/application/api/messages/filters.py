@@ -1,22 +1,60 @@
 from pydantic import BaseModel
 
 from infra.repositories.filters.messages import (
+    CountMode,
     GetAllChatsFilters as GetAllChatsInfraFilters,
+    GetChatListenersFilters as GetChatListenersInfraFilters,
     GetMessagesFilters as GetMessagesInfraFilters,
+    MessagesCursor,
 )
+from logic.exceptions.messages import (
+    InvalidMessagesCursorException,
+    MessagesCursorsConflictException,
+)
+
+
+def decode_messages_cursor(cursor: str | None) -> MessagesCursor | None:
+    if cursor is None:
+        return None
+
+    try:
+        return MessagesCursor.decode(cursor)
+    except ValueError:
+        raise InvalidMessagesCursorException(cursor=cursor)
 
 
 class GetMessagesFilters(BaseModel):
     limit: int = 10
     offset: int = 0
+    before: str | None = None
+    after: str | None = None
+    count: CountMode = CountMode.estimated
 
     def to_infra(self):
-        return GetMessagesInfraFilters(limit=self.limit, offset=self.offset)
+        if self.before is not None and self.after is not None:
+            raise MessagesCursorsConflictException()
+
+        return GetMessagesInfraFilters(
+            limit=self.limit,
+            offset=self.offset,
+            before=decode_messages_cursor(self.before),
+            after=decode_messages_cursor(self.after),
+            count=self.count,
+        )
 
 
 class GetAllChatsFilters(BaseModel):
     limit: int = 10
     offset: int = 0
+    count: CountMode = CountMode.estimated
+
+    def to_infra(self):
+        return GetAllChatsInfraFilters(limit=self.limit, offset=self.offset, count=self.count)
+
+
+class GetChatListenersFilters(BaseModel):
+    limit: int = 100
+    offset: int = 0
 
     def to_infra(self):
-        return GetAllChatsInfraFilters(limit=self.limit, offset=self.offset)
+        return GetChatListenersInfraFilters(limit=self.limit, offset=self.offset)
@@ -3,12 +3,20 @@ from fastapi import (
     status,
 )
 from fastapi.exceptions import HTTPException
+from fastapi.responses import (
+    ORJSONResponse,
+    StreamingResponse,
+)
 from fastapi.routing import APIRouter
 
-from punq import Container
-
+from application.api.dependencies import get_mediator
+from application.api.messages.exports import (
+    encode_messages_as_ndjson,
+    NDJSON_MEDIA_TYPE,
+)
 from application.api.messages.filters import (
     GetAllChatsFilters,
+    GetChatListenersFilters,
     GetMessagesFilters,
 )
 from application.api.messages.schemas import (
@@ -19,10 +27,12 @@ from application.api.messages.schemas import (
     CreateChatRequestSchema,
     CreateChatResponseSchema,
     CreateMessageResponseSchema,
+    CreateMessagesBatchItemSchema,
+    CreateMessagesBatchResponseSchema,
+    CreateMessagesBatchSchema,
     CreateMessageSchema,
     GetAllChatsQueryResponseSchema,
     GetMessagesQueryResponseSchema,
-    MessageDetailSchema,
 )
 from application.api.schemas import ErrorSchema
 from domain.exceptions.base import ApplicationException
@@ -30,11 +40,12 @@ from logic.commands.messages import (
     AddTelegramListenerCommand,
     CreateChatCommand,
     CreateMessageCommand,
+    CreateMessagesBatchCommand,
     DeleteChatCommand,
 )
-from logic.init import init_container
 from logic.mediator.base import Mediator
 from logic.queries.messages import (
+    ExportMessagesQuery,
     GetAllChatsListenersQuery,
     GetAllChatsQuery,
     GetChatDetailQuery,
@@ -57,11 +68,9 @@ router = APIRouter(tags=['Chat'])
 )
 async def create_chat_handler(
     schema: CreateChatRequestSchema,
-    container: Container = Depends(init_container),
+    mediator: Mediator = Depends(get_mediator),
 ) -> CreateChatResponseSchema:
     """Creates a new chat."""
-    mediator = container.resolve(Mediator)
-
     try:
         chat, *_ = await mediator.handle_command(CreateChatCommand(title=schema.title))
     except ApplicationException as exception:
@@ -83,11 +92,9 @@ async def create_chat_handler(
 async def create_message_handler(
     chat_oid: str,
     schema: CreateMessageSchema,
-    container: Container = Depends(init_container),
+    mediator: Mediator = Depends(get_mediator),
 ) -> CreateMessageResponseSchema:
     """Creates a new message."""
-    mediator: Mediator = container.resolve(Mediator)
-
     try:
         message, *_ = await mediator.handle_command(
             CreateMessageCommand(
@@ -100,6 +107,36 @@ async def create_message_handler(
     return CreateMessageResponseSchema.from_entity(message)
 
 
+@router.post(
+    '/{chat_oid}/messages/batch',
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        status.HTTP_201_CREATED: {'model': CreateMessagesBatchResponseSchema},
+        status.HTTP_400_BAD_REQUEST: {'model': ErrorSchema},
+    },
+    summary='creates many messages in a chat at once',
+    description='creates many messages in a chat at once, invalid texts are reported per item',
+)
+async def create_messages_batch_handler(
+    chat_oid: str,
+    schema: CreateMessagesBatchSchema,
+    mediator: Mediator = Depends(get_mediator),
+) -> CreateMessagesBatchResponseSchema:
+    """Creates many messages in one request."""
+    try:
+        results, *_ = await mediator.handle_command(
+            CreateMessagesBatchCommand(texts=tuple(schema.texts), chat_oid=chat_oid),
+        )
+    except ApplicationException as exception:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail={'error': exception.message})
+
+    return CreateMessagesBatchResponseSchema.from_items([
+        CreateMessagesBatchItemSchema(error=result.error) if result.message is None
+        else CreateMessagesBatchItemSchema.from_entity(result.message)
+        for result in results
+    ])
+
+
 @router.get(
     '/{chat_oid}/',
     status_code=status.HTTP_200_OK,
@@ -112,10 +149,8 @@ async def create_message_handler(
 )
 async def get_chat_handler(
     chat_oid: str,
-    container: Container = Depends(init_container),
+    mediator: Mediator = Depends(get_mediator),
 ) -> ChatDetailSchema:
-    mediator: Mediator = container.resolve(Mediator)
-
     try:
         chat = await mediator.handle_query(GetChatDetailQuery(chat_oid=chat_oid))
     except ApplicationException as exception:
@@ -126,37 +161,66 @@ async def get_chat_handler(
 @router.get(
     '/{chat_oid}/messages',
     status_code=status.HTTP_200_OK,
+    response_model=GetMessagesQueryResponseSchema,
+    response_class=ORJSONResponse,
     responses={
         status.HTTP_200_OK: {'model': GetMessagesQueryResponseSchema},
         status.HTTP_400_BAD_REQUEST: {'model': ErrorSchema},
     },
     summary='get all messages in chat',
-    description='get all messages in chat',
+    description=(
+        'get all messages in chat. pass the "before" or "after" cursor from a previous page '
+        'to paginate by cursor instead of offset'
+    ),
 )
 async def get_chat_messages_handler(
     chat_oid: str,
     filters: GetMessagesFilters = Depends(),
-    container: Container = Depends(init_container),
-) -> GetMessagesQueryResponseSchema:
-    mediator: Mediator = container.resolve(Mediator)
-
+    mediator: Mediator = Depends(get_mediator),
+) -> ORJSONResponse:
     try:
         messages, count = await mediator.handle_query(
             GetMessagesQuery(chat_oid=chat_oid, filters=filters.to_infra()),
         )
     except ApplicationException as exception:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail={'error': exception.message})
-    return GetMessagesQueryResponseSchema(
-        count=count,
-        limit=filters.limit,
-        offset=filters.offset,
-        items=[MessageDetailSchema.from_entity(message) for message in messages],
+    return ORJSONResponse(
+        GetMessagesQueryResponseSchema.build_content(
+            messages=messages,
+            count=count,
+            limit=filters.limit,
+            offset=filters.offset,
+        ),
     )
 
 
+@router.get(
+    '/{chat_oid}/messages/export',
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {'content': {NDJSON_MEDIA_TYPE: {}}},
+        status.HTTP_400_BAD_REQUEST: {'model': ErrorSchema},
+    },
+    summary='export the whole chat history',
+    description='streams every message in chat as NDJSON, oldest first',
+)
+async def export_chat_messages_handler(
+    chat_oid: str,
+    mediator: Mediator = Depends(get_mediator),
+) -> StreamingResponse:
+    try:
+        messages = await mediator.handle_query(ExportMessagesQuery(chat_oid=chat_oid))
+    except ApplicationException as exception:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail={'error': exception.message})
+    return StreamingResponse(encode_messages_as_ndjson(messages), media_type=NDJSON_MEDIA_TYPE)
+
+
 @router.get(
     '/',
     status_code=status.HTTP_200_OK,
+    response_model=GetAllChatsQueryResponseSchema,
+    response_class=ORJSONResponse,
     responses={
         status.HTTP_200_OK: {'model': GetAllChatsQueryResponseSchema},
         status.HTTP_400_BAD_REQUEST: {'model': ErrorSchema},
@@ -166,21 +230,21 @@ async def get_chat_messages_handler(
 )
 async def get_all_chats_handler(
     filters: GetAllChatsFilters = Depends(),
-    container: Container = Depends(init_container),
-) -> GetAllChatsQueryResponseSchema:
-    mediator: Mediator = container.resolve(Mediator)
-
+    mediator: Mediator = Depends(get_mediator),
+) -> ORJSONResponse:
     try:
         chats, count = await mediator.handle_query(
             GetAllChatsQuery(filters=filters.to_infra()),
         )
     except ApplicationException as exception:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail={'error': exception.message})
-    return GetAllChatsQueryResponseSchema(
-        count=count,
-        limit=filters.limit,
-        offset=filters.offset,
-        items=[ChatDetailSchema.from_entity(chat) for chat in chats],
+    return ORJSONResponse(
+        GetAllChatsQueryResponseSchema.build_content(
+            chats=chats,
+            count=count,
+            limit=filters.limit,
+            offset=filters.offset,
+        ),
     )
 
 
@@ -192,10 +256,8 @@ async def get_all_chats_handler(
 )
 async def delete_chat_handler(
     chat_oid: str,
-    container: Container = Depends(init_container),
+    mediator: Mediator = Depends(get_mediator),
 ) -> None:
-    mediator: Mediator = container.resolve(Mediator)
-
     try:
         await mediator.handle_command(DeleteChatCommand(chat_oid=chat_oid))
     except ApplicationException as exception:
@@ -213,10 +275,8 @@ async def delete_chat_handler(
 async def add_listener_handler(
     chat_oid: str,
     schema: AddTelegramListenerSchema,
-    container: Container = Depends(init_container),
+    mediator: Mediator = Depends(get_mediator),
 ) -> AddTelegramListenerResponseSchema:
-    mediator: Mediator = container.resolve(Mediator)
-
     try:
         listener, *_ = await mediator.handle_command(
             AddTelegramListenerCommand(
@@ -243,13 +303,12 @@ async def add_listener_handler(
 )
 async def get_all_chat_listeners_handler(
     chat_oid: str,
-    container: Container = Depends(init_container),
+    filters: GetChatListenersFilters = Depends(),
+    mediator: Mediator = Depends(get_mediator),
 ) -> list[ChatListenerListItemSchema]:
-    mediator: Mediator = container.resolve(Mediator)
-
     try:
         listeners = await mediator.handle_query(
-            GetAllChatsListenersQuery(chat_oid=chat_oid),
+            GetAllChatsListenersQuery(chat_oid=chat_oid, filters=filters.to_infra()),
         )
     except ApplicationException as exception:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail={'error': exception.message})
@@ -1,6 +1,9 @@
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import (
+    BaseModel,
+    Field,
+)
 
 from application.api.schemas import BaseQueryResponseSchema
 from domain.entities.messages import (
@@ -8,6 +11,11 @@ from domain.entities.messages import (
     ChatListener,
     Message,
 )
+from infra.repositories.filters.messages import MessagesCursor
+from infra.repositories.messages.read_models import (
+    ChatReadModel,
+    MessageReadModel,
+)
 
 
 class CreateChatRequestSchema(BaseModel):
@@ -39,6 +47,32 @@ class CreateMessageResponseSchema(BaseModel):
         return cls(text=message.text.as_generic_type(), oid=message.oid)
 
 
+class CreateMessagesBatchSchema(BaseModel):
+    texts: list[str] = Field(min_length=1, max_length=1000)
+
+
+class CreateMessagesBatchItemSchema(BaseModel):
+    oid: str | None = None
+    text: str | None = None
+    error: str | None = None
+
+    @classmethod
+    def from_entity(cls, message: Message) -> 'CreateMessagesBatchItemSchema':
+        return cls(oid=message.oid, text=message.text.as_generic_type())
+
+
+class CreateMessagesBatchResponseSchema(BaseModel):
+    items: list[CreateMessagesBatchItemSchema]
+    created_count: int
+    failed_count: int
+
+    @classmethod
+    def from_items(cls, items: list[CreateMessagesBatchItemSchema]) -> 'CreateMessagesBatchResponseSchema':
+        failed_count = sum(1 for item in items if item.error is not None)
+
+        return cls(items=items, created_count=len(items) - failed_count, failed_count=failed_count)
+
+
 class MessageDetailSchema(BaseModel):
     oid: str
     text: str
@@ -80,11 +114,44 @@ class AddTelegramListenerResponseSchema(BaseModel):
 
 
 class GetMessagesQueryResponseSchema(BaseQueryResponseSchema[list[MessageDetailSchema]]):
-    ...
+    before: str | None = None
+    after: str | None = None
+
+    @staticmethod
+    def build_content(messages: list[MessageReadModel], count: int | None, limit: int, offset: int) -> dict:
+        # Read models are serialized straight to JSON, the schema only describes the response for the docs.
+        before = after = None
+
+        if messages:
+            first, last = messages[0], messages[-1]
+            before = MessagesCursor(created_at=first['created_at'], oid=first['oid']).encode()
+            after = MessagesCursor(created_at=last['created_at'], oid=last['oid']).encode()
+
+        return {
+            'count': count,
+            'offset': offset,
+            'limit': limit,
+            'items': [
+                {'oid': message['oid'], 'text': message['text'], 'created_at': message['created_at']}
+                for message in messages
+            ],
+            'before': before,
+            'after': after,
+        }
 
 
 class GetAllChatsQueryResponseSchema(BaseQueryResponseSchema[list[ChatDetailSchema]]):
-    ...
+    @staticmethod
+    def build_content(chats: list[ChatReadModel], count: int | None, limit: int, offset: int) -> dict:
+        return {
+            'count': count,
+            'offset': offset,
+            'limit': limit,
+            'items': [
+                {'oid': chat['oid'], 'title': chat['title'], 'created_at': chat['created_at']}
+                for chat in chats
+            ],
+        }
 
 
 class ChatListenerListItemSchema(BaseModel):
@@ -1,12 +1,14 @@
 from fastapi import (
     Depends,
-    WebSocketDisconnect,
+    status,
 )
 from fastapi.routing import APIRouter
 from fastapi.websockets import WebSocket
 
 from punq import Container
 
+from application.api.dependencies import get_mediator
+from infra.websockets.exceptions import ConnectionLimitExceededException
 from infra.websockets.managers import BaseConnectionManager
 from logic.exceptions.messages import ChatNotFoundException
 from logic.init import init_container
@@ -22,9 +24,9 @@ async def websocket_endpoint(
     chat_oid: str,
     websocket: WebSocket,
     container: Container = Depends(init_container),
+    mediator: Mediator = Depends(get_mediator),
 ):
     connection_manager: BaseConnectionManager = container.resolve(BaseConnectionManager)
-    mediator: Mediator = container.resolve(Mediator)
 
     try:
         await mediator.handle_query(GetChatDetailQuery(chat_oid=chat_oid))
@@ -32,13 +34,20 @@ async def websocket_endpoint(
         await websocket.accept()
         await websocket.send_json(data={'error': error.message})
         await websocket.close()
+        return
 
-    await connection_manager.accept_connection(websocket=websocket, key=chat_oid)
-
-    await websocket.send_text("You are now connected!")
+    try:
+        await connection_manager.accept_connection(websocket=websocket, key=chat_oid)
+    except ConnectionLimitExceededException as error:
+        await websocket.send_json(data={'error': error.message})
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
 
     try:
-        while True:
-            await websocket.receive_text()
-    except WebSocketDisconnect:
+        await websocket.send_text("You are now connected!")
+
+        # Anything the client sends, pongs included, proves the connection is still alive.
+        while (await websocket.receive())['type'] != 'websocket.disconnect':
+            connection_manager.mark_alive(websocket)
+    finally:
         await connection_manager.remove_connection(websocket=websocket, key=chat_oid)
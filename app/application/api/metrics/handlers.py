@@ -0,0 +1,32 @@
+from fastapi import (
+    Depends,
+    status,
+)
+from fastapi.routing import APIRouter
+
+from punq import Container
+
+from application.api.metrics.schemas import MetricsResponseSchema
+from infra.caches import LRUTTLCache
+from infra.metrics import MetricsRegistry
+from infra.websockets.managers import BaseConnectionManager
+from logic.init import init_container
+
+
+router = APIRouter(tags=['Metrics'])
+
+
+@router.get(
+    '/',
+    status_code=status.HTTP_200_OK,
+    summary='returns consumer, cache and websocket metrics of this node',
+    description='returns consumer, cache and websocket metrics of this node',
+)
+async def get_metrics_handler(
+    container: Container = Depends(init_container),
+) -> MetricsResponseSchema:
+    return MetricsResponseSchema.from_registry(
+        metrics_registry=container.resolve(MetricsRegistry),
+        chats_cache=container.resolve(LRUTTLCache),
+        connection_manager=container.resolve(BaseConnectionManager),
+    )
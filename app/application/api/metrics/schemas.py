@@ -0,0 +1,66 @@
+from pydantic import BaseModel
+
+from infra.caches import LRUTTLCache
+from infra.metrics import (
+    ConsumerMetrics,
+    MetricsRegistry,
+)
+from infra.websockets.managers import BaseConnectionManager
+
+
+class ConsumerMetricsSchema(BaseModel):
+    processed: int
+    failed: int
+    skipped: int
+    in_flight: int
+    lag: int
+    processing_time_avg: float
+    processing_time_max: float
+
+    @classmethod
+    def from_metrics(cls, metrics: ConsumerMetrics) -> 'ConsumerMetricsSchema':
+        return cls(
+            processed=metrics.processed,
+            failed=metrics.failed,
+            skipped=metrics.skipped,
+            in_flight=metrics.in_flight,
+            lag=metrics.lag,
+            processing_time_avg=metrics.processing_time_avg,
+            processing_time_max=metrics.processing_time_max,
+        )
+
+
+class CacheStatsSchema(BaseModel):
+    hits: int
+    misses: int
+    size: int
+
+
+class WebSocketStatsSchema(BaseModel):
+    connections: int
+    chats: int
+    locks: int = 0
+    rejected: int = 0
+    reaped: int = 0
+
+
+class MetricsResponseSchema(BaseModel):
+    consumers: dict[str, ConsumerMetricsSchema]
+    chats_cache: CacheStatsSchema
+    websockets: WebSocketStatsSchema
+
+    @classmethod
+    def from_registry(
+        cls,
+        metrics_registry: MetricsRegistry,
+        chats_cache: LRUTTLCache,
+        connection_manager: BaseConnectionManager,
+    ) -> 'MetricsResponseSchema':
+        return cls(
+            consumers={
+                name: ConsumerMetricsSchema.from_metrics(metrics)
+                for name, metrics in metrics_registry.consumers_map.items()
+            },
+            chats_cache=CacheStatsSchema(**chats_cache.stats),
+            websockets=WebSocketStatsSchema(**connection_manager.stats),
+        )
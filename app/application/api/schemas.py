@@ -14,7 +14,7 @@ IT = TypeVar('IT')
 
 
 class BaseQueryResponseSchema(BaseModel, Generic[IT]):
-    count: int
+    count: int | None
     offset: int
     limit: int
     items: IT
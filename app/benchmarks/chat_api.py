@@ -0,0 +1,207 @@
+"""Load-tests the chat API offline and compares the numbers with a previous commit.
+
+Run with ``python -m benchmarks.chat_api``. The app runs in-process on the memory repositories and broker, requests
+go through the ASGI stack with httpx, and websocket subscribers are in-memory sockets on the real connection manager.
+Results land in ``benchmarks/results/<commit>.json``, pass ``--compare`` with an older file to spot regressions.
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import sys
+from dataclasses import (
+    dataclass,
+    field,
+)
+from pathlib import Path
+from typing import (
+    Awaitable,
+    Callable,
+)
+
+import orjson
+from httpx import (
+    ASGITransport,
+    AsyncClient,
+)
+
+from benchmarks.harness import (
+    compare_results,
+    drive,
+    print_results,
+    save_results,
+    ScenarioResult,
+)
+
+
+SCENARIOS = ('create_chat', 'create_message', 'list_messages', 'websocket_fanout')
+
+
+@dataclass(eq=False)
+class SubscriberWebSocket:
+    on_message: Callable[[bytes], None]
+    received_count: int = field(default=0, init=False)
+
+    async def accept(self):
+        ...
+
+    async def send(self, message: dict):
+        self.received_count += 1
+        self.on_message(message['bytes'])
+
+    async def close(self, code: int = 1000, reason: str | None = None):
+        ...
+
+
+@dataclass(eq=False)
+class FanOutProbe:
+    """Resolves a message's future once every subscriber of the chat has received it."""
+    subscribers_count: int
+    _waiters: dict[str, tuple[list[int], asyncio.Future]] = field(default_factory=dict, init=False)
+
+    def expect(self, message_oid: str) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[message_oid] = ([self.subscribers_count], future)
+
+        return future
+
+    def on_message(self, bytes_: bytes) -> None:
+        remaining, future = self._waiters[orjson.loads(bytes_)['message_oid']]
+        remaining[0] -= 1
+
+        if not remaining[0] and not future.done():
+            future.set_result(None)
+
+
+async def create_chat(client: AsyncClient, title: str) -> str:
+    response = await client.post('/chats/', json={'title': title})
+    response.raise_for_status()
+
+    return response.json()['oid']
+
+
+async def prepare_fanout(container, subscribers_count: int) -> Callable[[int], Awaitable[None]]:
+    from infra.websockets.managers import BaseConnectionManager
+    from logic.events.messages import MessageRecordReceivedFromBrokerEvent
+    from logic.mediator.base import Mediator
+
+    connection_manager: BaseConnectionManager = container.resolve(BaseConnectionManager)
+    mediator: Mediator = container.resolve(Mediator)
+    probe = FanOutProbe(subscribers_count=subscribers_count)
+
+    for _ in range(subscribers_count):
+        await connection_manager.accept_connection(
+            websocket=SubscriberWebSocket(on_message=probe.on_message),
+            key='fanout',
+        )
+
+    async def publish(number: int):
+        message_oid = f'fanout-{number}'
+        delivered = probe.expect(message_oid)
+
+        await mediator.publish([
+            MessageRecordReceivedFromBrokerEvent(
+                chat_oid='fanout',
+                payload=orjson.dumps({'message_text': 'hello', 'message_oid': message_oid, 'chat_oid': 'fanout'}),
+            ),
+        ])
+        await asyncio.wait_for(delivered, timeout=10)
+
+    return publish
+
+
+async def run(
+    scenarios: list[str],
+    requests_count: int,
+    concurrency: int,
+    subscribers_count: int,
+    seed_messages: int,
+) -> list[ScenarioResult]:
+    from application.api.main import create_app
+    from logic.init import (
+        init_container,
+        init_memory_container,
+    )
+
+    container = init_memory_container()
+    app = create_app()
+    app.dependency_overrides[init_container] = lambda: container
+    results = []
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url='http://benchmark') as client:
+        chat_oid = await create_chat(client, 'benchmark')
+        await client.post(
+            f'/chats/{chat_oid}/messages/batch',
+            json={'texts': [f'message {number}' for number in range(seed_messages)]},
+        )
+
+        # Titles are unique, so the warm-up and measured runs must not reuse request numbers for them.
+        chat_numbers = itertools.count()
+
+        async def create_chat_operation(number: int):
+            await create_chat(client, f'chat {next(chat_numbers)}')
+
+        async def create_message_operation(number: int):
+            response = await client.post(f'/chats/{chat_oid}/messages', json={'text': f'message {number}'})
+            response.raise_for_status()
+
+        async def list_messages_operation(number: int):
+            response = await client.get(f'/chats/{chat_oid}/messages', params={'limit': 100})
+            response.raise_for_status()
+
+        operations = {
+            'create_chat': create_chat_operation,
+            'create_message': create_message_operation,
+            'list_messages': list_messages_operation,
+        }
+
+        if 'websocket_fanout' in scenarios:
+            operations['websocket_fanout'] = await prepare_fanout(container, subscribers_count)
+
+        for name in scenarios:
+            # A short warm-up keeps first-call costs out of the measured run.
+            await drive(f'{name}-warmup', operations[name], min(100, requests_count), concurrency)
+            results.append(await drive(name, operations[name], requests_count, concurrency))
+
+    return results
+
+
+def main():
+    os.environ.setdefault('MONGO_DB_CONNECTION_URI', 'mongodb://localhost:27017')
+    os.environ.setdefault('KAFKA_URL', 'localhost:9092')
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--subscribers', type=int, default=100)
+    parser.add_argument('--seed-messages', type=int, default=1000)
+    parser.add_argument('--output', type=Path, help='where to store the results, benchmarks/results/<commit>.json')
+    parser.add_argument('--compare', type=Path, help='results of an earlier run to compare with')
+    parser.add_argument('--threshold', type=float, default=10, help='allowed regression, in percent')
+    args = parser.parse_args()
+
+    results = asyncio.run(
+        run(
+            scenarios=args.scenarios,
+            requests_count=args.requests,
+            concurrency=args.concurrency,
+            subscribers_count=args.subscribers,
+            seed_messages=args.seed_messages,
+        ),
+    )
+    print_results(results)
+    print(f'Results saved to {save_results(results, path=args.output)}')
+
+    if args.compare is None:
+        return
+
+    regressions = compare_results(args.compare, results, threshold=args.threshold)
+
+    if regressions:
+        print(f'Regressions over {args.threshold}%: {", ".join(regressions)}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
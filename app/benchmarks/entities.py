@@ -0,0 +1,78 @@
+"""Measures time and memory to build message entities through __init__ and through the hydration constructor.
+
+Run with ``python -m benchmarks.entities``. ``init`` is how messages were loaded from storage before, with
+validated values and the uuid/datetime default factories, ``hydrate`` is the path the converters use now.
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable
+from uuid import uuid4
+
+from domain.entities.messages import Message
+from domain.values.messages import Text
+
+
+def build_with_init(documents: list[dict]) -> list[Message]:
+    return [
+        Message(
+            text=Text(value=document['text']),
+            oid=document['oid'],
+            created_at=document['created_at'],
+            chat_oid=document['chat_oid'],
+        )
+        for document in documents
+    ]
+
+
+def build_with_hydrate(documents: list[dict]) -> list[Message]:
+    return [
+        Message.hydrate(
+            text=Text.trusted(document['text']),
+            oid=document['oid'],
+            created_at=document['created_at'],
+            chat_oid=document['chat_oid'],
+        )
+        for document in documents
+    ]
+
+
+def measure(build: Callable[[list[dict]], list[Message]], documents: list[dict], repeat: int) -> tuple[float, int]:
+    durations = []
+
+    for _ in range(repeat):
+        gc.collect()
+        started_at = time.perf_counter()
+        build(documents)
+        durations.append(time.perf_counter() - started_at)
+
+    gc.collect()
+    tracemalloc.start()
+    messages = build(documents)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del messages
+
+    return min(durations), allocated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--entities', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    documents = [
+        {'oid': str(uuid4()), 'text': f'message {number}', 'created_at': datetime.now(), 'chat_oid': 'benchmark'}
+        for number in range(args.entities)
+    ]
+
+    for name, build in (('init', build_with_init), ('hydrate', build_with_hydrate)):
+        duration, allocated = measure(build, documents, repeat=args.repeat)
+        print(f'{name:<8} {duration * 1000:>8.1f}ms {allocated / 2 ** 20:>8.1f}MiB per {args.entities} entities')
+
+
+if __name__ == '__main__':
+    main()
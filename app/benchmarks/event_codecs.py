@@ -0,0 +1,74 @@
+"""Compares the size and encode/decode throughput of broker events in the JSON and binary codecs.
+
+Run with ``python -m benchmarks.event_codecs``. Every event of ``domain/events/messages.py`` is encoded through
+``EventCodecRegistry`` and decoded back from a record, the way producers and consumers do it.
+"""
+import argparse
+import time
+from typing import Callable
+from uuid import uuid4
+
+from domain.events.base import BaseEvent
+from domain.events.messages import (
+    ChatDeletedEvent,
+    ListenerAddedEvent,
+    NewChatCreatedEvent,
+    NewMessageReceivedEvent,
+)
+from infra.message_brokers.base import BrokerRecord
+from infra.message_brokers.codecs import (
+    BINARY_CONTENT_TYPE,
+    EventCodecRegistry,
+    JSON_CONTENT_TYPE,
+)
+
+
+def build_events() -> list[BaseEvent]:
+    return [
+        NewMessageReceivedEvent(message_text='See you at 10?', message_oid=str(uuid4()), chat_oid=str(uuid4())),
+        NewChatCreatedEvent(chat_oid=str(uuid4()), chat_title='Weekend plans'),
+        ChatDeletedEvent(chat_oid=str(uuid4())),
+        ListenerAddedEvent(listener_oid='123456789'),
+    ]
+
+
+def best_rate(operation: Callable[[], object], count: int, repeat: int) -> float:
+    best = float('inf')
+
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+
+        for _ in range(count):
+            operation()
+
+        best = min(best, time.perf_counter() - started_at)
+
+    return count / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=50_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    registries = {
+        'json': EventCodecRegistry(default_content_type=JSON_CONTENT_TYPE),
+        'binary': EventCodecRegistry(default_content_type=BINARY_CONTENT_TYPE),
+    }
+
+    for event in build_events():
+        for name, registry in registries.items():
+            value, headers = registry.encode(event)
+            record = BrokerRecord(topic='benchmark', key=None, value=value, headers=headers)
+            encode_rate = best_rate(lambda: registry.encode(event), args.count, args.repeat)
+            decode_rate = best_rate(lambda: registry.decode(record), args.count, args.repeat)
+
+            print(
+                f'{event.__class__.__name__:<24} {name:<7} {len(value):>4} bytes  '
+                f'encode={encode_rate / 1000:>7.1f}k/s  decode={decode_rate / 1000:>7.1f}k/s',
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""Drives a scenario at a fixed concurrency and keeps its results around for comparing commits."""
+import asyncio
+import json
+import statistics
+import subprocess
+import time
+from dataclasses import (
+    dataclass,
+    field,
+)
+from datetime import (
+    datetime,
+    timezone,
+)
+from pathlib import Path
+from typing import (
+    Awaitable,
+    Callable,
+)
+
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+
+# Metrics where a bigger number means the commit got slower, max is too noisy to compare.
+LOWER_IS_BETTER = ('p50_ms', 'p90_ms', 'p99_ms')
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    concurrency: int
+    duration: float
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    def summary(self) -> dict[str, float]:
+        latencies = sorted(self.latencies) or [0.0]
+        quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+
+        return {
+            'requests': len(self.latencies) + self.errors,
+            'errors': self.errors,
+            'concurrency': self.concurrency,
+            'throughput_rps': round(len(self.latencies) / self.duration, 1) if self.duration else 0.0,
+            'p50_ms': round(quantiles[49] * 1000, 3),
+            'p90_ms': round(quantiles[89] * 1000, 3),
+            'p99_ms': round(quantiles[98] * 1000, 3),
+            'max_ms': round(latencies[-1] * 1000, 3),
+        }
+
+
+async def drive(
+    name: str,
+    operation: Callable[[int], Awaitable[None]],
+    requests_count: int,
+    concurrency: int,
+) -> ScenarioResult:
+    """Calls operation with request numbers 0..requests_count - 1 from concurrency workers."""
+    result = ScenarioResult(name=name, concurrency=concurrency, duration=0)
+    numbers = iter(range(requests_count))
+
+    async def work():
+        for number in numbers:
+            started_at = time.perf_counter()
+
+            try:
+                await operation(number)
+            except Exception:
+                result.errors += 1
+            else:
+                result.latencies.append(time.perf_counter() - started_at)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(work() for _ in range(concurrency)))
+    result.duration = time.perf_counter() - started_at
+
+    return result
+
+
+def get_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def save_results(results: list[ScenarioResult], path: Path | None = None) -> Path:
+    commit = get_commit()
+    path = path or RESULTS_DIR / f'{commit}.json'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(
+        {
+            'commit': commit,
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'scenarios': {result.name: result.summary() for result in results},
+        },
+        indent=2,
+    ))
+
+    return path
+
+
+def compare_results(baseline_path: Path, results: list[ScenarioResult], threshold: float) -> list[str]:
+    """Returns the scenario metrics that got worse than the baseline by more than threshold percent."""
+    baseline = json.loads(baseline_path.read_text())['scenarios']
+    regressions = []
+
+    for result in results:
+        if result.name not in baseline:
+            continue
+
+        current = result.summary()
+        previous = baseline[result.name]
+        changes = {metric: (previous[metric], current[metric]) for metric in (*LOWER_IS_BETTER, 'throughput_rps')}
+
+        for metric, (before, after) in changes.items():
+            if not before:
+                continue
+
+            change = (after - before) / before * 100
+            worse = change > threshold if metric in LOWER_IS_BETTER else change < -threshold
+            print(f'{result.name:<16} {metric:<15} {before:>10} -> {after:>10} ({change:+.1f}%)')
+
+            if worse:
+                regressions.append(f'{result.name}.{metric} {change:+.1f}%')
+
+    return regressions
+
+
+def print_results(results: list[ScenarioResult]) -> None:
+    for result in results:
+        summary = result.summary()
+        print(
+            f"{result.name:<16} {summary['requests']:>6} req  c={summary['concurrency']:<4} "
+            f"{summary['throughput_rps']:>9} req/s  p50={summary['p50_ms']:>7}ms  "
+            f"p90={summary['p90_ms']:>7}ms  p99={summary['p99_ms']:>7}ms  errors={summary['errors']}",
+        )
@@ -0,0 +1,86 @@
+"""Compares Kafka producer throughput for small chat events under different producer profiles.
+
+Run with ``python -m benchmarks.kafka_producer`` against the broker from ``KAFKA_URL``.
+"""
+import argparse
+import asyncio
+import os
+import time
+from uuid import uuid4
+
+import orjson
+from aiokafka import AIOKafkaProducer
+
+from infra.message_brokers.kafka import KafkaMessageBroker
+
+
+PROFILES = {
+    'defaults': {'producer': {}, 'wait_for_delivery': True},
+    'linger': {'producer': {'linger_ms': 5, 'max_batch_size': 65536}, 'wait_for_delivery': True},
+    'linger+gzip': {
+        'producer': {'linger_ms': 5, 'max_batch_size': 65536, 'compression_type': 'gzip'},
+        'wait_for_delivery': True,
+    },
+    'linger+background': {'producer': {'linger_ms': 5, 'max_batch_size': 65536}, 'wait_for_delivery': False},
+    'acks=all': {'producer': {'linger_ms': 5, 'max_batch_size': 65536, 'acks': 'all'}, 'wait_for_delivery': True},
+}
+
+
+def build_chat_event(number: int) -> bytes:
+    return orjson.dumps(
+        {
+            'message_text': f'message {number}',
+            'message_oid': str(uuid4()),
+            'chat_oid': 'benchmark',
+            'event_id': str(uuid4()),
+        },
+    )
+
+
+async def run(kafka_url: str, topic: str, profile: dict, messages_count: int, concurrency: int) -> float:
+    message_broker = KafkaMessageBroker(
+        producer=AIOKafkaProducer(bootstrap_servers=kafka_url, **profile['producer']),
+        consumer_factory=lambda group_id: None,
+        wait_for_delivery=profile['wait_for_delivery'],
+    )
+    await message_broker.start()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send_event(number: int) -> None:
+        async with semaphore:
+            await message_broker.send_message(key=b'benchmark', topic=topic, value=build_chat_event(number))
+
+    try:
+        started_at = time.perf_counter()
+        await asyncio.gather(*(send_event(number) for number in range(messages_count)))
+        await message_broker.flush()
+
+        return messages_count / (time.perf_counter() - started_at)
+    finally:
+        await message_broker.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--kafka-url', default=os.environ.get('KAFKA_URL', 'localhost:9092'))
+    parser.add_argument('--topic', default='benchmark-chat-events')
+    parser.add_argument('--messages', type=int, default=20000)
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--profile', choices=PROFILES, action='append')
+    args = parser.parse_args()
+
+    for name in args.profile or PROFILES:
+        throughput = asyncio.run(
+            run(
+                kafka_url=args.kafka_url,
+                topic=args.topic,
+                profile=PROFILES[name],
+                messages_count=args.messages,
+                concurrency=args.concurrency,
+            ),
+        )
+        print(f'{name:<18} {throughput:>10.0f} messages/sec')
+
+
+if __name__ == '__main__':
+    main()
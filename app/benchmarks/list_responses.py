@@ -0,0 +1,109 @@
+"""Measures p50/p99 latency of a 100-message page served through Pydantic models and straight through orjson.
+
+Run with ``python -m benchmarks.list_responses``. Both routes run in-process over the same memory repositories,
+``pydantic`` validates the page into ``GetMessagesQueryResponseSchema`` the way the endpoint used to.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from fastapi import (
+    Depends,
+    FastAPI,
+)
+
+from httpx import (
+    ASGITransport,
+    AsyncClient,
+)
+
+from application.api.dependencies import get_mediator
+from application.api.messages.filters import GetMessagesFilters
+from application.api.messages.schemas import GetMessagesQueryResponseSchema
+from logic.commands.messages import (
+    CreateChatCommand,
+    CreateMessagesBatchCommand,
+)
+from logic.mediator.base import Mediator
+from logic.queries.messages import GetMessagesQuery
+
+
+def add_pydantic_route(app: FastAPI) -> None:
+    @app.get('/pydantic/{chat_oid}/messages')
+    async def get_chat_messages_through_pydantic(
+        chat_oid: str,
+        filters: GetMessagesFilters = Depends(),
+        mediator: Mediator = Depends(get_mediator),
+    ) -> GetMessagesQueryResponseSchema:
+        messages, count = await mediator.handle_query(
+            GetMessagesQuery(chat_oid=chat_oid, filters=filters.to_infra()),
+        )
+
+        return GetMessagesQueryResponseSchema.model_validate(
+            GetMessagesQueryResponseSchema.build_content(
+                messages=messages,
+                count=count,
+                limit=filters.limit,
+                offset=filters.offset,
+            ),
+        )
+
+
+async def measure(client: AsyncClient, url: str, requests_count: int) -> list[float]:
+    durations = []
+
+    for _ in range(requests_count):
+        started_at = time.perf_counter()
+        response = await client.get(url, params={'limit': 100})
+        durations.append(time.perf_counter() - started_at)
+        response.raise_for_status()
+
+    return durations
+
+
+async def run(requests_count: int, page_size: int) -> dict[str, list[float]]:
+    from application.api.main import create_app
+    from logic.init import (
+        init_container,
+        init_memory_container,
+    )
+
+    container = init_memory_container()
+    mediator: Mediator = container.resolve(Mediator)
+    chat, *_ = await mediator.handle_command(CreateChatCommand(title='benchmark'))
+    await mediator.handle_command(
+        CreateMessagesBatchCommand(texts=tuple(f'message {number}' for number in range(page_size)), chat_oid=chat.oid),
+    )
+
+    app = create_app()
+    app.dependency_overrides[init_container] = lambda: container
+    add_pydantic_route(app)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url='http://benchmark') as client:
+        await measure(client, f'/chats/{chat.oid}/messages', 100)
+        await measure(client, f'/pydantic/{chat.oid}/messages', 100)
+
+        return {
+            'pydantic': await measure(client, f'/pydantic/{chat.oid}/messages', requests_count),
+            'orjson': await measure(client, f'/chats/{chat.oid}/messages', requests_count),
+        }
+
+
+def main():
+    os.environ.setdefault('MONGO_DB_CONNECTION_URI', 'mongodb://localhost:27017')
+    os.environ.setdefault('KAFKA_URL', 'localhost:9092')
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--page-size', type=int, default=100)
+    args = parser.parse_args()
+
+    for name, durations in asyncio.run(run(requests_count=args.requests, page_size=args.page_size)).items():
+        p50, p99 = (statistics.quantiles(durations, n=100)[index] * 1000 for index in (49, 98))
+        print(f'{name:<9} p50={p50:>6.3f}ms p99={p99:>6.3f}ms')
+
+
+if __name__ == '__main__':
+    main()
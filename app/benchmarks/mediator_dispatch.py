@@ -0,0 +1,125 @@
+"""Measures mediator dispatch overhead per command, query and event with no-op handlers.
+
+Run with ``python -m benchmarks.mediator_dispatch``. ``lookup`` reproduces the previous per-call map lookups,
+``compiled`` goes through the precompiled dispatch tables.
+"""
+import argparse
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Iterable
+
+from domain.events.base import BaseEvent
+from logic.commands.base import (
+    BaseCommand,
+    CommandHandler,
+)
+from logic.events.base import (
+    EventHandler,
+    IntegrationEvent,
+)
+from logic.mediator.base import Mediator
+from logic.queries.base import (
+    BaseQuery,
+    BaseQueryHandler,
+)
+
+
+@dataclass(frozen=True)
+class NoopCommand(BaseCommand):
+    ...
+
+
+@dataclass(frozen=True)
+class NoopQuery(BaseQuery):
+    ...
+
+
+@dataclass
+class NoopEvent(IntegrationEvent):
+    ...
+
+
+@dataclass(frozen=True)
+class NoopCommandHandler(CommandHandler[NoopCommand, None]):
+    async def handle(self, command: NoopCommand) -> None:
+        ...
+
+
+@dataclass(frozen=True)
+class NoopQueryHandler(BaseQueryHandler[NoopQuery, None]):
+    async def handle(self, query: NoopQuery) -> None:
+        ...
+
+
+@dataclass
+class NoopEventHandler(EventHandler[NoopEvent, None]):
+    async def handle(self, event: NoopEvent) -> None:
+        ...
+
+
+@dataclass(eq=False)
+class LookupMediator(Mediator):
+    async def publish(self, events: Iterable[BaseEvent]) -> list:
+        result = []
+
+        for event in events:
+            handlers: Iterable[EventHandler] = self.events_map[event.__class__]
+            result.extend([await handler.handle(event) for handler in handlers])
+
+        return result
+
+    async def handle_command(self, command: BaseCommand) -> list:
+        handlers = self.commands_map.get(command.__class__)
+
+        return [await handler.handle(command) for handler in handlers]
+
+    async def handle_query(self, query: BaseQuery) -> None:
+        return await self.queries_map[query.__class__].handle(query=query)
+
+
+def create_mediator(mediator_type: type[Mediator]) -> Mediator:
+    mediator = mediator_type()
+    mediator.register_command(NoopCommand, [NoopCommandHandler(_mediator=mediator)])
+    mediator.register_query(NoopQuery, NoopQueryHandler())
+    mediator.register_event(NoopEvent, [NoopEventHandler(message_broker=None, connection_manager=None)])
+
+    return mediator
+
+
+async def measure(dispatch, iterations: int) -> float:
+    started_at = time.perf_counter()
+
+    for _ in range(iterations):
+        await dispatch()
+
+    return (time.perf_counter() - started_at) / iterations
+
+
+async def run(iterations: int) -> dict[str, dict[str, float]]:
+    command, query, events = NoopCommand(), NoopQuery(), [NoopEvent()]
+    results = {}
+
+    for name, mediator_type in (('lookup', LookupMediator), ('compiled', Mediator)):
+        mediator = create_mediator(mediator_type)
+        results[name] = {
+            'command': await measure(lambda: mediator.handle_command(command), iterations),
+            'query': await measure(lambda: mediator.handle_query(query), iterations),
+            'event': await measure(lambda: mediator.publish(events), iterations),
+        }
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--iterations', type=int, default=200_000)
+    args = parser.parse_args()
+
+    for name, durations in asyncio.run(run(iterations=args.iterations)).items():
+        timings = ' '.join(f'{kind}={duration * 1_000_000_000:>6.0f}ns' for kind, duration in durations.items())
+        print(f'{name:<9} {timings}')
+
+
+if __name__ == '__main__':
+    main()
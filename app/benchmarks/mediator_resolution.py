@@ -0,0 +1,64 @@
+"""Measures the per-request overhead of getting a mediator in the HTTP handlers.
+
+Run with ``python -m benchmarks.mediator_resolution``. ``rebuilt`` builds the whole mediator graph on every call,
+as the handlers did when the mediator was registered without a scope, ``cached`` goes through ``get_mediator``.
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from punq import Scope
+
+from infra.message_brokers.base import BaseMessageBroker
+from infra.message_brokers.memory import MemoryMessageBroker
+from infra.repositories.messages.base import (
+    BaseChatsRepository,
+    BaseMessagesRepository,
+)
+from infra.repositories.messages.memory import (
+    MemoryChatRepository,
+    MemoryMessagesRepository,
+)
+from logic.mediator.base import Mediator
+
+
+async def run(iterations: int) -> dict[str, float]:
+    from application.api.dependencies import get_mediator
+    from logic.init import _init_container
+
+    container = _init_container()
+    container.register(BaseChatsRepository, instance=MemoryChatRepository(), scope=Scope.singleton)
+    container.register(BaseMessagesRepository, instance=MemoryMessagesRepository(), scope=Scope.singleton)
+    container.register(BaseMessageBroker, instance=MemoryMessageBroker(), scope=Scope.singleton)
+
+    build_mediator = container.registrations[Mediator][0].builder
+    await get_mediator(container)
+
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        build_mediator()
+    rebuilt = (time.perf_counter() - started_at) / iterations
+
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        await get_mediator(container)
+    cached = (time.perf_counter() - started_at) / iterations
+
+    return {'rebuilt': rebuilt, 'cached': cached}
+
+
+def main():
+    os.environ.setdefault('MONGO_DB_CONNECTION_URI', 'mongodb://localhost:27017')
+    os.environ.setdefault('KAFKA_URL', 'localhost:9092')
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    for name, duration in asyncio.run(run(iterations=args.iterations)).items():
+        print(f'{name:<8} {duration * 1_000_000:>10.1f} us/request')
+
+
+if __name__ == '__main__':
+    main()
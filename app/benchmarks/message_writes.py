@@ -0,0 +1,176 @@
+"""Compares message creation throughput with and without write batching.
+
+Run with ``python -m benchmarks.message_writes``. Storage and broker round trips are simulated with a fixed
+per-call latency over a bounded connection pool, which is what batching amortizes.
+"""
+import argparse
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import (
+    AsyncIterator,
+    Iterable,
+)
+
+from punq import Scope
+
+from domain.entities.messages import (
+    Chat,
+    Message,
+)
+from infra.message_brokers.base import (
+    BaseMessageBroker,
+    BrokerMessage,
+    Headers,
+)
+from infra.message_brokers.batching import BatchingMessageBroker
+from infra.message_brokers.memory import MemoryMessageBroker
+from infra.repositories.filters.messages import GetMessagesFilters
+from infra.repositories.messages.base import (
+    BaseChatsRepository,
+    BaseMessagesRepository,
+)
+from infra.repositories.messages.batching import BatchingMessagesRepository
+from infra.repositories.messages.memory import (
+    MemoryChatRepository,
+    MemoryMessagesRepository,
+)
+from logic.commands.messages import (
+    CreateChatCommand,
+    CreateMessageCommand,
+)
+from logic.mediator.base import Mediator
+
+
+@dataclass
+class RoundTrip:
+    latency: float
+    pool: asyncio.Semaphore
+
+    async def __aenter__(self):
+        await self.pool.acquire()
+        await asyncio.sleep(self.latency)
+
+    async def __aexit__(self, *args):
+        self.pool.release()
+
+
+@dataclass
+class DetachedMemoryChatRepository(MemoryChatRepository):
+    async def get_chat_by_oid(self, oid: str) -> Chat | None:
+        # Every read gets its own entity, as it would when loaded from a real storage.
+        chat = await super().get_chat_by_oid(oid=oid)
+
+        return Chat(oid=chat.oid, title=chat.title, created_at=chat.created_at) if chat else None
+
+
+@dataclass
+class SlowMessagesRepository(BaseMessagesRepository):
+    messages_repository: BaseMessagesRepository
+    round_trip: RoundTrip
+
+    async def add_message(self, message: Message) -> None:
+        async with self.round_trip:
+            await self.messages_repository.add_message(message)
+
+    async def add_messages(self, messages: Iterable[Message]) -> None:
+        async with self.round_trip:
+            await self.messages_repository.add_messages(messages)
+
+    async def get_messages(self, chat_oid: str, filters: GetMessagesFilters) -> tuple[Iterable[Message], int | None]:
+        return await self.messages_repository.get_messages(chat_oid=chat_oid, filters=filters)
+
+    def iter_messages(self, chat_oid: str, batch_size: int = 1000) -> AsyncIterator[Message]:
+        return self.messages_repository.iter_messages(chat_oid=chat_oid, batch_size=batch_size)
+
+
+@dataclass
+class SlowMessageBroker(MemoryMessageBroker):
+    round_trip: RoundTrip | None = None
+
+    async def send_message(self, key: bytes, topic: str, value: bytes, headers: Headers = ()):
+        async with self.round_trip:
+            await super().send_message(key=key, topic=topic, value=value, headers=headers)
+
+    async def send_messages(self, messages: Iterable[BrokerMessage]):
+        async with self.round_trip:
+            for message in messages:
+                await super().send_message(
+                    key=message.key,
+                    topic=message.topic,
+                    value=message.value,
+                    headers=message.headers,
+                )
+
+
+async def run(
+    messages_count: int,
+    concurrency: int,
+    latency: float,
+    pool_size: int,
+    batching: bool,
+    batch_size: int,
+) -> float:
+    from logic.init import _init_container
+
+    container = _init_container()
+    messages_repository = SlowMessagesRepository(
+        messages_repository=MemoryMessagesRepository(),
+        round_trip=RoundTrip(latency=latency, pool=asyncio.Semaphore(pool_size)),
+    )
+    message_broker = SlowMessageBroker(round_trip=RoundTrip(latency=latency, pool=asyncio.Semaphore(pool_size)))
+
+    if batching:
+        messages_repository = BatchingMessagesRepository(
+            messages_repository=messages_repository,
+            max_batch_size=batch_size,
+        )
+        message_broker = BatchingMessageBroker(message_broker=message_broker, max_batch_size=batch_size)
+
+    container.register(BaseChatsRepository, instance=DetachedMemoryChatRepository(), scope=Scope.singleton)
+    container.register(BaseMessagesRepository, instance=messages_repository, scope=Scope.singleton)
+    container.register(BaseMessageBroker, instance=message_broker, scope=Scope.singleton)
+
+    mediator: Mediator = container.resolve(Mediator)
+    chat, *_ = await mediator.handle_command(CreateChatCommand(title='benchmark'))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def create_message(number: int) -> None:
+        async with semaphore:
+            await mediator.handle_command(CreateMessageCommand(text=f'message {number}', chat_oid=chat.oid))
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(create_message(number) for number in range(messages_count)))
+
+    return messages_count / (time.perf_counter() - started_at)
+
+
+def main():
+    os.environ.setdefault('MONGO_DB_CONNECTION_URI', 'mongodb://localhost:27017')
+    os.environ.setdefault('KAFKA_URL', 'localhost:9092')
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--messages', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--latency-ms', type=float, default=1)
+    parser.add_argument('--pool-size', type=int, default=10)
+    parser.add_argument('--batch-size', type=int, default=100)
+    args = parser.parse_args()
+
+    for batching in (False, True):
+        throughput = asyncio.run(
+            run(
+                messages_count=args.messages,
+                concurrency=args.concurrency,
+                latency=args.latency_ms / 1000,
+                pool_size=args.pool_size,
+                batching=batching,
+                batch_size=args.batch_size,
+            ),
+        )
+        print(f'batching={"on" if batching else "off":<3} {throughput:>10.0f} messages/sec')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""Measures broadcasting to 10k websockets of one chat with per-socket encoding and with one shared frame.
+
+Run with ``python -m benchmarks.websocket_fanout``. Sockets are real Starlette ``WebSocket`` objects over an ASGI
+``send`` that only counts messages, so the numbers are the app-side cost of a broadcast without the network.
+``per_socket`` is what ``send_bytes``/``send_json`` do for every subscriber, ``shared`` sends one prebuilt frame.
+"""
+import argparse
+import asyncio
+import time
+
+from starlette.websockets import (
+    WebSocket,
+    WebSocketState,
+)
+
+from infra.websockets.managers import (
+    ConnectionManager,
+    WebSocketFrame,
+)
+
+
+PAYLOAD = b'{"event_id":"5f14847c-4bca-494d-8ca6-1226a14f2f15","message_text":"hello","chat_oid":"chat"}'
+NOTICE = {'message': 'Chat has been deleted'}
+
+
+class CountingTransport:
+    def __init__(self):
+        self.sent_count = 0
+
+    async def receive(self) -> dict:
+        return {'type': 'websocket.connect'}
+
+    async def send(self, message: dict) -> None:
+        self.sent_count += 1
+
+
+def create_websockets(count: int, transport: CountingTransport, is_accepted: bool = True) -> list[WebSocket]:
+    websockets = []
+
+    for _ in range(count):
+        websocket = WebSocket({'type': 'websocket', 'path': '/', 'headers': []}, transport.receive, transport.send)
+
+        if is_accepted:
+            websocket.application_state = WebSocketState.CONNECTED
+
+        websockets.append(websocket)
+
+    return websockets
+
+
+async def broadcast_per_socket(websockets: list[WebSocket]) -> None:
+    for websocket in websockets:
+        await websocket.send_bytes(PAYLOAD)
+
+
+async def broadcast_shared(websockets: list[WebSocket]) -> None:
+    frame = WebSocketFrame.from_bytes(PAYLOAD)
+
+    for websocket in websockets:
+        await websocket.send(frame.message)
+
+
+async def notify_per_socket(websockets: list[WebSocket]) -> None:
+    for websocket in websockets:
+        await websocket.send_json(NOTICE)
+
+
+async def notify_shared(websockets: list[WebSocket]) -> None:
+    frame = WebSocketFrame.from_json(NOTICE)
+
+    for websocket in websockets:
+        await websocket.send(frame.message)
+
+
+async def measure(operation, websockets: list[WebSocket], repeat: int) -> float:
+    best = float('inf')
+
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        await operation(websockets)
+        best = min(best, time.perf_counter() - started_at)
+
+    return best
+
+
+async def measure_connection_manager(sockets_count: int, messages_count: int) -> float:
+    transport = CountingTransport()
+    connection_manager = ConnectionManager(send_queue_size=messages_count, max_dropped_messages=0)
+
+    for websocket in create_websockets(sockets_count, transport, is_accepted=False):
+        await connection_manager.accept_connection(websocket=websocket, key='chat')
+
+    # Every socket has already received its accept message.
+    expected_count = sockets_count * (messages_count + 1)
+
+    started_at = time.perf_counter()
+
+    for _ in range(messages_count):
+        await connection_manager.send_all(key='chat', bytes_=PAYLOAD)
+
+    while transport.sent_count < expected_count:
+        await asyncio.sleep(0)
+
+    duration = time.perf_counter() - started_at
+    await connection_manager.disconnect_all(key='chat')
+
+    return duration
+
+
+async def run(sockets_count: int, repeat: int, messages_count: int) -> None:
+    websockets = create_websockets(sockets_count, CountingTransport())
+
+    for name, operation in (
+        ('broadcast per_socket', broadcast_per_socket),
+        ('broadcast shared', broadcast_shared),
+        ('notice per_socket', notify_per_socket),
+        ('notice shared', notify_shared),
+    ):
+        duration = await measure(operation, websockets, repeat)
+        print(f'{name:<22} {duration * 1000:>8.2f}ms')
+
+    duration = await measure_connection_manager(sockets_count, messages_count)
+    print(f'connection manager     {messages_count} messages to {sockets_count} sockets in {duration * 1000:.2f}ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sockets', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--messages', type=int, default=10)
+    args = parser.parse_args()
+
+    asyncio.run(run(sockets_count=args.sockets, repeat=args.repeat, messages_count=args.messages))
+
+
+if __name__ == '__main__':
+    main()
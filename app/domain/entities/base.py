@@ -1,5 +1,4 @@
 from abc import ABC
-from copy import copy
 from dataclasses import (
     dataclass,
     field,
@@ -10,14 +9,15 @@ from uuid import uuid4
 from domain.events.base import BaseEvent
 
 
-@dataclass()
+@dataclass(slots=True)
 class BaseEntity(ABC):
     oid: str = field(
         default_factory=lambda: str(uuid4()),
         kw_only=True,
     )
-    _events: list[BaseEvent] = field(
-        default_factory=list,
+    # Most entities never register an event, so the list is only allocated on the first one.
+    _events: list[BaseEvent] | None = field(
+        default=None,
         kw_only=True,
     )
     created_at: datetime = field(
@@ -31,11 +31,23 @@ class BaseEntity(ABC):
     def __eq__(self, __value: 'BaseEntity') -> bool:
         return self.oid == __value.oid
 
+    @classmethod
+    def _hydrate(cls, oid: str, created_at: datetime):
+        # Skips __init__ and its default factories, subclasses set the rest of their fields.
+        entity = object.__new__(cls)
+        entity.oid = oid
+        entity.created_at = created_at
+        entity._events = None
+
+        return entity
+
     def register_event(self, event: BaseEvent) -> None:
+        if self._events is None:
+            self._events = []
+
         self._events.append(event)
 
     def pull_events(self) -> list[BaseEvent]:
-        registered_events = copy(self._events)
-        self._events.clear()
+        registered_events, self._events = self._events or [], None
 
         return registered_events
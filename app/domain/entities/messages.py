@@ -2,6 +2,7 @@ from dataclasses import (
     dataclass,
     field,
 )
+from datetime import datetime
 
 from domain.entities.base import BaseEntity
 from domain.events.messages import (
@@ -10,31 +11,57 @@ from domain.events.messages import (
     NewChatCreatedEvent,
     NewMessageReceivedEvent,
 )
-from domain.exceptions.chats import ListenerAlreadyExistException
 from domain.values.messages import (
     Text,
     Title,
 )
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
 class Message(BaseEntity):
     chat_oid: str
     text: Text
 
+    @classmethod
+    def hydrate(cls, oid: str, created_at: datetime, chat_oid: str, text: Text) -> 'Message':
+        message = cls._hydrate(oid=oid, created_at=created_at)
+        message.chat_oid = chat_oid
+        message.text = text
+
+        return message
 
-@dataclass(eq=False)
+
+@dataclass(eq=False, slots=True)
 class ChatListener(BaseEntity):
-    ...
+    @classmethod
+    def hydrate(cls, oid: str, created_at: datetime) -> 'ChatListener':
+        return cls._hydrate(oid=oid, created_at=created_at)
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
 class Chat(BaseEntity):
     title: Title
     messages: set[Message] = field(default_factory=set, kw_only=True)
     listeners: set[ChatListener] = field(default_factory=set, kw_only=True)
     is_deleted: bool = field(default=False, kw_only=True)
 
+    @classmethod
+    def hydrate(
+        cls,
+        oid: str,
+        created_at: datetime,
+        title: Title,
+        listeners: set[ChatListener] | None = None,
+        is_deleted: bool = False,
+    ) -> 'Chat':
+        chat = cls._hydrate(oid=oid, created_at=created_at)
+        chat.title = title
+        chat.messages = set()
+        chat.listeners = set() if listeners is None else listeners
+        chat.is_deleted = is_deleted
+
+        return chat
+
     @classmethod
     def create_chat(cls, title: Title) -> 'Chat':
         new_chat = cls(title=title)
@@ -57,8 +84,6 @@ class Chat(BaseEntity):
         self.register_event(ChatDeletedEvent(chat_oid=self.oid))
 
     def add_listener(self, listener: ChatListener):
-        if listener in self.listeners:
-            raise ListenerAlreadyExistException(listener_oid=listener.oid)
-
+        # Listeners are stored apart from the chat, so duplicates are rejected by the repository, not here.
         self.listeners.add(listener)
         self.register_event(ListenerAddedEvent(listener_oid=listener.oid))
@@ -13,13 +13,21 @@ from typing import (
 VT = TypeVar("VT", bound=Any)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BaseValueObject(ABC, Generic[VT]):
     value: VT
 
     def __post_init__(self):
         self.validate()
 
+    @classmethod
+    def trusted(cls, value: VT):
+        """Builds the value without validation, only for data that was validated before it was stored."""
+        value_object = object.__new__(cls)
+        _set_value(value_object, value)
+
+        return value_object
+
     @abstractmethod
     def validate(self):
         ...
@@ -27,3 +35,7 @@ class BaseValueObject(ABC, Generic[VT]):
     @abstractmethod
     def as_generic_type(self) -> VT:
         ...
+
+
+# The slot descriptor sets the value directly, past the frozen dataclass __setattr__.
+_set_value = BaseValueObject.__dict__['value'].__set__
@@ -7,7 +7,7 @@ from domain.exceptions.messages import (
 from domain.values.base import BaseValueObject
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Text(BaseValueObject[str]):
     def validate(self):
         if not self.value:
@@ -17,7 +17,7 @@ class Text(BaseValueObject[str]):
         return str(self.value)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Title(BaseValueObject):
     def validate(self):
         if not self.value:
@@ -0,0 +1,70 @@
+import asyncio
+from dataclasses import (
+    dataclass,
+    field,
+)
+from typing import (
+    Awaitable,
+    Callable,
+    Generic,
+    TypeVar,
+)
+
+
+BT = TypeVar('BT')
+
+
+@dataclass(eq=False)
+class Batcher(Generic[BT]):
+    """Flushes submitted items together once max_batch_size is reached or max_latency has passed."""
+    flush: Callable[[list[BT]], Awaitable[None]]
+    max_batch_size: int = 100
+    max_latency: float = 0.005
+
+    _pending: list[tuple[BT, asyncio.Future]] = field(default_factory=list, init=False)
+    _flush_timer: asyncio.TimerHandle | None = field(default=None, init=False)
+    _flush_tasks: set[asyncio.Task] = field(default_factory=set, init=False)
+
+    async def submit(self, item: BT) -> None:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._start_flush()
+        elif self._flush_timer is None:
+            self._flush_timer = loop.call_later(self.max_latency, self._start_flush)
+
+        await future
+
+    async def close(self) -> None:
+        self._start_flush()
+
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+
+    def _start_flush(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+
+        task = asyncio.get_running_loop().create_task(self._flush_batch(batch))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush_batch(self, batch: list[tuple[BT, asyncio.Future]]) -> None:
+        try:
+            await self.flush([item for item, _ in batch])
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+        else:
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
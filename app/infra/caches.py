@@ -0,0 +1,63 @@
+import time
+from collections import OrderedDict
+from dataclasses import (
+    dataclass,
+    field,
+)
+from typing import (
+    Callable,
+    Generic,
+    Hashable,
+    TypeVar,
+)
+
+
+KT = TypeVar('KT', bound=Hashable)
+VT = TypeVar('VT')
+
+
+@dataclass(eq=False)
+class LRUTTLCache(Generic[KT, VT]):
+    max_size: int = 10_000
+    ttl: float = 60
+    clock: Callable[[], float] = time.monotonic
+
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    _items: OrderedDict[KT, tuple[float, VT]] = field(default_factory=OrderedDict, init=False)
+
+    def get(self, key: KT) -> VT | None:
+        item = self._items.get(key)
+
+        if item is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = item
+
+        if expires_at <= self.clock():
+            del self._items[key]
+            self.misses += 1
+            return None
+
+        self._items.move_to_end(key)
+        self.hits += 1
+
+        return value
+
+    def set(self, key: KT, value: VT) -> None:
+        self._items[key] = (self.clock() + self.ttl, value)
+        self._items.move_to_end(key)
+
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def invalidate(self, key: KT) -> None:
+        self._items.pop(key, None)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._items)}
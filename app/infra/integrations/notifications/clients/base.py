@@ -16,4 +16,7 @@ class BaseNotificationClient(ABC):
 
     @abstractmethod
     async def send(self, notification: Notification):
+        """Raises NotificationDeliveryException if the notification was not delivered."""
+
+    async def close(self):
         ...
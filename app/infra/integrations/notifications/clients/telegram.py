@@ -1,26 +1,58 @@
 from dataclasses import dataclass
 
-from httpx import AsyncClient
+from httpx import (
+    AsyncClient,
+    HTTPError,
+    Response,
+)
 
 from infra.integrations.notifications.clients.base import BaseNotificationClient
 from infra.integrations.notifications.dtos import Notification
+from infra.integrations.notifications.exceptions import NotificationDeliveryException
+from infra.rate_limiting import TokenBucket
+
+
+TELEGRAM_MAX_MESSAGE_LENGTH = 4096
+
+
+def get_retry_after(response: Response) -> float | None:
+    try:
+        return response.json()['parameters']['retry_after']
+    except (ValueError, KeyError, TypeError):
+        return None
 
 
 @dataclass
 class TelegramNotificationClient(BaseNotificationClient):
     bot_token: str
-    chat_id: str
     http_client: AsyncClient
-    send_url: str
+    send_url: str = 'https://api.telegram.org'
+    rate_limiter: TokenBucket | None = None
 
     async def _format_notification(self, notification: Notification) -> str:
-        return f"{notification.title}\n{notification.text}\n"
+        return f"{notification.title}\n{notification.text}"[:TELEGRAM_MAX_MESSAGE_LENGTH]
 
     async def send(self, notification: Notification):
-        await self.http_client.get(
-            url=f"{self._host}/bot{self._token}/sendMessage",
-            params={
-                'chat_id': self.chat_id,
-                'text': self._format_notification(notification=notification),
-            },
-        )
+        # Telegram throttles per bot, so every request of this bot goes through its bucket.
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+
+        try:
+            response = await self.http_client.post(
+                url=f"{self.send_url}/bot{self.bot_token}/sendMessage",
+                json={
+                    'chat_id': notification.recipient_id,
+                    'text': await self._format_notification(notification=notification),
+                },
+            )
+        except HTTPError as error:
+            raise NotificationDeliveryException() from error
+
+        if response.is_error:
+            raise NotificationDeliveryException(
+                status_code=response.status_code,
+                retry_after=get_retry_after(response) if response.status_code == 429 else None,
+            )
+
+    async def close(self):
+        await self.http_client.aclose()
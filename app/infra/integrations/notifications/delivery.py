@@ -0,0 +1,110 @@
+import asyncio
+import logging
+from dataclasses import (
+    dataclass,
+    field,
+)
+
+from infra.integrations.notifications.clients.base import BaseNotificationClient
+from infra.integrations.notifications.dtos import Notification
+from infra.integrations.notifications.exceptions import NotificationDeliveryException
+
+
+logger = logging.getLogger(__name__)
+
+
+def coalesce_notifications(notifications: list[Notification]) -> Notification:
+    if len(notifications) == 1:
+        return notifications[0]
+
+    first = notifications[0]
+
+    return Notification(
+        recipient_id=first.recipient_id,
+        title=first.title,
+        text='\n'.join(notification.text for notification in notifications),
+    )
+
+
+@dataclass(eq=False)
+class NotificationDeliveryWorker:
+    """Coalesces bursts per recipient and title, then delivers them with bounded concurrency and retries."""
+    client: BaseNotificationClient
+    max_concurrency: int = 10
+    max_retries: int = 3
+    retry_backoff: float = 0.5
+    max_retry_backoff: float = 30
+    coalesce_window: float = 1
+    max_coalesced: int = 20
+
+    delivered: int = field(default=0, init=False)
+    failed: int = field(default=0, init=False)
+    _pending: dict[tuple[str, str], list[Notification]] = field(default_factory=dict, init=False)
+    _flush_timers: dict[tuple[str, str], asyncio.TimerHandle] = field(default_factory=dict, init=False)
+    _delivery_tasks: set[asyncio.Task] = field(default_factory=set, init=False)
+    _semaphore: asyncio.Semaphore = field(init=False)
+
+    def __post_init__(self):
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    def submit(self, notification: Notification) -> None:
+        key = (notification.recipient_id, notification.title)
+        pending = self._pending.setdefault(key, [])
+        pending.append(notification)
+
+        if len(pending) >= self.max_coalesced:
+            self._start_delivery(key)
+        elif key not in self._flush_timers:
+            self._flush_timers[key] = asyncio.get_running_loop().call_later(
+                self.coalesce_window,
+                self._start_delivery,
+                key,
+            )
+
+    async def close(self) -> None:
+        for key in list(self._pending):
+            self._start_delivery(key)
+
+        if self._delivery_tasks:
+            await asyncio.gather(*self._delivery_tasks, return_exceptions=True)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {
+            'delivered': self.delivered,
+            'failed': self.failed,
+            'pending': sum(len(notifications) for notifications in self._pending.values()),
+            'in_flight': len(self._delivery_tasks),
+        }
+
+    def _start_delivery(self, key: tuple[str, str]) -> None:
+        flush_timer = self._flush_timers.pop(key, None)
+
+        if flush_timer is not None:
+            flush_timer.cancel()
+
+        notifications = self._pending.pop(key, None)
+
+        if not notifications:
+            return
+
+        task = asyncio.get_running_loop().create_task(self._deliver(coalesce_notifications(notifications)))
+        self._delivery_tasks.add(task)
+        task.add_done_callback(self._delivery_tasks.discard)
+
+    async def _deliver(self, notification: Notification) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._semaphore:
+                    await self.client.send(notification)
+            except NotificationDeliveryException as error:
+                if not error.is_retryable or attempt == self.max_retries:
+                    self.failed += 1
+                    logger.warning('Failed to deliver notification to %s', notification.recipient_id, exc_info=error)
+                    return
+
+                # The backoff happens outside of the semaphore so waiting retries don't hold up other recipients.
+                await asyncio.sleep(error.retry_after or min(self.retry_backoff * 2 ** attempt, self.max_retry_backoff))
+            else:
+                self.delivered += 1
+                return
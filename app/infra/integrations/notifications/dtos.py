@@ -3,5 +3,6 @@ from dataclasses import dataclass
 
 @dataclass(frozen=True)
 class Notification:
+    recipient_id: str
     title: str
     text: str
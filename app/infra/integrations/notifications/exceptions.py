@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+
+from domain.exceptions.base import ApplicationException
+
+
+@dataclass(eq=False)
+class NotificationDeliveryException(ApplicationException):
+    status_code: int | None = None
+    retry_after: float | None = None
+
+    @property
+    def message(self):
+        return f'Failed to deliver notification, status code: {self.status_code}'
+
+    @property
+    def is_retryable(self) -> bool:
+        # Network errors, throttling and server errors go away on their own, bad requests don't.
+        return self.status_code is None or self.status_code == 429 or self.status_code >= 500
@@ -3,7 +3,37 @@ from abc import (
     abstractmethod,
 )
 from dataclasses import dataclass
-from typing import AsyncIterator
+from typing import (
+    AsyncIterator,
+    Iterable,
+)
+
+
+Headers = tuple[tuple[str, bytes], ...]
+
+
+@dataclass(frozen=True)
+class BrokerMessage:
+    key: bytes
+    topic: str
+    value: bytes
+    headers: Headers = ()
+
+
+@dataclass(frozen=True, slots=True)
+class BrokerRecord:
+    """A consumed record as it came off the wire, its value is still encoded."""
+    topic: str
+    key: bytes | None
+    value: bytes
+    headers: Headers = ()
+
+    def get_header(self, name: str) -> bytes | None:
+        for header_name, header_value in self.headers:
+            if header_name == name:
+                return header_value
+
+        return None
 
 
 @dataclass
@@ -17,13 +47,25 @@ class BaseMessageBroker(ABC):
         ...
 
     @abstractmethod
-    async def send_message(self, key: bytes, topic: str, value: bytes):
+    async def send_message(self, key: bytes, topic: str, value: bytes, headers: Headers = ()):
         ...
 
+    async def send_messages(self, messages: Iterable[BrokerMessage]):
+        for message in messages:
+            await self.send_message(
+                key=message.key,
+                topic=message.topic,
+                value=message.value,
+                headers=message.headers,
+            )
+
     @abstractmethod
-    async def start_consuming(self, topic: str) -> AsyncIterator[dict]:
-        ...
+    async def start_consuming_records(self, topic: str, group_id: str | None = None) -> AsyncIterator[BrokerRecord]:
+        """Yields undecoded records for consumers to filter. A shared group_id splits the topic, None is private."""
 
     @abstractmethod
     async def stop_consuming(self):
         ...
+
+    def get_consumer_lag(self, topic: str) -> int:
+        return 0
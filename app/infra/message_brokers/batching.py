@@ -0,0 +1,55 @@
+from dataclasses import (
+    dataclass,
+    field,
+)
+from typing import (
+    AsyncIterator,
+    Iterable,
+)
+
+from infra.batching import Batcher
+from infra.message_brokers.base import (
+    BaseMessageBroker,
+    BrokerMessage,
+    BrokerRecord,
+    Headers,
+)
+
+
+@dataclass
+class BatchingMessageBroker(BaseMessageBroker):
+    message_broker: BaseMessageBroker
+    max_batch_size: int = 100
+    max_latency: float = 0.005
+
+    _batcher: Batcher[BrokerMessage] = field(init=False)
+
+    def __post_init__(self):
+        self._batcher = Batcher(
+            flush=self.message_broker.send_messages,
+            max_batch_size=self.max_batch_size,
+            max_latency=self.max_latency,
+        )
+
+    async def send_message(self, key: bytes, topic: str, value: bytes, headers: Headers = ()):
+        await self._batcher.submit(BrokerMessage(key=key, topic=topic, value=value, headers=tuple(headers)))
+
+    async def send_messages(self, messages: Iterable[BrokerMessage]):
+        await self.message_broker.send_messages(messages)
+
+    async def start_consuming_records(self, topic: str, group_id: str | None = None) -> AsyncIterator[BrokerRecord]:
+        async for record in self.message_broker.start_consuming_records(topic, group_id=group_id):
+            yield record
+
+    async def stop_consuming(self):
+        await self.message_broker.stop_consuming()
+
+    def get_consumer_lag(self, topic: str) -> int:
+        return self.message_broker.get_consumer_lag(topic)
+
+    async def close(self):
+        await self._batcher.close()
+        await self.message_broker.close()
+
+    async def start(self):
+        await self.message_broker.start()
@@ -0,0 +1,297 @@
+import re
+import struct
+from abc import (
+    ABC,
+    abstractmethod,
+)
+from dataclasses import (
+    dataclass,
+    field,
+)
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+from typing import (
+    Any,
+    ClassVar,
+    Iterable,
+)
+from uuid import UUID
+
+import orjson
+
+from domain.events.base import BaseEvent
+from domain.events.messages import (
+    ChatDeletedEvent,
+    ListenerAddedEvent,
+    NewChatCreatedEvent,
+    NewMessageReceivedEvent,
+)
+from infra.message_brokers.base import (
+    BrokerRecord,
+    Headers,
+)
+
+
+CONTENT_TYPE_HEADER = 'content-type'
+EVENT_TYPE_HEADER = 'event-type'
+
+JSON_CONTENT_TYPE = 'application/json'
+BINARY_CONTENT_TYPE = 'application/x-chat-event'
+
+
+class EventDecodingError(ValueError):
+    ...
+
+
+@dataclass(frozen=True)
+class EventSchema:
+    """Field ids of an event type, they are positions in fields and must never be reused or reordered.
+
+    Bump version and append to fields when an event gains a field, decoders skip the ids they don't know.
+    """
+    event_type: type[BaseEvent]
+    version: int
+    fields: tuple[str, ...]
+
+    @property
+    def name(self) -> str:
+        return self.event_type.__name__
+
+
+class BaseEventCodec(ABC):
+    content_type: ClassVar[str]
+
+    @abstractmethod
+    def encode(self, event: BaseEvent, schema: EventSchema) -> bytes:
+        ...
+
+    @abstractmethod
+    def decode(self, value: bytes, schema: EventSchema | None) -> dict[str, Any]:
+        """Returns the fields the way the JSON codec would, UUIDs and datetimes as strings."""
+
+
+class JSONEventCodec(BaseEventCodec):
+    content_type = JSON_CONTENT_TYPE
+
+    def encode(self, event: BaseEvent, schema: EventSchema) -> bytes:
+        return orjson.dumps(event)
+
+    def decode(self, value: bytes, schema: EventSchema | None) -> dict[str, Any]:
+        return orjson.loads(value)
+
+
+FORMAT_VERSION = 1
+
+STR_TAG = 0
+UUID_TAG = 1
+DATETIME_TAG = 2
+AWARE_DATETIME_TAG = 3
+INT_TAG = 4
+TRUE_TAG = 5
+FALSE_TAG = 6
+NONE_TAG = 7
+
+EPOCH = datetime(1970, 1, 1)
+is_canonical_uuid = re.compile('[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}').fullmatch
+INT64 = struct.Struct('<q')
+
+
+def write_varint(buffer: bytearray, number: int) -> None:
+    while number > 0x7F:
+        buffer.append((number & 0x7F) | 0x80)
+        number >>= 7
+
+    buffer.append(number)
+
+
+def read_varint(value: bytes, offset: int) -> tuple[int, int]:
+    number = shift = 0
+
+    while True:
+        byte = value[offset]
+        offset += 1
+        number |= (byte & 0x7F) << shift
+
+        if byte < 0x80:
+            return number, offset
+
+        shift += 7
+
+
+def format_uuid(uuid_bytes: bytes) -> str:
+    hex_ = uuid_bytes.hex()
+
+    return f'{hex_[:8]}-{hex_[8:12]}-{hex_[12:16]}-{hex_[16:20]}-{hex_[20:]}'
+
+
+def to_microseconds(moment: datetime) -> int:
+    delta = moment - EPOCH
+
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+class BinaryEventCodec(BaseEventCodec):
+    """Compact tagged encoding: format and schema versions, then a field id, a type tag and a value per field.
+
+    Field names never go on the wire, UUIDs take 16 bytes and datetimes 8 bytes of microseconds since the epoch.
+    Decoded UUIDs come back as strings, which is all the JSON codec gives consumers as well.
+    """
+    content_type = BINARY_CONTENT_TYPE
+
+    def encode(self, event: BaseEvent, schema: EventSchema) -> bytes:
+        buffer = bytearray((FORMAT_VERSION,))
+        write_varint(buffer, schema.version)
+
+        for field_id, field_name in enumerate(schema.fields, start=1):
+            write_varint(buffer, field_id)
+            self._write_value(buffer, getattr(event, field_name))
+
+        return bytes(buffer)
+
+    def decode(self, value: bytes, schema: EventSchema | None) -> dict[str, Any]:
+        if schema is None:
+            raise EventDecodingError('Binary events can only be decoded with the schema of their event type')
+
+        if not value or value[0] != FORMAT_VERSION:
+            raise EventDecodingError('Unsupported binary event format')
+
+        _, offset = read_varint(value, 1)
+        result = {}
+
+        while offset < len(value):
+            field_id, offset = read_varint(value, offset)
+            field_value, offset = self._read_value(value, offset)
+
+            # Ids past the known fields come from a newer schema version.
+            if field_id <= len(schema.fields):
+                result[schema.fields[field_id - 1]] = field_value
+
+        return result
+
+    def _write_value(self, buffer: bytearray, field_value: Any) -> None:
+        if isinstance(field_value, str):
+            # Oids are UUID strings, packed they take 16 bytes instead of 36 and decode back to the same string.
+            if is_canonical_uuid(field_value):
+                buffer.append(UUID_TAG)
+                buffer += bytes.fromhex(field_value.replace('-', ''))
+                return
+
+            encoded = field_value.encode()
+            buffer.append(STR_TAG)
+            write_varint(buffer, len(encoded))
+            buffer += encoded
+        elif isinstance(field_value, UUID):
+            buffer.append(UUID_TAG)
+            buffer += field_value.bytes
+        elif isinstance(field_value, datetime):
+            if field_value.tzinfo is None:
+                buffer.append(DATETIME_TAG)
+                buffer += INT64.pack(to_microseconds(field_value))
+            else:
+                buffer.append(AWARE_DATETIME_TAG)
+                buffer += INT64.pack(to_microseconds(field_value.astimezone(timezone.utc).replace(tzinfo=None)))
+        elif field_value is None:
+            buffer.append(NONE_TAG)
+        elif isinstance(field_value, bool):
+            buffer.append(TRUE_TAG if field_value else FALSE_TAG)
+        elif isinstance(field_value, int):
+            buffer.append(INT_TAG)
+            buffer += INT64.pack(field_value)
+        else:
+            raise TypeError(f'Cannot encode {type(field_value).__name__} in a binary event')
+
+    def _read_value(self, value: bytes, offset: int) -> tuple[Any, int]:
+        tag = value[offset]
+        offset += 1
+
+        if tag == STR_TAG:
+            length, offset = read_varint(value, offset)
+            return value[offset:offset + length].decode(), offset + length
+
+        if tag == UUID_TAG:
+            return format_uuid(value[offset:offset + 16]), offset + 16
+
+        if tag in (DATETIME_TAG, AWARE_DATETIME_TAG):
+            moment = EPOCH + timedelta(microseconds=INT64.unpack_from(value, offset)[0])
+
+            if tag == AWARE_DATETIME_TAG:
+                moment = moment.replace(tzinfo=timezone.utc)
+
+            return moment.isoformat(), offset + 8
+
+        if tag == INT_TAG:
+            return INT64.unpack_from(value, offset)[0], offset + 8
+
+        if tag in (TRUE_TAG, FALSE_TAG, NONE_TAG):
+            return {TRUE_TAG: True, FALSE_TAG: False, NONE_TAG: None}[tag], offset
+
+        raise EventDecodingError(f'Unknown binary event tag {tag}')
+
+
+EVENT_SCHEMAS = (
+    EventSchema(
+        event_type=NewMessageReceivedEvent,
+        version=1,
+        fields=('event_id', 'occurred_at', 'message_text', 'message_oid', 'chat_oid'),
+    ),
+    EventSchema(
+        event_type=NewChatCreatedEvent,
+        version=1,
+        fields=('event_id', 'occurred_at', 'chat_oid', 'chat_title'),
+    ),
+    EventSchema(event_type=ChatDeletedEvent, version=1, fields=('event_id', 'occurred_at', 'chat_oid')),
+    EventSchema(event_type=ListenerAddedEvent, version=1, fields=('event_id', 'occurred_at', 'listener_oid')),
+)
+
+
+@dataclass
+class EventCodecRegistry:
+    """Picks the codec of each produced event and tells consumers how a record was encoded through its headers."""
+    schemas: Iterable[EventSchema] = EVENT_SCHEMAS
+    default_content_type: str = JSON_CONTENT_TYPE
+    codecs: Iterable[BaseEventCodec] = field(default_factory=lambda: (JSONEventCodec(), BinaryEventCodec()))
+
+    _schemas_map: dict[str, EventSchema] = field(init=False)
+    _codecs_map: dict[str, BaseEventCodec] = field(init=False)
+
+    def __post_init__(self):
+        self._schemas_map = {schema.name: schema for schema in self.schemas}
+        self._codecs_map = {codec.content_type: codec for codec in self.codecs}
+
+    def encode(self, event: BaseEvent) -> tuple[bytes, Headers]:
+        event_type = event.__class__.__name__
+        schema = self._schemas_map.get(event_type)
+        # Events without a schema have no field ids, so they can only travel as JSON.
+        content_type = self.default_content_type if schema is not None else JSON_CONTENT_TYPE
+        headers = ((CONTENT_TYPE_HEADER, content_type.encode()), (EVENT_TYPE_HEADER, event_type.encode()))
+
+        return self._codecs_map[content_type].encode(event, schema), headers
+
+    def decode(self, record: BrokerRecord) -> dict[str, Any]:
+        content_type = self.get_content_type(record)
+        codec = self._codecs_map.get(content_type)
+
+        if codec is None:
+            raise EventDecodingError(f'Unknown event content type {content_type}')
+
+        event_type = record.get_header(EVENT_TYPE_HEADER)
+        schema = self._schemas_map.get(event_type.decode()) if event_type is not None else None
+
+        return codec.decode(record.value, schema)
+
+    def to_json(self, record: BrokerRecord) -> bytes:
+        # JSON records are passed on untouched, only other encodings pay for transcoding.
+        if self.get_content_type(record) == JSON_CONTENT_TYPE:
+            return record.value
+
+        return orjson.dumps(self.decode(record))
+
+    @staticmethod
+    def get_content_type(record: BrokerRecord) -> str:
+        # Records produced before headers were introduced are JSON.
+        content_type = record.get_header(CONTENT_TYPE_HEADER)
+
+        return content_type.decode() if content_type is not None else JSON_CONTENT_TYPE
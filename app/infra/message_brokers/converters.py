@@ -1,13 +1,17 @@
 from dataclasses import asdict
 
-import orjson
-
 from domain.events.base import BaseEvent
-
-
-def convert_event_to_broker_message(event: BaseEvent) -> bytes:
-    return orjson.dumps(event)
+from infra.message_brokers.base import BrokerRecord
+from infra.message_brokers.codecs import EventCodecRegistry
 
 
 def convert_event_to_json(event: BaseEvent) -> dict[str, any]:
     return asdict(event)
+
+
+def get_record_chat_oid(record: BrokerRecord, event_codecs: EventCodecRegistry) -> str:
+    # Chat events are keyed by chat, only records produced without a key need their payload decoded.
+    if record.key is not None:
+        return record.key.decode()
+
+    return event_codecs.decode(record)['chat_oid']
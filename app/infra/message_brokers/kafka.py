@@ -1,42 +1,124 @@
+import asyncio
+import logging
 from dataclasses import (
     dataclass,
     field,
 )
-from typing import AsyncIterator
+from typing import (
+    AsyncIterator,
+    Callable,
+    Iterable,
+)
 
-import orjson
-from aiokafka import AIOKafkaConsumer
+from aiokafka import (
+    AIOKafkaConsumer,
+    TopicPartition,
+)
 from aiokafka.producer import AIOKafkaProducer
 
-from infra.message_brokers.base import BaseMessageBroker
+from infra.message_brokers.base import (
+    BaseMessageBroker,
+    BrokerMessage,
+    BrokerRecord,
+    Headers,
+)
+
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
 class KafkaMessageBroker(BaseMessageBroker):
     # По хорошему здесь должен быть IProducer
     producer: AIOKafkaProducer
-    consumer: AIOKafkaConsumer
-    consumer_map: dict[str, AIOKafkaConsumer] = field(
+    consumer_factory: Callable[[str | None], AIOKafkaConsumer]
+    consumer_map: dict[tuple[str, str | None], AIOKafkaConsumer] = field(
         default_factory=dict,
         kw_only=True,
     )
+    lag_map: dict[TopicPartition, int] = field(
+        default_factory=dict,
+        kw_only=True,
+    )
+    wait_for_delivery: bool = field(default=True, kw_only=True)
+    pending_deliveries: set[asyncio.Future] = field(default_factory=set, kw_only=True)
+
+    async def send_message(self, key: bytes, topic: str, value: bytes, headers: Headers = ()):
+        delivery_future = await self.producer.send(key=key, topic=topic, value=value, headers=list(headers) or None)
+
+        if self.wait_for_delivery:
+            await delivery_future
+        else:
+            self._track_delivery(delivery_future)
 
-    async def send_message(self, key: bytes, topic: str, value: bytes):
-        await self.producer.send(key=key, topic=topic, value=value)
+    async def send_messages(self, messages: Iterable[BrokerMessage]):
+        # Enqueue the whole batch before waiting so the producer can pack it into as few requests as possible.
+        delivery_futures = [
+            await self.producer.send(
+                key=message.key,
+                topic=message.topic,
+                value=message.value,
+                headers=list(message.headers) or None,
+            )
+            for message in messages
+        ]
 
-    async def start_consuming(self, topic: str) -> AsyncIterator[dict]:
-        self.consumer.subscribe(topics=[topic])
+        if self.wait_for_delivery:
+            await asyncio.gather(*delivery_futures)
+        else:
+            for delivery_future in delivery_futures:
+                self._track_delivery(delivery_future)
 
-        async for message in self.consumer:
-            yield orjson.loads(message.value)
+    async def flush(self) -> None:
+        if self.pending_deliveries:
+            await asyncio.gather(*self.pending_deliveries, return_exceptions=True)
+
+    def _track_delivery(self, delivery_future: asyncio.Future) -> None:
+        self.pending_deliveries.add(delivery_future)
+        delivery_future.add_done_callback(self._on_delivery_done)
+
+    def _on_delivery_done(self, delivery_future: asyncio.Future) -> None:
+        self.pending_deliveries.discard(delivery_future)
+
+        if not delivery_future.cancelled() and delivery_future.exception() is not None:
+            logger.error('Failed to deliver message to Kafka', exc_info=delivery_future.exception())
+
+    async def start_consuming_records(self, topic: str, group_id: str | None = None) -> AsyncIterator[BrokerRecord]:
+        consumer = self.consumer_map.get((topic, group_id))
+
+        if consumer is None:
+            consumer = self.consumer_map[(topic, group_id)] = self.consumer_factory(group_id)
+            await consumer.start()
+            consumer.subscribe(topics=[topic])
+
+        async for message in consumer:
+            partition = TopicPartition(message.topic, message.partition)
+            highwater = consumer.highwater(partition)
+
+            if highwater is not None:
+                self.lag_map[partition] = highwater - message.offset - 1
+
+            yield BrokerRecord(
+                topic=message.topic,
+                key=message.key,
+                value=message.value,
+                headers=tuple(message.headers or ()),
+            )
+
+    def get_consumer_lag(self, topic: str) -> int:
+        return sum(lag for partition, lag in self.lag_map.items() if partition.topic == topic)
 
     async def stop_consuming(self):
-        self.consumer.unsubscribe()
+        for consumer in self.consumer_map.values():
+            consumer.unsubscribe()
 
     async def close(self):
-        await self.consumer.stop()
+        for consumer in self.consumer_map.values():
+            await consumer.stop()
+
+        self.consumer_map.clear()
+        await self.flush()
         await self.producer.stop()
 
     async def start(self):
         await self.producer.start()
-        await self.consumer.start()
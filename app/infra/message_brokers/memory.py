@@ -0,0 +1,54 @@
+import asyncio
+from collections import defaultdict
+from dataclasses import (
+    dataclass,
+    field,
+)
+from typing import AsyncIterator
+
+from infra.message_brokers.base import (
+    BaseMessageBroker,
+    BrokerRecord,
+    Headers,
+)
+
+
+@dataclass
+class MemoryMessageBroker(BaseMessageBroker):
+    sent_messages: list[tuple[str, bytes, bytes]] = field(default_factory=list, kw_only=True)
+    queues_map: dict[str | tuple[str, str], asyncio.Queue] = field(
+        default_factory=lambda: defaultdict(asyncio.Queue),
+        kw_only=True,
+    )
+    groups_map: dict[str, set[str]] = field(default_factory=lambda: defaultdict(set), kw_only=True)
+
+    async def send_message(self, key: bytes, topic: str, value: bytes, headers: Headers = ()):
+        self.sent_messages.append((topic, key, value))
+        record = BrokerRecord(topic=topic, key=key, value=value, headers=tuple(headers))
+        self.queues_map[topic].put_nowait(record)
+
+        # Every consumer group gets its own copy of the topic, like in Kafka.
+        for group_id in self.groups_map[topic]:
+            self.queues_map[(topic, group_id)].put_nowait(record)
+
+    async def start_consuming_records(self, topic: str, group_id: str | None = None) -> AsyncIterator[BrokerRecord]:
+        queue_key = topic
+
+        if group_id is not None:
+            self.groups_map[topic].add(group_id)
+            queue_key = (topic, group_id)
+
+        while True:
+            yield await self.queues_map[queue_key].get()
+
+    async def stop_consuming(self):
+        ...
+
+    def get_consumer_lag(self, topic: str) -> int:
+        return self.queues_map[topic].qsize()
+
+    async def close(self):
+        ...
+
+    async def start(self):
+        ...
@@ -0,0 +1,137 @@
+import asyncio
+import logging
+from dataclasses import (
+    dataclass,
+    field,
+)
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+from typing import (
+    AsyncIterator,
+    Iterable,
+)
+
+from infra.message_brokers.base import (
+    BaseMessageBroker,
+    BrokerMessage,
+    BrokerRecord,
+    Headers,
+)
+from infra.repositories.outbox.base import (
+    BaseOutboxRepository,
+    OutboxMessage,
+)
+from infra.repositories.transactions import call_after_commit
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(eq=False)
+class OutboxRelay:
+    outbox_repository: BaseOutboxRepository
+    message_broker: BaseMessageBroker
+    batch_size: int = 100
+    poll_interval: float = 0.5
+    claim_timeout: float = 30
+    retry_backoff: float = 1
+    max_retry_backoff: float = 60
+
+    _wake_up_event: asyncio.Event = field(default_factory=asyncio.Event, init=False)
+
+    def wake_up(self) -> None:
+        self._wake_up_event.set()
+
+    async def run(self) -> None:
+        while True:
+            try:
+                relayed_count = await self.relay_pending_messages()
+            except Exception:
+                logger.exception('Failed to relay outbox messages')
+                relayed_count = 0
+
+            if relayed_count < self.batch_size:
+                await self._wait_for_messages()
+
+    async def relay_pending_messages(self) -> int:
+        messages = await self.outbox_repository.claim_pending_messages(
+            limit=self.batch_size,
+            claimed_until=datetime.now(timezone.utc) + timedelta(seconds=self.claim_timeout),
+        )
+
+        if not messages:
+            return 0
+
+        oids = [message.oid for message in messages]
+
+        try:
+            await self.message_broker.send_messages(
+                BrokerMessage(key=message.key, topic=message.topic, value=message.value, headers=message.headers)
+                for message in messages
+            )
+        except Exception:
+            logger.exception('Failed to send %s outbox messages, retrying later', len(messages))
+            await self.outbox_repository.mark_failed(oids=oids, available_at=self._get_retry_at(messages))
+            return 0
+
+        await self.outbox_repository.mark_sent(oids=oids)
+
+        return len(messages)
+
+    async def _wait_for_messages(self) -> None:
+        try:
+            await asyncio.wait_for(self._wake_up_event.wait(), timeout=self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+
+        self._wake_up_event.clear()
+
+    def _get_retry_at(self, messages: list[OutboxMessage]) -> datetime:
+        attempts = max(message.attempts for message in messages)
+        backoff = min(self.retry_backoff * 2 ** attempts, self.max_retry_backoff)
+
+        return datetime.now(timezone.utc) + timedelta(seconds=backoff)
+
+
+@dataclass
+class OutboxMessageBroker(BaseMessageBroker):
+    """Stores produced messages in the outbox, the relay delivers them to the wrapped broker."""
+    message_broker: BaseMessageBroker
+    outbox_repository: BaseOutboxRepository
+    relay: OutboxRelay
+
+    async def send_message(self, key: bytes, topic: str, value: bytes, headers: Headers = ()):
+        # Only atomic with the entity write inside a command's Mongo transaction (OUTBOX_TRANSACTIONS_ENABLED),
+        # without one a crash between the two writes still loses the event.
+        await self.outbox_repository.add_messages(
+            [OutboxMessage(topic=topic, key=key, value=value, headers=tuple(headers))],
+        )
+        await call_after_commit(self.relay.wake_up)
+
+    async def send_messages(self, messages: Iterable[BrokerMessage]):
+        await self.outbox_repository.add_messages(
+            [
+                OutboxMessage(topic=message.topic, key=message.key, value=message.value, headers=message.headers)
+                for message in messages
+            ],
+        )
+        await call_after_commit(self.relay.wake_up)
+
+    async def start_consuming_records(self, topic: str, group_id: str | None = None) -> AsyncIterator[BrokerRecord]:
+        async for record in self.message_broker.start_consuming_records(topic, group_id=group_id):
+            yield record
+
+    async def stop_consuming(self):
+        await self.message_broker.stop_consuming()
+
+    def get_consumer_lag(self, topic: str) -> int:
+        return self.message_broker.get_consumer_lag(topic)
+
+    async def close(self):
+        await self.message_broker.close()
+
+    async def start(self):
+        await self.message_broker.start()
@@ -0,0 +1,36 @@
+from dataclasses import (
+    dataclass,
+    field,
+)
+
+
+@dataclass
+class ConsumerMetrics:
+    processed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    in_flight: int = 0
+    lag: int = 0
+    processing_time_total: float = 0
+    processing_time_max: float = 0
+
+    @property
+    def processing_time_avg(self) -> float:
+        handled = self.processed + self.failed
+
+        return self.processing_time_total / handled if handled else 0
+
+    def observe_processing_time(self, processing_time: float) -> None:
+        self.processing_time_total += processing_time
+        self.processing_time_max = max(self.processing_time_max, processing_time)
+
+
+@dataclass
+class MetricsRegistry:
+    consumers_map: dict[str, ConsumerMetrics] = field(default_factory=dict)
+
+    def get_consumer_metrics(self, name: str) -> ConsumerMetrics:
+        if name not in self.consumers_map:
+            self.consumers_map[name] = ConsumerMetrics()
+
+        return self.consumers_map[name]
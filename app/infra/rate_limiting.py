@@ -0,0 +1,39 @@
+import asyncio
+import time
+from dataclasses import (
+    dataclass,
+    field,
+)
+from typing import Callable
+
+
+@dataclass(eq=False)
+class TokenBucket:
+    """Allows bursts of up to capacity acquisitions and refills rate tokens per second."""
+    rate: float
+    capacity: float
+    clock: Callable[[], float] = time.monotonic
+
+    _tokens: float = field(init=False)
+    _updated_at: float = field(init=False)
+
+    def __post_init__(self):
+        self._tokens = self.capacity
+        self._updated_at = self.clock()
+
+    def reserve(self) -> float:
+        """Takes a token and returns how long to wait before it may be used."""
+        now = self.clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+        # Going into debt queues callers up in order instead of letting them race for the next refill.
+        self._tokens -= 1
+
+        return max(0.0, -self._tokens / self.rate)
+
+    async def acquire(self) -> None:
+        delay = self.reserve()
+
+        if delay:
+            await asyncio.sleep(delay)
@@ -1,13 +1,57 @@
+import base64
+import binascii
 from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+
+import orjson
+
+
+class CountMode(str, Enum):
+    exact = 'exact'
+    estimated = 'estimated'
+    none = 'none'
+
+
+@dataclass(frozen=True)
+class MessagesCursor:
+    created_at: datetime
+    oid: str
+
+    def encode(self) -> str:
+        raw = orjson.dumps([self.created_at.isoformat(), self.oid])
+        return base64.urlsafe_b64encode(raw).decode()
+
+    @classmethod
+    def decode(cls, cursor: str) -> 'MessagesCursor':
+        try:
+            created_at, oid = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return cls(created_at=datetime.fromisoformat(created_at), oid=str(oid))
+        except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError) as error:
+            raise ValueError(f'Invalid cursor: {cursor}') from error
 
 
 @dataclass
 class GetMessagesFilters:
     limit: int = 10
     offset: int = 0
+    before: MessagesCursor | None = None
+    after: MessagesCursor | None = None
+    count: CountMode = CountMode.estimated
+
+    @property
+    def is_keyset(self) -> bool:
+        return self.before is not None or self.after is not None
 
 
 @dataclass
 class GetAllChatsFilters:
     limit: int = 10
     offset: int = 0
+    count: CountMode = CountMode.estimated
+
+
+@dataclass
+class GetChatListenersFilters:
+    limit: int = 100
+    offset: int = 0
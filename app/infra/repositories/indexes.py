@@ -0,0 +1,51 @@
+from dataclasses import (
+    dataclass,
+    field,
+)
+
+from pymongo import ASCENDING
+
+
+DEFAULT_INDEX_NAME = '_id_'
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    keys: tuple[tuple[str, int], ...]
+    unique: bool = False
+    expire_after_seconds: int | None = None
+
+    @classmethod
+    def on(cls, *fields: str, unique: bool = False, expire_after_seconds: int | None = None) -> 'IndexSpec':
+        return cls(
+            keys=tuple((field_name, ASCENDING) for field_name in fields),
+            unique=unique,
+            expire_after_seconds=expire_after_seconds,
+        )
+
+    @property
+    def options(self) -> dict:
+        options = {'unique': self.unique, 'name': self.name}
+
+        if self.expire_after_seconds is not None:
+            options['expireAfterSeconds'] = self.expire_after_seconds
+
+        return options
+
+    @property
+    def name(self) -> str:
+        return '_'.join(f'{field_name}_{direction}' for field_name, direction in self.keys)
+
+
+@dataclass
+class IndexReport:
+    collection_name: str
+    missing: list[str] = field(default_factory=list, kw_only=True)
+    created: list[str] = field(default_factory=list, kw_only=True)
+    extra: list[str] = field(default_factory=list, kw_only=True)
+    conflicting: list[str] = field(default_factory=list, kw_only=True)
+    failed: dict[str, str] = field(default_factory=dict, kw_only=True)
+
+    @property
+    def is_consistent(self) -> bool:
+        return not (set(self.missing) - set(self.created)) and not self.conflicting and not self.failed
@@ -3,14 +3,27 @@ from abc import (
     abstractmethod,
 )
 from dataclasses import dataclass
-from typing import Iterable
+from typing import (
+    AsyncIterator,
+    Iterable,
+)
 
 from domain.entities.messages import (
     Chat,
     ChatListener,
     Message,
 )
-from infra.repositories.filters.messages import GetMessagesFilters
+from infra.repositories.filters.messages import (
+    GetAllChatsFilters,
+    GetChatListenersFilters,
+    GetMessagesFilters,
+)
+from infra.repositories.messages.read_models import (
+    ChatReadModel,
+    convert_chat_entity_to_read_model,
+    convert_message_entity_to_read_model,
+    MessageReadModel,
+)
 
 
 @dataclass
@@ -25,22 +38,27 @@ class BaseChatsRepository(ABC):
 
     @abstractmethod
     async def add_chat(self, chat: Chat) -> None:
-        ...
+        """Raises ChatWithThatTitleAlreadyExistException if a chat with that title already exists."""
 
     @abstractmethod
-    async def get_all_chats(self, limit: int, offset: int) -> Iterable[Chat]:
+    async def get_all_chats(self, filters: GetAllChatsFilters) -> tuple[Iterable[Chat], int | None]:
         ...
 
+    async def get_all_chats_read_models(self, filters: GetAllChatsFilters) -> tuple[list[ChatReadModel], int | None]:
+        chats, count = await self.get_all_chats(filters=filters)
+
+        return [convert_chat_entity_to_read_model(chat) for chat in chats], count
+
     @abstractmethod
     async def delete_chat_by_oid(self, chat_oid: str) -> None:
         ...
 
     @abstractmethod
-    async def add_telegram_listener(self, chat_oid: str, telegram_chat_id: str) -> None:
-        ...
+    async def add_telegram_listener(self, chat_oid: str, telegram_chat_id: str) -> ChatListener:
+        """Raises ListenerAlreadyExistException if the listener already listens to the chat."""
 
     @abstractmethod
-    async def get_all_chat_listeners(self, chat_oid: str) -> Iterable[ChatListener]:
+    async def get_all_chat_listeners(self, chat_oid: str, filters: GetChatListenersFilters) -> Iterable[ChatListener]:
         ...
 
 
@@ -51,5 +69,30 @@ class BaseMessagesRepository(ABC):
         ...
 
     @abstractmethod
-    async def get_messages(self, chat_oid: str, filters: GetMessagesFilters) -> tuple[Iterable[Message], int]:
+    async def add_messages(self, messages: Iterable[Message]) -> None:
+        ...
+
+    @abstractmethod
+    async def get_messages(
+        self,
+        chat_oid: str,
+        filters: GetMessagesFilters,
+    ) -> tuple[Iterable[Message], int | None]:
+        ...
+
+    async def get_messages_read_models(
+        self,
+        chat_oid: str,
+        filters: GetMessagesFilters,
+    ) -> tuple[list[MessageReadModel], int | None]:
+        messages, count = await self.get_messages(chat_oid=chat_oid, filters=filters)
+
+        return [convert_message_entity_to_read_model(message) for message in messages], count
+
+    @abstractmethod
+    def iter_messages(self, chat_oid: str, batch_size: int = 1000) -> AsyncIterator[Message]:
+        ...
+
+    async def delete_chat_counter(self, chat_oid: str) -> None:
+        # Only repositories that keep a message counter per chat have something to drop.
         ...
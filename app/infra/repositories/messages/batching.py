@@ -0,0 +1,60 @@
+from dataclasses import (
+    dataclass,
+    field,
+)
+from typing import (
+    AsyncIterator,
+    Iterable,
+)
+
+from domain.entities.messages import Message
+from infra.batching import Batcher
+from infra.repositories.filters.messages import GetMessagesFilters
+from infra.repositories.messages.base import BaseMessagesRepository
+from infra.repositories.messages.read_models import MessageReadModel
+
+
+@dataclass
+class BatchingMessagesRepository(BaseMessagesRepository):
+    messages_repository: BaseMessagesRepository
+    max_batch_size: int = 100
+    max_latency: float = 0.005
+
+    _batcher: Batcher[Message] = field(init=False)
+
+    def __post_init__(self):
+        self._batcher = Batcher(
+            flush=self.messages_repository.add_messages,
+            max_batch_size=self.max_batch_size,
+            max_latency=self.max_latency,
+        )
+
+    async def add_message(self, message: Message) -> None:
+        await self._batcher.submit(message)
+
+    async def add_messages(self, messages: Iterable[Message]) -> None:
+        await self.messages_repository.add_messages(messages)
+
+    async def get_messages(
+        self,
+        chat_oid: str,
+        filters: GetMessagesFilters,
+    ) -> tuple[Iterable[Message], int | None]:
+        return await self.messages_repository.get_messages(chat_oid=chat_oid, filters=filters)
+
+    async def get_messages_read_models(
+        self,
+        chat_oid: str,
+        filters: GetMessagesFilters,
+    ) -> tuple[list[MessageReadModel], int | None]:
+        return await self.messages_repository.get_messages_read_models(chat_oid=chat_oid, filters=filters)
+
+    async def iter_messages(self, chat_oid: str, batch_size: int = 1000) -> AsyncIterator[Message]:
+        async for message in self.messages_repository.iter_messages(chat_oid=chat_oid, batch_size=batch_size):
+            yield message
+
+    async def delete_chat_counter(self, chat_oid: str) -> None:
+        await self.messages_repository.delete_chat_counter(chat_oid=chat_oid)
+
+    async def close(self) -> None:
+        await self._batcher.close()
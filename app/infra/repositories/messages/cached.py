@@ -0,0 +1,71 @@
+from dataclasses import dataclass
+from typing import Iterable
+
+from domain.entities.messages import (
+    Chat,
+    ChatListener,
+)
+from infra.caches import LRUTTLCache
+from infra.repositories.filters.messages import (
+    GetAllChatsFilters,
+    GetChatListenersFilters,
+)
+from infra.repositories.messages.base import BaseChatsRepository
+from infra.repositories.messages.read_models import ChatReadModel
+
+
+def detach_chat(chat: Chat) -> Chat:
+    # Callers mutate the chats they load, so every read gets its own entity instead of the cached one.
+    return Chat.hydrate(
+        oid=chat.oid,
+        title=chat.title,
+        created_at=chat.created_at,
+        listeners=set(chat.listeners),
+        is_deleted=chat.is_deleted,
+    )
+
+
+@dataclass
+class CachedChatsRepository(BaseChatsRepository):
+    chats_repository: BaseChatsRepository
+    cache: LRUTTLCache[str, Chat]
+
+    async def get_chat_by_oid(self, oid: str) -> Chat | None:
+        chat = self.cache.get(oid)
+
+        if chat is None:
+            chat = await self.chats_repository.get_chat_by_oid(oid=oid)
+
+            if chat is None:
+                return None
+
+            self.cache.set(oid, detach_chat(chat))
+            return chat
+
+        return detach_chat(chat)
+
+    async def check_chat_exists_by_title(self, title: str) -> bool:
+        return await self.chats_repository.check_chat_exists_by_title(title=title)
+
+    async def add_chat(self, chat: Chat) -> None:
+        await self.chats_repository.add_chat(chat)
+
+    async def get_all_chats(self, filters: GetAllChatsFilters) -> tuple[Iterable[Chat], int | None]:
+        return await self.chats_repository.get_all_chats(filters=filters)
+
+    async def get_all_chats_read_models(self, filters: GetAllChatsFilters) -> tuple[list[ChatReadModel], int | None]:
+        return await self.chats_repository.get_all_chats_read_models(filters=filters)
+
+    async def delete_chat_by_oid(self, chat_oid: str) -> None:
+        await self.chats_repository.delete_chat_by_oid(chat_oid=chat_oid)
+        self.cache.invalidate(chat_oid)
+
+    async def add_telegram_listener(self, chat_oid: str, telegram_chat_id: str) -> ChatListener:
+        return await self.chats_repository.add_telegram_listener(chat_oid=chat_oid, telegram_chat_id=telegram_chat_id)
+
+    async def get_all_chat_listeners(self, chat_oid: str, filters: GetChatListenersFilters) -> Iterable[ChatListener]:
+        return await self.chats_repository.get_all_chat_listeners(chat_oid=chat_oid, filters=filters)
+
+    @property
+    def cache_stats(self) -> dict[str, int]:
+        return self.cache.stats
@@ -32,27 +32,32 @@ def convert_chat_entity_to_document(chat: Chat) -> dict:
 
 
 def convert_message_document_to_entity(message_document: Mapping[str, Any]) -> Message:
-    return Message(
-        text=Text(value=message_document['text']),
+    return Message.hydrate(
+        text=Text.trusted(message_document['text']),
         oid=message_document['oid'],
         created_at=message_document['created_at'],
         chat_oid=message_document['chat_oid'],
     )
 
 
-def convert_chat_listener_document_to_entity(listener_id: str) -> ChatListener:
-    return ChatListener(
-        oid=listener_id,
+def convert_chat_listener_entity_to_document(chat_oid: str, listener: ChatListener) -> dict:
+    return {
+        'chat_oid': chat_oid,
+        'listener_oid': listener.oid,
+        'created_at': listener.created_at,
+    }
+
+
+def convert_chat_listener_document_to_entity(listener_document: Mapping[str, Any]) -> ChatListener:
+    return ChatListener.hydrate(
+        oid=listener_document['listener_oid'],
+        created_at=listener_document['created_at'],
     )
 
 
 def convert_chat_document_to_entity(chat_document: Mapping[str, Any]) -> Chat:
-    return Chat(
-        title=Title(value=chat_document['title']),
+    return Chat.hydrate(
+        title=Title.trusted(chat_document['title']),
         oid=chat_document['oid'],
         created_at=chat_document['created_at'],
-        listeners={
-                convert_chat_listener_document_to_entity(listener_id=listener_id)
-                for listener_id in chat_document.get('listeners', [])
-        },
     )
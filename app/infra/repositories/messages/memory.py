@@ -2,14 +2,34 @@ from dataclasses import (
     dataclass,
     field,
 )
+from typing import (
+    AsyncIterator,
+    Iterable,
+)
 
-from domain.entities.messages import Chat
-from infra.repositories.messages.base import BaseChatsRepository
+from domain.entities.messages import (
+    Chat,
+    ChatListener,
+    Message,
+)
+from domain.exceptions.chats import ListenerAlreadyExistException
+from infra.repositories.filters.messages import (
+    CountMode,
+    GetAllChatsFilters,
+    GetChatListenersFilters,
+    GetMessagesFilters,
+)
+from infra.repositories.messages.base import (
+    BaseChatsRepository,
+    BaseMessagesRepository,
+)
+from logic.exceptions.messages import ChatWithThatTitleAlreadyExistException
 
 
 @dataclass
 class MemoryChatRepository(BaseChatsRepository):
     _saved_chats: list[Chat] = field(default_factory=list, kw_only=True)
+    _saved_listeners: dict[str, dict[str, ChatListener]] = field(default_factory=dict, init=False)
 
     async def get_chat_by_oid(self, oid: str) -> Chat | None:
         try:
@@ -30,4 +50,74 @@ class MemoryChatRepository(BaseChatsRepository):
             return False
 
     async def add_chat(self, chat: Chat) -> None:
+        if await self.check_chat_exists_by_title(chat.title.as_generic_type()):
+            raise ChatWithThatTitleAlreadyExistException(chat.title.as_generic_type())
+
         self._saved_chats.append(chat)
+
+    async def get_all_chats(self, filters: GetAllChatsFilters) -> tuple[Iterable[Chat], int | None]:
+        count = None if filters.count == CountMode.none else len(self._saved_chats)
+
+        return self._saved_chats[filters.offset:filters.offset + filters.limit], count
+
+    async def delete_chat_by_oid(self, chat_oid: str) -> None:
+        self._saved_chats = [chat for chat in self._saved_chats if chat.oid != chat_oid]
+        self._saved_listeners.pop(chat_oid, None)
+
+    async def add_telegram_listener(self, chat_oid: str, telegram_chat_id: str) -> ChatListener:
+        chat_listeners = self._saved_listeners.setdefault(chat_oid, {})
+
+        if telegram_chat_id in chat_listeners:
+            raise ListenerAlreadyExistException(listener_oid=telegram_chat_id)
+
+        listener = chat_listeners[telegram_chat_id] = ChatListener(oid=telegram_chat_id)
+
+        return listener
+
+    async def get_all_chat_listeners(self, chat_oid: str, filters: GetChatListenersFilters) -> Iterable[ChatListener]:
+        listeners = sorted(self._saved_listeners.get(chat_oid, {}).values(), key=lambda listener: listener.oid)
+
+        return listeners[filters.offset:filters.offset + filters.limit]
+
+
+@dataclass
+class MemoryMessagesRepository(BaseMessagesRepository):
+    _saved_messages: list[Message] = field(default_factory=list, kw_only=True)
+
+    async def add_message(self, message: Message) -> None:
+        self._saved_messages.append(message)
+
+    async def add_messages(self, messages: Iterable[Message]) -> None:
+        self._saved_messages.extend(messages)
+
+    async def get_messages(
+        self,
+        chat_oid: str,
+        filters: GetMessagesFilters,
+    ) -> tuple[Iterable[Message], int | None]:
+        messages = sorted(
+            (message for message in self._saved_messages if message.chat_oid == chat_oid),
+            key=lambda message: (message.created_at, message.oid),
+        )
+        count = None if filters.count == CountMode.none else len(messages)
+
+        if filters.before is not None:
+            position = (filters.before.created_at, filters.before.oid)
+            messages = [message for message in messages if (message.created_at, message.oid) < position]
+            return messages[-filters.limit:] if filters.limit else [], count
+
+        if filters.after is not None:
+            position = (filters.after.created_at, filters.after.oid)
+            messages = [message for message in messages if (message.created_at, message.oid) > position]
+            return messages[:filters.limit], count
+
+        return messages[filters.offset:filters.offset + filters.limit], count
+
+    async def iter_messages(self, chat_oid: str, batch_size: int = 1000) -> AsyncIterator[Message]:
+        messages = sorted(
+            (message for message in self._saved_messages if message.chat_oid == chat_oid),
+            key=lambda message: (message.created_at, message.oid),
+        )
+
+        for message in messages:
+            yield message
@@ -1,18 +1,37 @@
-from abc import ABC
-from dataclasses import dataclass
-from typing import Iterable
+from collections import Counter
+from dataclasses import (
+    dataclass,
+    field,
+)
+from typing import (
+    Any,
+    AsyncIterator,
+    Iterable,
+)
 
-from motor.core import AgnosticClient
+from pymongo import (
+    ASCENDING,
+    DESCENDING,
+    UpdateOne,
+)
+from pymongo.errors import (
+    BulkWriteError,
+    DuplicateKeyError,
+)
 
 from domain.entities.messages import (
     Chat,
     ChatListener,
     Message,
 )
+from domain.exceptions.chats import ListenerAlreadyExistException
 from infra.repositories.filters.messages import (
+    CountMode,
     GetAllChatsFilters,
+    GetChatListenersFilters,
     GetMessagesFilters,
 )
+from infra.repositories.indexes import IndexSpec
 from infra.repositories.messages.base import (
     BaseChatsRepository,
     BaseMessagesRepository,
@@ -21,26 +40,52 @@ from infra.repositories.messages.converters import (
     convert_chat_document_to_entity,
     convert_chat_entity_to_document,
     convert_chat_listener_document_to_entity,
+    convert_chat_listener_entity_to_document,
     convert_message_document_to_entity,
     convert_message_entity_to_document,
 )
+from infra.repositories.messages.read_models import (
+    CHAT_READ_MODEL_PROJECTION,
+    ChatReadModel,
+    MESSAGE_READ_MODEL_PROJECTION,
+    MessageReadModel,
+)
+from infra.repositories.mongo import BaseMongoDBRepository
+from infra.repositories.transactions import (
+    call_after_commit,
+    get_current_session,
+)
+from logic.exceptions.messages import ChatWithThatTitleAlreadyExistException
+
+
+DUPLICATE_KEY_ERROR_CODE = 11000
 
 
 @dataclass
-class BaseMongoDBRepository(ABC):
-    mongo_db_client: AgnosticClient
-    mongo_db_db_name: str
-    mongo_db_collection_name: str
+class MongoDBChatsRepository(BaseChatsRepository, BaseMongoDBRepository):
+    mongo_db_listeners_collection_name: str
+
+    indexes = (
+        IndexSpec.on('oid', unique=True),
+        IndexSpec.on('title', unique=True),
+    )
+    listeners_indexes = (
+        IndexSpec.on('chat_oid', 'listener_oid', unique=True),
+    )
 
     @property
-    def _collection(self):
-        return self.mongo_db_client[self.mongo_db_db_name][self.mongo_db_collection_name]
+    def _listeners_collection(self):
+        return self.mongo_db_client[self.mongo_db_db_name][self.mongo_db_listeners_collection_name]
 
+    def get_collections_indexes(self) -> list[tuple[Any, tuple[IndexSpec, ...]]]:
+        return [
+            *super().get_collections_indexes(),
+            (self._listeners_collection, self.listeners_indexes),
+        ]
 
-@dataclass
-class MongoDBChatsRepository(BaseChatsRepository, BaseMongoDBRepository):
     async def get_chat_by_oid(self, oid: str) -> Chat | None:
-        chat_document = await self._collection.find_one(filter={'oid': oid})
+        # Listeners embedded by older versions are moved out with MONGODB_MOVE_EMBEDDED_LISTENERS.
+        chat_document = await self._collection.find_one(filter={'oid': oid}, projection={'listeners': False})
 
         if not chat_document:
             return None
@@ -48,52 +93,293 @@ class MongoDBChatsRepository(BaseChatsRepository, BaseMongoDBRepository):
         return convert_chat_document_to_entity(chat_document)
 
     async def check_chat_exists_by_title(self, title: str) -> bool:
-        return bool(await self._collection.find_one(filter={'title': title}))
+        return bool(await self._collection.find_one(filter={'title': title}, projection={'_id': True}))
 
     async def add_chat(self, chat: Chat) -> None:
-        await self._collection.insert_one(convert_chat_entity_to_document(chat))
+        # The title check in the handler can race, the unique title index is what rejects the second chat.
+        try:
+            await self._collection.insert_one(convert_chat_entity_to_document(chat), session=get_current_session())
+        except DuplicateKeyError:
+            raise ChatWithThatTitleAlreadyExistException(chat.title.as_generic_type())
 
-    async def get_all_chats(self, filters: GetAllChatsFilters) -> Iterable[Chat]:
-        cursor = self._collection.find().skip(filters.offset).limit(filters.limit)
+    async def get_all_chats(self, filters: GetAllChatsFilters) -> tuple[Iterable[Chat], int | None]:
+        chat_documents = await self._find_chats_documents(filters=filters)
+        chats = [convert_chat_document_to_entity(chat_document=chat_document) for chat_document in chat_documents]
 
-        chats = [
-            convert_chat_document_to_entity(chat_document=chat_document)
-            async for chat_document in cursor
-        ]
-        count = await self._collection.count_documents({})
+        return chats, await self._count_chats(count_mode=filters.count)
+
+    async def get_all_chats_read_models(self, filters: GetAllChatsFilters) -> tuple[list[ChatReadModel], int | None]:
+        chat_documents = await self._find_chats_documents(filters=filters, projection=CHAT_READ_MODEL_PROJECTION)
+
+        return chat_documents, await self._count_chats(count_mode=filters.count)
+
+    async def _find_chats_documents(self, filters: GetAllChatsFilters, projection: dict | None = None) -> list[dict]:
+        cursor = self._collection.find(projection=projection).skip(filters.offset).limit(filters.limit)
+
+        return [chat_document async for chat_document in cursor]
 
-        return chats, count
+    async def _count_chats(self, count_mode: CountMode) -> int | None:
+        if count_mode == CountMode.none:
+            return None
+
+        if count_mode == CountMode.estimated:
+            return await self._collection.estimated_document_count()
+
+        return await self._collection.count_documents({})
 
     async def delete_chat_by_oid(self, chat_oid: str) -> None:
-        await self._collection.delete_one({'oid': chat_oid})
+        session = get_current_session()
+        await self._collection.delete_one({'oid': chat_oid}, session=session)
+        await self._listeners_collection.delete_many({'chat_oid': chat_oid}, session=session)
+
+    async def add_telegram_listener(self, chat_oid: str, telegram_chat_id: str) -> ChatListener:
+        listener = ChatListener(oid=telegram_chat_id)
+
+        # The unique (chat_oid, listener_oid) index rejects duplicates atomically, even for concurrent requests.
+        try:
+            await self._listeners_collection.insert_one(
+                convert_chat_listener_entity_to_document(chat_oid=chat_oid, listener=listener),
+                session=get_current_session(),
+            )
+        except DuplicateKeyError:
+            raise ListenerAlreadyExistException(listener_oid=telegram_chat_id)
 
-    async def add_telegram_listener(self, chat_oid: str, telegram_chat_id: str) -> None:
-        await self._collection.update_one(
-            {'oid': chat_oid},
-            {'$push': {'listeners': telegram_chat_id}},
+        return listener
+
+    async def move_embedded_listeners(self) -> int:
+        # Chats written before listeners got their own collection keep them in a listeners array. Running this again,
+        # or on several nodes at once, is safe: copies are upserts and only the copied ids are pulled from the array.
+        moved_count = 0
+        cursor = self._collection.find(
+            {'listeners': {'$exists': True}},
+            projection={'oid': True, 'created_at': True, 'listeners': True},
         )
 
-    async def get_all_chat_listeners(self, chat_oid: str) -> Iterable[ChatListener]:
-        chat = await self.get_chat_by_oid(oid=chat_oid)
+        async for chat_document in cursor:
+            listener_oids = list(chat_document['listeners'])
+
+            if listener_oids:
+                try:
+                    await self._listeners_collection.bulk_write(
+                        [
+                            UpdateOne(
+                                {'chat_oid': chat_document['oid'], 'listener_oid': listener_oid},
+                                {'$setOnInsert': {'created_at': chat_document['created_at']}},
+                                upsert=True,
+                            )
+                            for listener_oid in set(listener_oids)
+                        ],
+                        ordered=False,
+                    )
+                except BulkWriteError as error:
+                    # Concurrent upserts of the same listener collide on the unique index, it is copied either way.
+                    error_codes = {write_error['code'] for write_error in error.details['writeErrors']}
+
+                    if error_codes != {DUPLICATE_KEY_ERROR_CODE}:
+                        raise
+
+                moved_count += len(listener_oids)
 
-        return [convert_chat_listener_document_to_entity(listener_id=listener.oid) for listener in chat.listeners]
+            await self._collection.update_one(
+                {'_id': chat_document['_id']},
+                {'$pullAll': {'listeners': listener_oids}},
+            )
+
+        await self._collection.update_many({'listeners': {'$size': 0}}, {'$unset': {'listeners': ''}})
+
+        return moved_count
+
+    async def get_all_chat_listeners(self, chat_oid: str, filters: GetChatListenersFilters) -> Iterable[ChatListener]:
+        cursor = self._listeners_collection.find({'chat_oid': chat_oid}, projection={'_id': False}).sort(
+            'listener_oid',
+            ASCENDING,
+        )
+
+        return [
+            convert_chat_listener_document_to_entity(listener_document=listener_document)
+            async for listener_document in cursor.skip(filters.offset).limit(filters.limit)
+        ]
 
 
 @dataclass
 class MongoDBMessagesRepository(BaseMessagesRepository, BaseMongoDBRepository):
+    mongo_db_counters_collection_name: str
+
+    _seeded_chat_oids: set[str] = field(default_factory=set, init=False)
+
+    indexes = (
+        IndexSpec.on('oid', unique=True),
+        IndexSpec.on('chat_oid', 'created_at', 'oid'),
+    )
+    counters_indexes = (
+        IndexSpec.on('chat_oid', unique=True),
+    )
+
+    @property
+    def _counters_collection(self):
+        return self.mongo_db_client[self.mongo_db_db_name][self.mongo_db_counters_collection_name]
+
     async def add_message(self, message: Message) -> None:
+        await self._seed_counters(chat_oids={message.chat_oid})
         await self._collection.insert_one(
             document=convert_message_entity_to_document(message),
+            session=get_current_session(),
         )
+        await call_after_commit(lambda: self._increment_counters(Counter({message.chat_oid: 1})))
+
+    async def add_messages(self, messages: Iterable[Message]) -> None:
+        messages = list(messages)
+
+        if not messages:
+            return
+
+        counts = Counter(message.chat_oid for message in messages)
+        await self._seed_counters(chat_oids=counts.keys())
+
+        await self._collection.insert_many(
+            [convert_message_entity_to_document(message) for message in messages],
+            session=get_current_session(),
+        )
+        await call_after_commit(lambda: self._increment_counters(counts))
+
+    async def _increment_counters(self, counts: Counter) -> None:
+        # Counters are updated outside of transactions, or every concurrent write to a chat would conflict on them.
+        await self._counters_collection.bulk_write([
+            UpdateOne({'chat_oid': chat_oid}, {'$inc': {'count': count}})
+            for chat_oid, count in counts.items()
+        ])
+
+    async def _seed_counters(self, chat_oids: Iterable[str]) -> None:
+        # A missing counter starts from the exact count taken before this insert. Every message inserted after it
+        # exists is added by $inc only, so chats that predate the counters are neither under- nor overcounted.
+        # A counter seeded by this process is only dropped together with its chat, so it is not looked up again.
+        chat_oids = set(chat_oids) - self._seeded_chat_oids
 
-    async def get_messages(self, chat_oid: str, filters: GetMessagesFilters) -> tuple[Iterable[Message], int]:
-        find = {'chat_oid': chat_oid}
-        cursor = self._collection.find(find).skip(filters.offset).limit(filters.limit)
+        if not chat_oids:
+            return
 
+        cursor = self._counters_collection.find({'chat_oid': {'$in': list(chat_oids)}}, projection={'chat_oid': True})
+        seeded_chat_oids = {counter['chat_oid'] async for counter in cursor}
+
+        for chat_oid in chat_oids - seeded_chat_oids:
+            count = await self._collection.count_documents(filter={'chat_oid': chat_oid})
+
+            try:
+                await self._counters_collection.update_one(
+                    {'chat_oid': chat_oid},
+                    {'$setOnInsert': {'count': count}},
+                    upsert=True,
+                )
+            except DuplicateKeyError:
+                # A concurrent writer seeded it first, its count is just as exact.
+                pass
+
+        self._seeded_chat_oids.update(chat_oids)
+
+    async def delete_chat_counter(self, chat_oid: str) -> None:
+        self._seeded_chat_oids.discard(chat_oid)
+        await self._counters_collection.delete_one({'chat_oid': chat_oid})
+
+    def get_collections_indexes(self) -> list[tuple[Any, tuple[IndexSpec, ...]]]:
+        return [
+            *super().get_collections_indexes(),
+            (self._counters_collection, self.counters_indexes),
+        ]
+
+    async def get_messages(
+        self,
+        chat_oid: str,
+        filters: GetMessagesFilters,
+    ) -> tuple[Iterable[Message], int | None]:
+        message_documents = await self._find_messages_documents(chat_oid=chat_oid, filters=filters)
         messages = [
             convert_message_document_to_entity(message_document=message_document)
-            async for message_document in cursor
+            for message_document in message_documents
         ]
-        count = await self._collection.count_documents(filter=find)
 
-        return messages, count
+        return messages, await self._count_messages(chat_oid=chat_oid, count_mode=filters.count)
+
+    async def get_messages_read_models(
+        self,
+        chat_oid: str,
+        filters: GetMessagesFilters,
+    ) -> tuple[list[MessageReadModel], int | None]:
+        message_documents = await self._find_messages_documents(
+            chat_oid=chat_oid,
+            filters=filters,
+            projection=MESSAGE_READ_MODEL_PROJECTION,
+        )
+
+        return message_documents, await self._count_messages(chat_oid=chat_oid, count_mode=filters.count)
+
+    async def _find_messages_documents(
+        self,
+        chat_oid: str,
+        filters: GetMessagesFilters,
+        projection: dict | None = None,
+    ) -> list[dict]:
+        if filters.is_keyset:
+            return await self._find_messages_documents_by_cursor(
+                chat_oid=chat_oid,
+                filters=filters,
+                projection=projection,
+            )
+
+        # Pages hand out before/after cursors, so they follow the (created_at, oid) order of the index.
+        cursor = self._collection.find({'chat_oid': chat_oid}, projection=projection).sort(
+            [('created_at', ASCENDING), ('oid', ASCENDING)],
+        )
+
+        return [message_document async for message_document in cursor.skip(filters.offset).limit(filters.limit)]
+
+    async def iter_messages(self, chat_oid: str, batch_size: int = 1000) -> AsyncIterator[Message]:
+        # Walks the (chat_oid, created_at, oid) index, only batch_size documents are held in memory at a time.
+        cursor = self._collection.find(
+            {'chat_oid': chat_oid},
+            projection={'_id': False},
+        ).sort([('created_at', ASCENDING), ('oid', ASCENDING)]).batch_size(batch_size)
+
+        async for message_document in cursor:
+            yield convert_message_document_to_entity(message_document=message_document)
+
+    async def _count_messages(self, chat_oid: str, count_mode: CountMode) -> int | None:
+        if count_mode == CountMode.none:
+            return None
+
+        if count_mode == CountMode.estimated:
+            counter = await self._counters_collection.find_one({'chat_oid': chat_oid})
+
+            if counter:
+                return counter['count']
+
+        return await self._collection.count_documents(filter={'chat_oid': chat_oid})
+
+    async def _find_messages_documents_by_cursor(
+        self,
+        chat_oid: str,
+        filters: GetMessagesFilters,
+        projection: dict | None = None,
+    ) -> list[dict]:
+        # Seek on the (chat_oid, created_at, oid) index instead of skipping, so every page costs the same.
+        if filters.before is not None:
+            operator, direction, position = '$lt', DESCENDING, filters.before
+        else:
+            operator, direction, position = '$gt', ASCENDING, filters.after
+
+        find = {
+            'chat_oid': chat_oid,
+            '$or': [
+                {'created_at': {operator: position.created_at}},
+                {'created_at': position.created_at, 'oid': {operator: position.oid}},
+            ],
+        }
+        cursor = self._collection.find(find, projection=projection).sort(
+            [('created_at', direction), ('oid', direction)],
+        ).limit(filters.limit)
+
+        message_documents = [message_document async for message_document in cursor]
+
+        if direction == DESCENDING:
+            message_documents.reverse()
+
+        return message_documents
@@ -0,0 +1,37 @@
+from datetime import datetime
+from typing import TypedDict
+
+from domain.entities.messages import (
+    Chat,
+    Message,
+)
+
+
+class ChatReadModel(TypedDict):
+    oid: str
+    title: str
+    created_at: datetime
+
+
+class MessageReadModel(TypedDict):
+    oid: str
+    text: str
+    created_at: datetime
+    chat_oid: str
+
+
+CHAT_READ_MODEL_PROJECTION = {'_id': False, 'oid': True, 'title': True, 'created_at': True}
+MESSAGE_READ_MODEL_PROJECTION = {'_id': False, 'oid': True, 'text': True, 'created_at': True, 'chat_oid': True}
+
+
+def convert_chat_entity_to_read_model(chat: Chat) -> ChatReadModel:
+    return ChatReadModel(oid=chat.oid, title=chat.title.as_generic_type(), created_at=chat.created_at)
+
+
+def convert_message_entity_to_read_model(message: Message) -> MessageReadModel:
+    return MessageReadModel(
+        oid=message.oid,
+        text=message.text.as_generic_type(),
+        created_at=message.created_at,
+        chat_oid=message.chat_oid,
+    )
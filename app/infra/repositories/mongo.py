@@ -0,0 +1,81 @@
+from abc import ABC
+from dataclasses import dataclass
+from typing import (
+    Any,
+    ClassVar,
+    Iterable,
+)
+
+from motor.core import AgnosticClient
+from pymongo.errors import OperationFailure
+
+from infra.repositories.indexes import (
+    DEFAULT_INDEX_NAME,
+    IndexReport,
+    IndexSpec,
+)
+
+
+@dataclass
+class BaseMongoDBRepository(ABC):
+    mongo_db_client: AgnosticClient
+    mongo_db_db_name: str
+    mongo_db_collection_name: str
+
+    indexes: ClassVar[tuple[IndexSpec, ...]] = ()
+
+    @property
+    def _collection(self):
+        return self.mongo_db_client[self.mongo_db_db_name][self.mongo_db_collection_name]
+
+    def get_collections_indexes(self) -> list[tuple[Any, tuple[IndexSpec, ...]]]:
+        return [(self._collection, self.indexes)]
+
+
+@dataclass
+class MongoDBIndexManager:
+    repositories: Iterable[BaseMongoDBRepository]
+
+    async def ensure_indexes(self) -> list[IndexReport]:
+        reports = []
+
+        for repository in self.repositories:
+            for collection, index_specs in repository.get_collections_indexes():
+                reports.append(await self._ensure_collection_indexes(collection, index_specs))
+
+        return reports
+
+    async def _ensure_collection_indexes(self, collection, index_specs: Iterable[IndexSpec]) -> IndexReport:
+        report = IndexReport(collection_name=collection.name)
+        existing_indexes = {
+            tuple(tuple(key) for key in index_information['key']): (name, index_information.get('unique', False))
+            for name, index_information in (await collection.index_information()).items()
+        }
+        declared_keys = set()
+
+        for index_spec in index_specs:
+            declared_keys.add(index_spec.keys)
+
+            if index_spec.keys in existing_indexes:
+                name, unique = existing_indexes[index_spec.keys]
+
+                if unique != index_spec.unique:
+                    report.conflicting.append(name)
+
+                continue
+
+            report.missing.append(index_spec.name)
+
+            try:
+                await collection.create_index(list(index_spec.keys), **index_spec.options)
+            except OperationFailure as error:
+                report.failed[index_spec.name] = str(error)
+            else:
+                report.created.append(index_spec.name)
+
+        report.extra = [
+            name for keys, (name, _) in existing_indexes.items()
+            if keys not in declared_keys and name != DEFAULT_INDEX_NAME
+        ]
+
+        return report
@@ -0,0 +1,46 @@
+from abc import (
+    ABC,
+    abstractmethod,
+)
+from dataclasses import (
+    dataclass,
+    field,
+)
+from datetime import (
+    datetime,
+    timezone,
+)
+from typing import Iterable
+from uuid import uuid4
+
+
+@dataclass
+class OutboxMessage:
+    topic: str
+    key: bytes
+    value: bytes
+    headers: tuple[tuple[str, bytes], ...] = ()
+    oid: str = field(default_factory=lambda: str(uuid4()), kw_only=True)
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc), kw_only=True)
+    available_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc), kw_only=True)
+    attempts: int = field(default=0, kw_only=True)
+    sent_at: datetime | None = field(default=None, kw_only=True)
+
+
+@dataclass
+class BaseOutboxRepository(ABC):
+    @abstractmethod
+    async def add_messages(self, messages: Iterable[OutboxMessage]) -> None:
+        ...
+
+    @abstractmethod
+    async def claim_pending_messages(self, limit: int, claimed_until: datetime) -> list[OutboxMessage]:
+        ...
+
+    @abstractmethod
+    async def mark_sent(self, oids: Iterable[str]) -> None:
+        ...
+
+    @abstractmethod
+    async def mark_failed(self, oids: Iterable[str], available_at: datetime) -> None:
+        ...
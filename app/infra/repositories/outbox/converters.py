@@ -0,0 +1,35 @@
+from typing import (
+    Any,
+    Mapping,
+)
+
+from infra.repositories.outbox.base import OutboxMessage
+
+
+def convert_outbox_message_to_document(message: OutboxMessage) -> dict:
+    return {
+        'oid': message.oid,
+        'topic': message.topic,
+        'key': message.key,
+        'value': message.value,
+        'headers': [[name, value] for name, value in message.headers],
+        'created_at': message.created_at,
+        'available_at': message.available_at,
+        'attempts': message.attempts,
+        'sent_at': message.sent_at,
+    }
+
+
+def convert_outbox_document_to_message(outbox_document: Mapping[str, Any]) -> OutboxMessage:
+    return OutboxMessage(
+        oid=outbox_document['oid'],
+        topic=outbox_document['topic'],
+        key=bytes(outbox_document['key']),
+        value=bytes(outbox_document['value']),
+        # Messages stored before headers were introduced have none.
+        headers=tuple((name, bytes(value)) for name, value in outbox_document.get('headers', ())),
+        created_at=outbox_document['created_at'],
+        available_at=outbox_document['available_at'],
+        attempts=outbox_document['attempts'],
+        sent_at=outbox_document['sent_at'],
+    )
@@ -0,0 +1,49 @@
+from dataclasses import (
+    dataclass,
+    field,
+)
+from datetime import (
+    datetime,
+    timezone,
+)
+from typing import Iterable
+
+from infra.repositories.outbox.base import (
+    BaseOutboxRepository,
+    OutboxMessage,
+)
+
+
+@dataclass
+class MemoryOutboxRepository(BaseOutboxRepository):
+    _saved_messages: dict[str, OutboxMessage] = field(default_factory=dict, kw_only=True)
+
+    async def add_messages(self, messages: Iterable[OutboxMessage]) -> None:
+        for message in messages:
+            self._saved_messages[message.oid] = message
+
+    async def claim_pending_messages(self, limit: int, claimed_until: datetime) -> list[OutboxMessage]:
+        now = datetime.now(timezone.utc)
+        pending_messages = sorted(
+            (
+                message for message in self._saved_messages.values()
+                if message.sent_at is None and message.available_at <= now
+            ),
+            key=lambda message: message.created_at,
+        )[:limit]
+
+        for message in pending_messages:
+            message.available_at = claimed_until
+
+        return pending_messages
+
+    async def mark_sent(self, oids: Iterable[str]) -> None:
+        now = datetime.now(timezone.utc)
+
+        for oid in oids:
+            self._saved_messages[oid].sent_at = now
+
+    async def mark_failed(self, oids: Iterable[str], available_at: datetime) -> None:
+        for oid in oids:
+            self._saved_messages[oid].attempts += 1
+            self._saved_messages[oid].available_at = available_at
@@ -0,0 +1,81 @@
+from dataclasses import dataclass
+from datetime import (
+    datetime,
+    timezone,
+)
+from typing import (
+    Any,
+    Iterable,
+)
+from uuid import uuid4
+
+from pymongo import ASCENDING
+
+from infra.repositories.indexes import IndexSpec
+from infra.repositories.mongo import BaseMongoDBRepository
+from infra.repositories.outbox.base import (
+    BaseOutboxRepository,
+    OutboxMessage,
+)
+from infra.repositories.outbox.converters import (
+    convert_outbox_document_to_message,
+    convert_outbox_message_to_document,
+)
+from infra.repositories.transactions import get_current_session
+
+
+@dataclass
+class MongoDBOutboxRepository(BaseOutboxRepository, BaseMongoDBRepository):
+    retention_seconds: int = 24 * 60 * 60
+
+    indexes = (
+        IndexSpec.on('oid', unique=True),
+        IndexSpec.on('sent_at', 'available_at', 'created_at'),
+    )
+
+    def get_collections_indexes(self) -> list[tuple[Any, tuple[IndexSpec, ...]]]:
+        # Sent messages are only kept for retention_seconds, pending ones have no sent_at and never expire.
+        retention_index = IndexSpec.on('sent_at', expire_after_seconds=self.retention_seconds)
+
+        return [(self._collection, (*self.indexes, retention_index))]
+
+    async def add_messages(self, messages: Iterable[OutboxMessage]) -> None:
+        documents = [convert_outbox_message_to_document(message) for message in messages]
+        session = get_current_session()
+
+        if len(documents) == 1:
+            await self._collection.insert_one(documents[0], session=session)
+        elif documents:
+            await self._collection.insert_many(documents, session=session)
+
+    async def claim_pending_messages(self, limit: int, claimed_until: datetime) -> list[OutboxMessage]:
+        # Claiming pushes available_at forward, so relays on other nodes skip these messages until the claim expires.
+        # Times are UTC, the TTL index reads stored datetimes as UTC whatever the host's timezone is.
+        now = datetime.now(timezone.utc)
+        pending_filter = {'sent_at': None, 'available_at': {'$lte': now}}
+        cursor = self._collection.find(pending_filter, projection={'oid': True}).sort('created_at', ASCENDING)
+        oids = [document['oid'] async for document in cursor.limit(limit)]
+
+        if not oids:
+            return []
+
+        claim_id = str(uuid4())
+        await self._collection.update_many(
+            {**pending_filter, 'oid': {'$in': oids}},
+            {'$set': {'available_at': claimed_until, 'claim_id': claim_id}},
+        )
+        cursor = self._collection.find({'claim_id': claim_id}).sort('created_at', ASCENDING)
+
+        return [convert_outbox_document_to_message(document) async for document in cursor]
+
+    async def mark_sent(self, oids: Iterable[str]) -> None:
+        await self._collection.update_many(
+            {'oid': {'$in': list(oids)}},
+            {'$set': {'sent_at': datetime.now(timezone.utc)}},
+        )
+
+    async def mark_failed(self, oids: Iterable[str], available_at: datetime) -> None:
+        await self._collection.update_many(
+            {'oid': {'$in': list(oids)}},
+            {'$set': {'available_at': available_at}, '$inc': {'attempts': 1}},
+        )
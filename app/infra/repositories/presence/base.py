@@ -0,0 +1,31 @@
+from abc import (
+    ABC,
+    abstractmethod,
+)
+from dataclasses import dataclass
+from typing import Iterable
+
+
+@dataclass
+class BasePresenceRepository(ABC):
+    """Tracks which nodes hold websocket connections for which chats, for operators: routing reads local ones."""
+
+    @abstractmethod
+    async def add_presence(self, node_id: str, chat_oid: str) -> None:
+        ...
+
+    @abstractmethod
+    async def remove_presence(self, node_id: str, chat_oid: str) -> None:
+        ...
+
+    @abstractmethod
+    async def refresh_presence(self, node_id: str, chat_oids: Iterable[str]) -> None:
+        """Keeps the presence of a live node from expiring."""
+
+    @abstractmethod
+    async def clear_presence(self, node_id: str) -> None:
+        ...
+
+    @abstractmethod
+    async def get_chat_nodes(self, chat_oid: str) -> set[str]:
+        ...
@@ -0,0 +1,33 @@
+from collections import defaultdict
+from dataclasses import (
+    dataclass,
+    field,
+)
+from typing import Iterable
+
+from infra.repositories.presence.base import BasePresenceRepository
+
+
+@dataclass
+class MemoryPresenceRepository(BasePresenceRepository):
+    _chat_nodes: dict[str, set[str]] = field(default_factory=lambda: defaultdict(set), init=False)
+
+    async def add_presence(self, node_id: str, chat_oid: str) -> None:
+        self._chat_nodes[chat_oid].add(node_id)
+
+    async def remove_presence(self, node_id: str, chat_oid: str) -> None:
+        self._chat_nodes[chat_oid].discard(node_id)
+
+        if not self._chat_nodes[chat_oid]:
+            del self._chat_nodes[chat_oid]
+
+    async def refresh_presence(self, node_id: str, chat_oids: Iterable[str]) -> None:
+        for chat_oid in chat_oids:
+            self._chat_nodes[chat_oid].add(node_id)
+
+    async def clear_presence(self, node_id: str) -> None:
+        for chat_oid in list(self._chat_nodes):
+            await self.remove_presence(node_id=node_id, chat_oid=chat_oid)
+
+    async def get_chat_nodes(self, chat_oid: str) -> set[str]:
+        return set(self._chat_nodes.get(chat_oid, ()))
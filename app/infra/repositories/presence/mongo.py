@@ -0,0 +1,60 @@
+from dataclasses import dataclass
+from datetime import (
+    datetime,
+    timezone,
+)
+from typing import (
+    Any,
+    Iterable,
+)
+
+from pymongo import UpdateOne
+
+from infra.repositories.indexes import IndexSpec
+from infra.repositories.mongo import BaseMongoDBRepository
+from infra.repositories.presence.base import BasePresenceRepository
+
+
+@dataclass
+class MongoDBPresenceRepository(BasePresenceRepository, BaseMongoDBRepository):
+    ttl_seconds: int = 60
+
+    indexes = (
+        IndexSpec.on('node_id', 'chat_oid', unique=True),
+        IndexSpec.on('chat_oid'),
+    )
+
+    def get_collections_indexes(self) -> list[tuple[Any, tuple[IndexSpec, ...]]]:
+        # Presence of a node that died without cleaning up expires once it stops refreshing it.
+        expiry_index = IndexSpec.on('refreshed_at', expire_after_seconds=self.ttl_seconds)
+
+        return [(self._collection, (*self.indexes, expiry_index))]
+
+    async def add_presence(self, node_id: str, chat_oid: str) -> None:
+        await self._collection.update_one(
+            {'node_id': node_id, 'chat_oid': chat_oid},
+            {'$set': {'refreshed_at': datetime.now(timezone.utc)}},
+            upsert=True,
+        )
+
+    async def remove_presence(self, node_id: str, chat_oid: str) -> None:
+        await self._collection.delete_one({'node_id': node_id, 'chat_oid': chat_oid})
+
+    async def refresh_presence(self, node_id: str, chat_oids: Iterable[str]) -> None:
+        # The TTL index reads refreshed_at as UTC, a local time would expire rows early or late.
+        now = datetime.now(timezone.utc)
+        operations = [
+            UpdateOne({'node_id': node_id, 'chat_oid': chat_oid}, {'$set': {'refreshed_at': now}}, upsert=True)
+            for chat_oid in chat_oids
+        ]
+
+        if operations:
+            await self._collection.bulk_write(operations, ordered=False)
+
+    async def clear_presence(self, node_id: str) -> None:
+        await self._collection.delete_many({'node_id': node_id})
+
+    async def get_chat_nodes(self, chat_oid: str) -> set[str]:
+        cursor = self._collection.find({'chat_oid': chat_oid}, projection={'node_id': True, '_id': False})
+
+        return {document['node_id'] async for document in cursor}
@@ -0,0 +1,107 @@
+from abc import (
+    ABC,
+    abstractmethod,
+)
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import (
+    dataclass,
+    field,
+)
+from inspect import isawaitable
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+)
+
+from motor.core import AgnosticClient
+
+
+@dataclass(eq=False)
+class Transaction:
+    session: Any = None
+    after_commit: list[Callable[[], Awaitable[None] | None]] = field(default_factory=list)
+    is_active: bool = True
+
+
+current_transaction: ContextVar[Transaction | None] = ContextVar('current_transaction', default=None)
+
+
+def get_active_transaction() -> Transaction | None:
+    # Tasks spawned during a transaction inherit it, but must not use it once it is over.
+    transaction = current_transaction.get()
+
+    return transaction if transaction is not None and transaction.is_active else None
+
+
+def get_current_session() -> Any:
+    transaction = get_active_transaction()
+
+    return transaction.session if transaction is not None else None
+
+
+async def call_after_commit(callback: Callable[[], Awaitable[None] | None]) -> None:
+    transaction = get_active_transaction()
+
+    if transaction is None:
+        await run_callback(callback)
+    else:
+        transaction.after_commit.append(callback)
+
+
+async def run_callback(callback: Callable[[], Awaitable[None] | None]) -> None:
+    result = callback()
+
+    if isawaitable(result):
+        await result
+
+
+@dataclass
+class BaseTransactionManager(ABC):
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        # Nested transactions join the outer one.
+        if get_active_transaction() is not None:
+            yield
+            return
+
+        transaction = Transaction()
+        token = current_transaction.set(transaction)
+
+        try:
+            async with self._begin(transaction):
+                yield
+        finally:
+            transaction.is_active = False
+            current_transaction.reset(token)
+
+        for callback in transaction.after_commit:
+            await run_callback(callback)
+
+    @abstractmethod
+    def _begin(self, transaction: Transaction):
+        ...
+
+
+@dataclass
+class NullTransactionManager(BaseTransactionManager):
+    """Runs every write on its own, after-commit callbacks still wait for the command to succeed."""
+
+    @asynccontextmanager
+    async def _begin(self, transaction: Transaction) -> AsyncIterator[None]:
+        yield
+
+
+@dataclass
+class MongoDBTransactionManager(BaseTransactionManager):
+    """Runs all Mongo writes of a command in one transaction, it needs a replica set."""
+    mongo_db_client: AgnosticClient
+
+    @asynccontextmanager
+    async def _begin(self, transaction: Transaction) -> AsyncIterator[None]:
+        async with await self.mongo_db_client.start_session() as session:
+            async with session.start_transaction():
+                transaction.session = session
+                yield
@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+
+from domain.exceptions.base import ApplicationException
+
+
+@dataclass(eq=False)
+class ConnectionLimitExceededException(ApplicationException):
+    key: str
+    limit: int
+
+    @property
+    def message(self):
+        return f'Too many connections, limit is {self.limit}'
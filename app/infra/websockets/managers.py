@@ -1,15 +1,34 @@
 import asyncio
+import logging
+import time
 from abc import (
     ABC,
     abstractmethod,
 )
 from collections import defaultdict
+from contextlib import asynccontextmanager
 from dataclasses import (
     dataclass,
     field,
 )
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+)
+
+from fastapi import (
+    status,
+    WebSocket,
+)
+
+import orjson
+
+from infra.repositories.presence.base import BasePresenceRepository
+from infra.websockets.exceptions import ConnectionLimitExceededException
 
-from fastapi import WebSocket
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -35,33 +54,290 @@ class BaseConnectionManager(ABC):
     async def disconnect_all(self, key: str):
         ...
 
+    def has_connections(self, key: str) -> bool:
+        return bool(self.connections_map.get(key))
+
+    def mark_alive(self, websocket: WebSocket) -> None:
+        ...
+
+    async def send_heartbeats(self) -> None:
+        ...
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {
+            'connections': sum(len(websockets) for websockets in self.connections_map.values()),
+            'chats': len(self.connections_map),
+        }
+
+    async def refresh_presence(self) -> None:
+        ...
+
+    async def clear_presence(self) -> None:
+        ...
+
+
+@dataclass(frozen=True, slots=True)
+class WebSocketFrame:
+    """An ASGI send message encoded once and shared by every socket it is broadcast to."""
+    message: dict
+
+    @classmethod
+    def from_bytes(cls, bytes_: bytes) -> 'WebSocketFrame':
+        return cls(message={'type': 'websocket.send', 'bytes': bytes_})
+
+    @classmethod
+    def from_json(cls, data: dict) -> 'WebSocketFrame':
+        return cls(message={'type': 'websocket.send', 'text': orjson.dumps(data).decode()})
+
+
+@dataclass(eq=False)
+class WebSocketSender:
+    websocket: WebSocket
+    key: str
+    on_failure: Callable[[WebSocket, str], Awaitable[None]]
+    queue_size: int = 100
+    last_seen_at: float = 0
+
+    # Frames dropped since the queue was last drained, so only a consumer that never catches up is disconnected.
+    dropped_count: int = field(default=0, init=False)
+    _queue: asyncio.Queue = field(init=False)
+    _task: asyncio.Task | None = field(default=None, init=False)
+
+    def __post_init__(self):
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._write())
+
+    def put(self, frame: WebSocketFrame) -> None:
+        # A slow consumer loses its oldest pending frames instead of delaying everyone else in the chat.
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped_count += 1
+
+        self._queue.put_nowait(frame)
+
+    async def stop(self) -> None:
+        if self._task is None or self._task is asyncio.current_task():
+            return
+
+        self._task.cancel()
+
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def _write(self) -> None:
+        while True:
+            frame = await self._queue.get()
+
+            try:
+                await self.websocket.send(frame.message)
+            except Exception:
+                await self.on_failure(self.websocket, self.key)
+                return
+
+            if self._queue.empty():
+                self.dropped_count = 0
+
+
+HEARTBEAT_FRAME = WebSocketFrame.from_json({'type': 'ping'})
+
 
 @dataclass
 class ConnectionManager(BaseConnectionManager):
     lock_map: dict[str, asyncio.Lock] = field(default_factory=dict)
+    senders_map: dict[WebSocket, WebSocketSender] = field(default_factory=dict, kw_only=True)
+    send_queue_size: int = field(default=100, kw_only=True)
+    max_dropped_messages: int = field(default=1000, kw_only=True)
+    presence_repository: BasePresenceRepository | None = field(default=None, kw_only=True)
+    node_id: str = field(default='', kw_only=True)
+    max_connections: int = field(default=0, kw_only=True)
+    max_connections_per_chat: int = field(default=0, kw_only=True)
+    idle_timeout: float = field(default=0, kw_only=True)
+    close_timeout: float = field(default=5, kw_only=True)
+    clock: Callable[[], float] = field(default=time.monotonic, kw_only=True)
+
+    rejected_count: int = field(default=0, init=False)
+    reaped_count: int = field(default=0, init=False)
+    _lock_users_map: dict[str, int] = field(default_factory=dict, init=False)
 
     async def accept_connection(self, websocket: WebSocket, key: str):
         await websocket.accept()
 
-        if key not in self.lock_map:
-            self.lock_map[key] = asyncio.Lock()
-
-        async with self.lock_map[key]:
+        async with self._lock(key):
             # TODO: Обрабатывать случаи, когда чат в процессе удаления.
+            self._check_capacity(key)
+            is_first = not self.connections_map.get(key)
             self.connections_map[key].append(websocket)
 
+            sender = WebSocketSender(
+                websocket=websocket,
+                key=key,
+                on_failure=self.remove_connection,
+                queue_size=self.send_queue_size,
+                last_seen_at=self.clock(),
+            )
+            self.senders_map[websocket] = sender
+            sender.start()
+
+            if is_first:
+                await self._update_presence(key=key, is_present=True)
+
     async def remove_connection(self, websocket: WebSocket, key: str):
-        async with self.lock_map[key]:
-            self.connections_map[key].remove(websocket)
+        async with self._lock(key):
+            websockets = self.connections_map.get(key)
+
+            if websockets and websocket in websockets:
+                websockets.remove(websocket)
+
+                # Empty buckets are dropped, so chats that were visited once don't stay in memory forever.
+                if not websockets:
+                    del self.connections_map[key]
+                    await self._update_presence(key=key, is_present=False)
+
+            sender = self.senders_map.pop(websocket, None)
+
+        if sender is not None:
+            await sender.stop()
 
     async def send_all(self, key: str, bytes_: bytes):
-        for websocket in self.connections_map[key]:
-            await websocket.send_bytes(bytes_)
+        await self.broadcast(key=key, frame=WebSocketFrame.from_bytes(bytes_))
+
+    async def broadcast(self, key: str, frame: WebSocketFrame):
+        slow_websockets = []
+
+        for websocket in self.connections_map.get(key, ()):
+            sender = self.senders_map[websocket]
+            sender.put(frame)
+
+            if self.max_dropped_messages and sender.dropped_count >= self.max_dropped_messages:
+                slow_websockets.append(websocket)
+
+        for websocket in slow_websockets:
+            await self._disconnect(
+                websocket=websocket,
+                key=key,
+                code=status.WS_1008_POLICY_VIOLATION,
+                reason='Too slow to receive messages',
+            )
 
     async def disconnect_all(self, key: str):
-        async with self.lock_map[key]:
-            for websocket in self.connections_map[key]:
-                await websocket.send_json({
-                    'message': 'Chat has been deleted',
-                })
-                await websocket.close()
+        async with self._lock(key):
+            websockets = self.connections_map.pop(key, [])
+            senders = [self.senders_map.pop(websocket) for websocket in websockets if websocket in self.senders_map]
+
+            if websockets:
+                await self._update_presence(key=key, is_present=False)
+
+        await asyncio.gather(*(sender.stop() for sender in senders))
+
+        frame = WebSocketFrame.from_json({'message': 'Chat has been deleted'})
+        await asyncio.gather(
+            *(self._close(websocket=websocket, frame=frame) for websocket in websockets),
+            return_exceptions=True,
+        )
+
+    def mark_alive(self, websocket: WebSocket) -> None:
+        sender = self.senders_map.get(websocket)
+
+        if sender is not None:
+            sender.last_seen_at = self.clock()
+
+    async def send_heartbeats(self) -> None:
+        # Half-open sockets never fail a send, so only the silence of the client gives them away.
+        if self.idle_timeout:
+            idle_since = self.clock() - self.idle_timeout
+            idle_senders = [sender for sender in self.senders_map.values() if sender.last_seen_at < idle_since]
+            self.reaped_count += len(idle_senders)
+
+            await asyncio.gather(
+                *(
+                    self._disconnect(
+                        websocket=sender.websocket,
+                        key=sender.key,
+                        code=status.WS_1001_GOING_AWAY,
+                        reason='Idle timeout',
+                    )
+                    for sender in idle_senders
+                ),
+            )
+
+        for sender in self.senders_map.values():
+            sender.put(HEARTBEAT_FRAME)
+
+    async def refresh_presence(self) -> None:
+        if self.presence_repository is not None:
+            chat_oids = [key for key, websockets in self.connections_map.items() if websockets]
+            await self.presence_repository.refresh_presence(node_id=self.node_id, chat_oids=chat_oids)
+
+    async def clear_presence(self) -> None:
+        if self.presence_repository is not None:
+            await self.presence_repository.clear_presence(node_id=self.node_id)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {
+            'connections': len(self.senders_map),
+            'chats': len(self.connections_map),
+            'locks': len(self.lock_map),
+            'rejected': self.rejected_count,
+            'reaped': self.reaped_count,
+        }
+
+    def _check_capacity(self, key: str) -> None:
+        if self.max_connections and len(self.senders_map) >= self.max_connections:
+            self.rejected_count += 1
+            raise ConnectionLimitExceededException(key=key, limit=self.max_connections)
+
+        if self.max_connections_per_chat and len(self.connections_map.get(key, ())) >= self.max_connections_per_chat:
+            self.rejected_count += 1
+            raise ConnectionLimitExceededException(key=key, limit=self.max_connections_per_chat)
+
+    async def _update_presence(self, key: str, is_present: bool) -> None:
+        # Presence is advisory, so a storage hiccup must not cost anybody their connection.
+        if self.presence_repository is None:
+            return
+
+        try:
+            if is_present:
+                await self.presence_repository.add_presence(node_id=self.node_id, chat_oid=key)
+            else:
+                await self.presence_repository.remove_presence(node_id=self.node_id, chat_oid=key)
+        except Exception:
+            logger.warning('Failed to update presence of chat %s', key, exc_info=True)
+
+    @asynccontextmanager
+    async def _lock(self, key: str) -> AsyncIterator[None]:
+        # A lock lives only while somebody holds or waits for it, so its key can't outlive the chat's connections.
+        if key not in self.lock_map:
+            self.lock_map[key] = asyncio.Lock()
+
+        lock = self.lock_map[key]
+        self._lock_users_map[key] = self._lock_users_map.get(key, 0) + 1
+
+        try:
+            async with lock:
+                yield
+        finally:
+            self._lock_users_map[key] -= 1
+
+            if not self._lock_users_map[key]:
+                del self._lock_users_map[key]
+                del self.lock_map[key]
+
+    async def _disconnect(self, websocket: WebSocket, key: str, code: int, reason: str):
+        await self.remove_connection(websocket=websocket, key=key)
+
+        try:
+            await asyncio.wait_for(websocket.close(code=code, reason=reason), timeout=self.close_timeout)
+        except Exception:
+            pass
+
+    async def _close(self, websocket: WebSocket, frame: WebSocketFrame):
+        # A peer that stopped reading must not hold up the chat deletion forever.
+        async with asyncio.timeout(self.close_timeout):
+            await websocket.send(frame.message)
+            await websocket.close()
@@ -0,0 +1,71 @@
+import asyncio
+import logging
+import time
+import zlib
+from dataclasses import (
+    dataclass,
+    field,
+)
+from typing import (
+    Awaitable,
+    Callable,
+    Generic,
+    TypeVar,
+)
+
+from infra.metrics import ConsumerMetrics
+
+
+logger = logging.getLogger(__name__)
+
+WT = TypeVar('WT')
+
+
+@dataclass(eq=False)
+class KeyedWorkerPool(Generic[WT]):
+    """Processes items on a fixed set of workers, keeping items with the same key in submission order."""
+    handle: Callable[[WT], Awaitable[None]]
+    workers_count: int = 8
+    max_in_flight: int = 1000
+    metrics: ConsumerMetrics = field(default_factory=ConsumerMetrics)
+
+    _queues: list[asyncio.Queue] = field(default_factory=list, init=False)
+    _tasks: list[asyncio.Task] = field(default_factory=list, init=False)
+
+    def start(self) -> None:
+        queue_size = max(self.max_in_flight // self.workers_count, 1)
+        self._queues = [asyncio.Queue(maxsize=queue_size) for _ in range(self.workers_count)]
+        self._tasks = [asyncio.create_task(self._work(queue)) for queue in self._queues]
+
+    async def submit(self, key: str, item: WT) -> None:
+        # Waiting for room in a full queue is what holds back the caller's consumer loop.
+        queue = self._queues[zlib.crc32(key.encode()) % self.workers_count]
+        self.metrics.in_flight += 1
+        await queue.put(item)
+
+    async def join(self) -> None:
+        await asyncio.gather(*(queue.join() for queue in self._queues))
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _work(self, queue: asyncio.Queue) -> None:
+        while True:
+            item = await queue.get()
+            started_at = time.perf_counter()
+
+            try:
+                await self.handle(item)
+            except Exception:
+                self.metrics.failed += 1
+                logger.exception('Failed to process %r', item)
+            else:
+                self.metrics.processed += 1
+            finally:
+                self.metrics.observe_processing_time(time.perf_counter() - started_at)
+                self.metrics.in_flight -= 1
+                queue.task_done()
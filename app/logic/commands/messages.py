@@ -1,10 +1,14 @@
-from dataclasses import dataclass
+from dataclasses import (
+    dataclass,
+    field,
+)
 
 from domain.entities.messages import (
     Chat,
     ChatListener,
     Message,
 )
+from domain.exceptions.base import ApplicationException
 from domain.values.messages import (
     Text,
     Title,
@@ -70,6 +74,52 @@ class CreateMessageCommandHandler(CommandHandler[CreateMessageCommand, Chat]):
         return message
 
 
+@dataclass(frozen=True)
+class CreateMessagesBatchCommand(BaseCommand):
+    texts: tuple[str, ...]
+    chat_oid: str
+
+
+@dataclass(frozen=True)
+class MessagesBatchItemResult:
+    message: Message | None = None
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class CreateMessagesBatchCommandHandler(CommandHandler[CreateMessagesBatchCommand, list[MessagesBatchItemResult]]):
+    message_repository: BaseMessagesRepository
+    chats_repository: BaseChatsRepository
+    chunk_size: int = field(default=500, kw_only=True)
+
+    async def handle(self, command: CreateMessagesBatchCommand) -> list[MessagesBatchItemResult]:
+        chat = await self.chats_repository.get_chat_by_oid(oid=command.chat_oid)
+
+        if not chat:
+            raise ChatNotFoundException(chat_oid=command.chat_oid)
+
+        results = []
+        messages = []
+
+        for text in command.texts:
+            try:
+                message = Message(text=Text(value=text), chat_oid=command.chat_oid)
+            except ApplicationException as exception:
+                results.append(MessagesBatchItemResult(error=exception.message))
+                continue
+
+            chat.add_message(message)
+            messages.append(message)
+            results.append(MessagesBatchItemResult(message=message))
+
+        for start in range(0, len(messages), self.chunk_size):
+            await self.message_repository.add_messages(messages[start:start + self.chunk_size])
+
+        await self._mediator.publish_batch(chat.pull_events())
+
+        return results
+
+
 @dataclass(frozen=True)
 class DeleteChatCommand(BaseCommand):
     chat_oid: str
@@ -77,6 +127,7 @@ class DeleteChatCommand(BaseCommand):
 
 @dataclass(frozen=True)
 class DeleteChatCommandHandler(CommandHandler[DeleteChatCommand, None]):
+    message_repository: BaseMessagesRepository
     chats_repository: BaseChatsRepository
 
     async def handle(self, command: DeleteChatCommand) -> None:
@@ -86,6 +137,7 @@ class DeleteChatCommandHandler(CommandHandler[DeleteChatCommand, None]):
             raise ChatNotFoundException(chat_oid=command.chat_oid)
 
         await self.chats_repository.delete_chat_by_oid(chat_oid=command.chat_oid)
+        await self.message_repository.delete_chat_counter(chat_oid=command.chat_oid)
         chat.delete()
         await self._mediator.publish(chat.pull_events())
 
@@ -106,13 +158,11 @@ class AddTelegramListenerCommandHandler(CommandHandler[AddTelegramListenerComman
         if not chat:
             raise ChatNotFoundException(chat_oid=command.chat_oid)
 
-        listener = ChatListener(oid=command.telegram_chat_id)
-        chat.add_listener(listener)
-
-        await self.chats_repository.add_telegram_listener(
+        listener = await self.chats_repository.add_telegram_listener(
             chat_oid=command.chat_oid,
             telegram_chat_id=command.telegram_chat_id,
         )
+        chat.add_listener(listener)
 
         await self._mediator.publish(chat.pull_events())
 
@@ -2,15 +2,20 @@ from abc import (
     ABC,
     abstractmethod,
 )
-from dataclasses import dataclass
+from dataclasses import (
+    dataclass,
+    field,
+)
 from typing import (
     Any,
     Generic,
+    Sequence,
     TypeVar,
 )
 
 from domain.events.base import BaseEvent
 from infra.message_brokers.base import BaseMessageBroker
+from infra.message_brokers.codecs import EventCodecRegistry
 from infra.websockets.managers import BaseConnectionManager
 
 
@@ -28,7 +33,11 @@ class EventHandler(ABC, Generic[ET, ER]):
     message_broker: BaseMessageBroker
     connection_manager: BaseConnectionManager
     broker_topic: str | None = None
+    event_codecs: EventCodecRegistry = field(default_factory=EventCodecRegistry, kw_only=True)
 
     @abstractmethod
     def handle(self, event: ET) -> ER:
         ...
+
+    async def handle_many(self, events: Sequence[ET]) -> list[ER]:
+        return [await self.handle(event) for event in events]
@@ -1,5 +1,11 @@
-from dataclasses import dataclass
-from typing import ClassVar
+from dataclasses import (
+    dataclass,
+    field,
+)
+from typing import (
+    ClassVar,
+    Sequence,
+)
 
 from domain.events.messages import (
     ChatDeletedEvent,
@@ -7,7 +13,12 @@ from domain.events.messages import (
     NewChatCreatedEvent,
     NewMessageReceivedEvent,
 )
-from infra.message_brokers.converters import convert_event_to_broker_message
+from infra.caches import LRUTTLCache
+from infra.integrations.notifications.delivery import NotificationDeliveryWorker
+from infra.integrations.notifications.dtos import Notification
+from infra.message_brokers.base import BrokerMessage
+from infra.repositories.filters.messages import GetChatListenersFilters
+from infra.repositories.messages.base import BaseChatsRepository
 from logic.events.base import (
     EventHandler,
     IntegrationEvent,
@@ -17,9 +28,11 @@ from logic.events.base import (
 @dataclass
 class NewChatCreatedEventHandler(EventHandler[NewChatCreatedEvent, None]):
     async def handle(self, event: NewChatCreatedEvent) -> None:
+        value, headers = self.event_codecs.encode(event)
         await self.message_broker.send_message(
             topic=self.broker_topic,
-            value=convert_event_to_broker_message(event=event),
+            value=value,
+            headers=headers,
             key=str(event.event_id).encode(),
         )
 
@@ -27,9 +40,11 @@ class NewChatCreatedEventHandler(EventHandler[NewChatCreatedEvent, None]):
 @dataclass
 class ListenerAddedEventHandler(EventHandler[ListenerAddedEvent, None]):
     async def handle(self, event: ListenerAddedEvent) -> None:
+        value, headers = self.event_codecs.encode(event)
         await self.message_broker.send_message(
             topic=self.broker_topic,
-            value=convert_event_to_broker_message(event=event),
+            value=value,
+            headers=headers,
             key=str(event.event_id).encode(),
         )
 
@@ -37,37 +52,111 @@ class ListenerAddedEventHandler(EventHandler[ListenerAddedEvent, None]):
 @dataclass
 class NewMessageReceivedEventHandler(EventHandler[NewMessageReceivedEvent, None]):
     async def handle(self, event: NewMessageReceivedEvent) -> None:
+        value, headers = self.event_codecs.encode(event)
         await self.message_broker.send_message(
             topic=self.broker_topic,
-            value=convert_event_to_broker_message(event=event),
+            value=value,
+            headers=headers,
             key=event.chat_oid.encode(),
         )
 
+    async def handle_many(self, events: Sequence[NewMessageReceivedEvent]) -> list[None]:
+        messages = []
+
+        for event in events:
+            value, headers = self.event_codecs.encode(event)
+            messages.append(
+                BrokerMessage(key=event.chat_oid.encode(), topic=self.broker_topic, value=value, headers=headers),
+            )
+
+        await self.message_broker.send_messages(messages)
+
+        return [None] * len(events)
+
 
 @dataclass
-class NewMessageReceivedFromBrokerEvent(IntegrationEvent):
-    event_title: ClassVar[str] = 'New Message From Broker Received'
+class MessageRecordReceivedFromBrokerEvent(IntegrationEvent):
+    event_title: ClassVar[str] = 'Message Record From Broker Received'
 
-    message_text: str
-    message_oid: str
     chat_oid: str
+    payload: bytes = field(repr=False)
 
 
 @dataclass
-class NewMessageReceivedFromBrokerEventHandler(EventHandler[NewMessageReceivedFromBrokerEvent, None]):
-    async def handle(self, event: NewMessageReceivedFromBrokerEvent) -> None:
-        await self.connection_manager.send_all(
-            key=event.chat_oid,
-            bytes_=convert_event_to_broker_message(event=event),
-        )
+class MessageRecordReceivedFromBrokerEventHandler(EventHandler[MessageRecordReceivedFromBrokerEvent, None]):
+    async def handle(self, event: MessageRecordReceivedFromBrokerEvent) -> None:
+        await self.connection_manager.send_all(key=event.chat_oid, bytes_=event.payload)
 
 
 @dataclass
 class ChatDeletedEventHandler(EventHandler[ChatDeletedEvent, None]):
     async def handle(self, event: ChatDeletedEvent) -> None:
+        value, headers = self.event_codecs.encode(event)
         await self.message_broker.send_message(
             topic=self.broker_topic,
-            value=convert_event_to_broker_message(event=event),
+            value=value,
+            headers=headers,
             key=event.chat_oid.encode(),
         )
         await self.connection_manager.disconnect_all(event.chat_oid)
+
+
+@dataclass
+class ChatDeletedFromBrokerEvent(IntegrationEvent):
+    event_title: ClassVar[str] = 'Chat Deleted From Broker Received'
+
+    chat_oid: str
+
+
+@dataclass
+class ChatDeletedFromBrokerEventHandler(EventHandler[ChatDeletedFromBrokerEvent, None]):
+    chats_cache: LRUTTLCache = field(kw_only=True)
+
+    async def handle(self, event: ChatDeletedFromBrokerEvent) -> None:
+        self.chats_cache.invalidate(event.chat_oid)
+
+
+@dataclass
+class ChatListenersNotificationEvent(IntegrationEvent):
+    event_title: ClassVar[str] = 'Chat Listeners Notification Requested'
+
+    message_text: str
+    message_oid: str
+    chat_oid: str
+
+
+@dataclass
+class ChatListenersNotificationEventHandler(EventHandler[ChatListenersNotificationEvent, None]):
+    chats_repository: BaseChatsRepository = field(kw_only=True)
+    notification_worker: NotificationDeliveryWorker = field(kw_only=True)
+    listeners_page_size: int = field(default=100, kw_only=True)
+
+    async def handle(self, event: ChatListenersNotificationEvent) -> None:
+        chat = await self.chats_repository.get_chat_by_oid(oid=event.chat_oid)
+
+        if chat is None:
+            return
+
+        offset = 0
+
+        while True:
+            listeners = list(
+                await self.chats_repository.get_all_chat_listeners(
+                    chat_oid=event.chat_oid,
+                    filters=GetChatListenersFilters(limit=self.listeners_page_size, offset=offset),
+                ),
+            )
+
+            for listener in listeners:
+                self.notification_worker.submit(
+                    Notification(
+                        recipient_id=listener.oid,
+                        title=chat.title.as_generic_type(),
+                        text=event.message_text,
+                    ),
+                )
+
+            if len(listeners) < self.listeners_page_size:
+                return
+
+            offset += self.listeners_page_size
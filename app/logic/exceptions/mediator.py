@@ -19,3 +19,25 @@ class CommandHandlersNotRegisteredException(LogicException):
     @property
     def message(self):
         return f'Command handlers not registered: {self.command_type}'
+
+
+@dataclass(eq=False)
+class EventHandlersFailedException(Exception):
+    # Not an ApplicationException: failing handlers are a server-side problem, not a bad request.
+    errors: list[Exception]
+
+    @property
+    def message(self):
+        return f'{len(self.errors)} event handlers failed: {"; ".join(map(str, self.errors))}'
+
+    def __str__(self):
+        return self.message
+
+
+@dataclass(eq=False)
+class QueryHandlerNotRegisteredException(LogicException):
+    query_type: type
+
+    @property
+    def message(self):
+        return f'Query handler not registered: {self.query_type}'
@@ -19,3 +19,19 @@ class ChatNotFoundException(LogicException):
     @property
     def message(self):
         return 'Chat not found'
+
+
+@dataclass(eq=False)
+class InvalidMessagesCursorException(LogicException):
+    cursor: str
+
+    @property
+    def message(self):
+        return f'Invalid messages cursor: {self.cursor}'
+
+
+@dataclass(eq=False)
+class MessagesCursorsConflictException(LogicException):
+    @property
+    def message(self):
+        return 'Only one of "before" and "after" cursors can be passed'
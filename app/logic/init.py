@@ -6,6 +6,10 @@ from aiokafka import (
     AIOKafkaConsumer,
     AIOKafkaProducer,
 )
+from httpx import (
+    AsyncClient,
+    Limits,
+)
 from motor.motor_asyncio import AsyncIOMotorClient
 from punq import (
     Container,
@@ -18,16 +22,49 @@ from domain.events.messages import (
     NewChatCreatedEvent,
     NewMessageReceivedEvent,
 )
+from infra.caches import LRUTTLCache
+from infra.integrations.notifications.clients.base import BaseNotificationClient
+from infra.integrations.notifications.clients.telegram import TelegramNotificationClient
+from infra.integrations.notifications.delivery import NotificationDeliveryWorker
 from infra.message_brokers.base import BaseMessageBroker
+from infra.message_brokers.batching import BatchingMessageBroker
+from infra.message_brokers.codecs import (
+    BINARY_CONTENT_TYPE,
+    EventCodecRegistry,
+    JSON_CONTENT_TYPE,
+)
 from infra.message_brokers.kafka import KafkaMessageBroker
+from infra.message_brokers.memory import MemoryMessageBroker
+from infra.message_brokers.outbox import (
+    OutboxMessageBroker,
+    OutboxRelay,
+)
+from infra.metrics import MetricsRegistry
+from infra.rate_limiting import TokenBucket
 from infra.repositories.messages.base import (
     BaseChatsRepository,
     BaseMessagesRepository,
 )
+from infra.repositories.messages.batching import BatchingMessagesRepository
+from infra.repositories.messages.cached import CachedChatsRepository
+from infra.repositories.messages.memory import (
+    MemoryChatRepository,
+    MemoryMessagesRepository,
+)
 from infra.repositories.messages.mongo import (
     MongoDBChatsRepository,
     MongoDBMessagesRepository,
 )
+from infra.repositories.mongo import MongoDBIndexManager
+from infra.repositories.outbox.base import BaseOutboxRepository
+from infra.repositories.outbox.mongo import MongoDBOutboxRepository
+from infra.repositories.presence.base import BasePresenceRepository
+from infra.repositories.presence.mongo import MongoDBPresenceRepository
+from infra.repositories.transactions import (
+    BaseTransactionManager,
+    MongoDBTransactionManager,
+    NullTransactionManager,
+)
 from infra.websockets.managers import (
     BaseConnectionManager,
     ConnectionManager,
@@ -39,20 +76,31 @@ from logic.commands.messages import (
     CreateChatCommandHandler,
     CreateMessageCommand,
     CreateMessageCommandHandler,
+    CreateMessagesBatchCommand,
+    CreateMessagesBatchCommandHandler,
     DeleteChatCommand,
     DeleteChatCommandHandler,
 )
 from logic.events.messages import (
     ChatDeletedEventHandler,
+    ChatDeletedFromBrokerEvent,
+    ChatDeletedFromBrokerEventHandler,
+    ChatListenersNotificationEvent,
+    ChatListenersNotificationEventHandler,
     ListenerAddedEventHandler,
+    MessageRecordReceivedFromBrokerEvent,
+    MessageRecordReceivedFromBrokerEventHandler,
     NewChatCreatedEventHandler,
     NewMessageReceivedEventHandler,
-    NewMessageReceivedFromBrokerEvent,
-    NewMessageReceivedFromBrokerEventHandler,
 )
-from logic.mediator.base import Mediator
+from logic.mediator.base import (
+    DispatchStrategy,
+    Mediator,
+)
 from logic.mediator.event import EventMediator
 from logic.queries.messages import (
+    ExportMessagesQuery,
+    ExportMessagesQueryHandler,
     GetAllChatsListenersQuery,
     GetAllChatsListenersQueryHandler,
     GetAllChatsQuery,
@@ -70,6 +118,16 @@ def init_container() -> Container:
     return _init_container()
 
 
+def init_memory_container() -> Container:
+    # In-memory repositories and broker, for tests and benchmarks that run without MongoDB and Kafka.
+    container = _init_container()
+    container.register(BaseChatsRepository, MemoryChatRepository, scope=Scope.singleton)
+    container.register(BaseMessagesRepository, MemoryMessagesRepository, scope=Scope.singleton)
+    container.register(BaseMessageBroker, instance=MemoryMessageBroker(), scope=Scope.singleton)
+
+    return container
+
+
 def _init_container() -> Container:
     container = Container()
 
@@ -86,22 +144,76 @@ def _init_container() -> Container:
     container.register(AsyncIOMotorClient, factory=create_mongodb_client, scope=Scope.singleton)
     client = container.resolve(AsyncIOMotorClient)
 
-    def init_chats_mongodb_repository() -> BaseChatsRepository:
+    def init_chats_mongodb_repository() -> MongoDBChatsRepository:
         return MongoDBChatsRepository(
             mongo_db_client=client,
             mongo_db_db_name=config.mongodb_chat_database,
             mongo_db_collection_name=config.mongodb_chat_collection,
+            mongo_db_listeners_collection_name=config.mongodb_listeners_collection,
         )
 
-    def init_messages_mongodb_repository() -> BaseMessagesRepository:
+    def init_messages_mongodb_repository() -> MongoDBMessagesRepository:
         return MongoDBMessagesRepository(
             mongo_db_client=client,
             mongo_db_db_name=config.mongodb_chat_database,
             mongo_db_collection_name=config.mongodb_messages_collection,
+            mongo_db_counters_collection_name=config.mongodb_messages_counters_collection,
         )
 
-    container.register(BaseChatsRepository, factory=init_chats_mongodb_repository, scope=Scope.singleton)
-    container.register(BaseMessagesRepository, factory=init_messages_mongodb_repository, scope=Scope.singleton)
+    def init_messages_repository() -> BaseMessagesRepository:
+        messages_repository = container.resolve(MongoDBMessagesRepository)
+
+        if not config.message_write_batching_enabled:
+            return messages_repository
+
+        return BatchingMessagesRepository(
+            messages_repository=messages_repository,
+            max_batch_size=config.message_write_batch_max_size,
+            max_latency=config.message_write_batch_max_latency_ms / 1000,
+        )
+
+    container.register(MongoDBChatsRepository, factory=init_chats_mongodb_repository, scope=Scope.singleton)
+    container.register(MongoDBMessagesRepository, factory=init_messages_mongodb_repository, scope=Scope.singleton)
+    container.register(
+        LRUTTLCache,
+        instance=LRUTTLCache(max_size=config.chats_cache_max_size, ttl=config.chats_cache_ttl_seconds),
+        scope=Scope.singleton,
+    )
+
+    def init_chats_repository() -> BaseChatsRepository:
+        chats_repository = container.resolve(MongoDBChatsRepository)
+
+        if not config.chats_cache_enabled:
+            return chats_repository
+
+        return CachedChatsRepository(chats_repository=chats_repository, cache=container.resolve(LRUTTLCache))
+
+    container.register(BaseChatsRepository, factory=init_chats_repository, scope=Scope.singleton)
+    container.register(BaseMessagesRepository, factory=init_messages_repository, scope=Scope.singleton)
+
+    def init_mongodb_index_manager() -> MongoDBIndexManager:
+        repositories = [
+            container.resolve(MongoDBChatsRepository),
+            container.resolve(MongoDBMessagesRepository),
+        ]
+
+        if config.outbox_enabled:
+            repositories.append(container.resolve(MongoDBOutboxRepository))
+
+        if config.websocket_presence_enabled:
+            repositories.append(container.resolve(MongoDBPresenceRepository))
+
+        return MongoDBIndexManager(repositories=repositories)
+
+    container.register(MongoDBIndexManager, factory=init_mongodb_index_manager, scope=Scope.singleton)
+
+    def init_transaction_manager() -> BaseTransactionManager:
+        if config.outbox_enabled and config.outbox_transactions_enabled:
+            return MongoDBTransactionManager(mongo_db_client=client)
+
+        return NullTransactionManager()
+
+    container.register(BaseTransactionManager, factory=init_transaction_manager, scope=Scope.singleton)
 
     # Command handlers
     container.register(CreateChatCommandHandler)
@@ -113,24 +225,154 @@ def _init_container() -> Container:
     container.register(GetAllChatsQueryHandler)
     container.register(GetAllChatsListenersQueryHandler)
 
-    def create_message_broker() -> BaseMessageBroker:
+    def create_kafka_message_broker() -> KafkaMessageBroker:
         return KafkaMessageBroker(
-            producer=AIOKafkaProducer(bootstrap_servers=config.kafka_url),
-            consumer=AIOKafkaConsumer(
+            producer=AIOKafkaProducer(
                 bootstrap_servers=config.kafka_url,
-                group_id=f'chats-{uuid4()}',
+                linger_ms=config.kafka_producer_linger_ms,
+                max_batch_size=config.kafka_producer_max_batch_size,
+                compression_type=config.kafka_producer_compression_type,
+                acks=config.kafka_producer_acks,
+            ),
+            consumer_factory=lambda group_id: AIOKafkaConsumer(
+                bootstrap_servers=config.kafka_url,
+                group_id=group_id or f'chats-{uuid4()}',
                 metadata_max_age_ms=30000,
             ),
+            wait_for_delivery=config.kafka_producer_wait_for_delivery,
+        )
+
+    def init_outbox_mongodb_repository() -> MongoDBOutboxRepository:
+        return MongoDBOutboxRepository(
+            mongo_db_client=client,
+            mongo_db_db_name=config.mongodb_chat_database,
+            mongo_db_collection_name=config.mongodb_outbox_collection,
+            retention_seconds=config.outbox_retention_seconds,
+        )
+
+    def init_outbox_relay() -> OutboxRelay:
+        kafka_message_broker: KafkaMessageBroker = container.resolve(KafkaMessageBroker)
+
+        # Messages are marked as sent once send_messages returns, so the relay always waits for Kafka to ack them,
+        # whatever KAFKA_PRODUCER_WAIT_FOR_DELIVERY says. The producer and its lifecycle stay with the shared broker.
+        return OutboxRelay(
+            outbox_repository=container.resolve(BaseOutboxRepository),
+            message_broker=KafkaMessageBroker(
+                producer=kafka_message_broker.producer,
+                consumer_factory=kafka_message_broker.consumer_factory,
+                wait_for_delivery=True,
+            ),
+            batch_size=config.outbox_relay_batch_size,
+            poll_interval=config.outbox_relay_poll_interval_ms / 1000,
         )
 
+    def create_message_broker() -> BaseMessageBroker:
+        message_broker = container.resolve(KafkaMessageBroker)
+
+        if config.outbox_enabled:
+            message_broker = OutboxMessageBroker(
+                message_broker=message_broker,
+                outbox_repository=container.resolve(BaseOutboxRepository),
+                relay=container.resolve(OutboxRelay),
+            )
+
+        if config.message_write_batching_enabled:
+            message_broker = BatchingMessageBroker(
+                message_broker=message_broker,
+                max_batch_size=config.message_write_batch_max_size,
+                max_latency=config.message_write_batch_max_latency_ms / 1000,
+            )
+
+        return message_broker
+
     # Message Broker
+    container.register(
+        EventCodecRegistry,
+        instance=EventCodecRegistry(
+            default_content_type=BINARY_CONTENT_TYPE if config.broker_event_encoding == 'binary' else JSON_CONTENT_TYPE,
+        ),
+        scope=Scope.singleton,
+    )
+    container.register(KafkaMessageBroker, factory=create_kafka_message_broker, scope=Scope.singleton)
+    container.register(MongoDBOutboxRepository, factory=init_outbox_mongodb_repository, scope=Scope.singleton)
+    container.register(
+        BaseOutboxRepository,
+        factory=lambda: container.resolve(MongoDBOutboxRepository),
+        scope=Scope.singleton,
+    )
+    container.register(OutboxRelay, factory=init_outbox_relay, scope=Scope.singleton)
     container.register(BaseMessageBroker, factory=create_message_broker, scope=Scope.singleton)
 
-    container.register(BaseConnectionManager, instance=ConnectionManager(), scope=Scope.singleton)
+    def init_presence_mongodb_repository() -> MongoDBPresenceRepository:
+        return MongoDBPresenceRepository(
+            mongo_db_client=client,
+            mongo_db_db_name=config.mongodb_chat_database,
+            mongo_db_collection_name=config.mongodb_presence_collection,
+            ttl_seconds=config.websocket_presence_ttl_seconds,
+        )
+
+    def init_connection_manager() -> BaseConnectionManager:
+        return ConnectionManager(
+            send_queue_size=config.websocket_send_queue_size,
+            max_dropped_messages=config.websocket_max_dropped_messages,
+            presence_repository=(
+                container.resolve(BasePresenceRepository) if config.websocket_presence_enabled else None
+            ),
+            node_id=config.node_id,
+            max_connections=config.websocket_max_connections,
+            max_connections_per_chat=config.websocket_max_connections_per_chat,
+            idle_timeout=config.websocket_idle_timeout_seconds,
+            close_timeout=config.websocket_close_timeout_seconds,
+        )
+
+    # Websockets
+    container.register(MongoDBPresenceRepository, factory=init_presence_mongodb_repository, scope=Scope.singleton)
+    container.register(
+        BasePresenceRepository,
+        factory=lambda: container.resolve(MongoDBPresenceRepository),
+        scope=Scope.singleton,
+    )
+    container.register(BaseConnectionManager, factory=init_connection_manager, scope=Scope.singleton)
+
+    def create_notification_client() -> BaseNotificationClient:
+        # One pooled client per bot keeps connections to Telegram alive between notifications.
+        return TelegramNotificationClient(
+            bot_token=config.telegram_bot_token,
+            http_client=AsyncClient(
+                limits=Limits(
+                    max_connections=config.telegram_max_connections,
+                    max_keepalive_connections=config.telegram_max_connections,
+                ),
+                timeout=config.telegram_request_timeout_seconds,
+            ),
+            send_url=config.telegram_api_url,
+            rate_limiter=TokenBucket(
+                rate=config.telegram_rate_limit_per_second,
+                capacity=config.telegram_rate_limit_burst,
+            ),
+        )
+
+    def init_notification_worker() -> NotificationDeliveryWorker:
+        return NotificationDeliveryWorker(
+            client=container.resolve(BaseNotificationClient),
+            max_concurrency=config.notifications_max_concurrency,
+            max_retries=config.notifications_max_retries,
+            retry_backoff=config.notifications_retry_backoff_ms / 1000,
+            coalesce_window=config.notifications_coalesce_window_ms / 1000,
+        )
+
+    # Notifications
+    container.register(BaseNotificationClient, factory=create_notification_client, scope=Scope.singleton)
+    container.register(NotificationDeliveryWorker, factory=init_notification_worker, scope=Scope.singleton)
 
     # Mediator
     def init_mediator() -> Mediator:
-        mediator = Mediator()
+        dispatch_strategy = DispatchStrategy(config.mediator_dispatch_strategy)
+        mediator = Mediator(
+            dispatch_strategy=dispatch_strategy,
+            scheduler=container.resolve(Scheduler) if dispatch_strategy == DispatchStrategy.background else None,
+            transaction_manager=container.resolve(BaseTransactionManager),
+        )
 
         # command handlers
         create_chat_handler = CreateChatCommandHandler(
@@ -142,8 +384,15 @@ def _init_container() -> Container:
             message_repository=container.resolve(BaseMessagesRepository),
             chats_repository=container.resolve(BaseChatsRepository),
         )
+        create_messages_batch_handler = CreateMessagesBatchCommandHandler(
+            _mediator=mediator,
+            message_repository=container.resolve(BaseMessagesRepository),
+            chats_repository=container.resolve(BaseChatsRepository),
+            chunk_size=config.messages_import_chunk_size,
+        )
         delete_chat_handler = DeleteChatCommandHandler(
             _mediator=mediator,
+            message_repository=container.resolve(BaseMessagesRepository),
             chats_repository=container.resolve(BaseChatsRepository),
         )
         add_telegram_listener_handler = AddTelegramListenerCommandHandler(
@@ -156,26 +405,42 @@ def _init_container() -> Container:
             broker_topic=config.new_chats_event_topic,
             message_broker=container.resolve(BaseMessageBroker),
             connection_manager=container.resolve(BaseConnectionManager),
+            event_codecs=container.resolve(EventCodecRegistry),
         )
         new_message_received_handler = NewMessageReceivedEventHandler(
             message_broker=container.resolve(BaseMessageBroker),
             broker_topic=config.new_messages_received_topic,
             connection_manager=container.resolve(BaseConnectionManager),
+            event_codecs=container.resolve(EventCodecRegistry),
         )
-        new_message_received_from_broker_event_handler = NewMessageReceivedFromBrokerEventHandler(
+        message_record_received_from_broker_event_handler = MessageRecordReceivedFromBrokerEventHandler(
             message_broker=container.resolve(BaseMessageBroker),
             broker_topic=config.new_messages_received_topic,
             connection_manager=container.resolve(BaseConnectionManager),
         )
+        chat_deleted_from_broker_event_handler = ChatDeletedFromBrokerEventHandler(
+            message_broker=container.resolve(BaseMessageBroker),
+            broker_topic=config.chat_deleted_topic,
+            connection_manager=container.resolve(BaseConnectionManager),
+            chats_cache=container.resolve(LRUTTLCache),
+        )
         chat_deleted_event_handler = ChatDeletedEventHandler(
             message_broker=container.resolve(BaseMessageBroker),
             broker_topic=config.chat_deleted_topic,
             connection_manager=container.resolve(BaseConnectionManager),
+            event_codecs=container.resolve(EventCodecRegistry),
+        )
+        chat_listeners_notification_handler = ChatListenersNotificationEventHandler(
+            message_broker=container.resolve(BaseMessageBroker),
+            connection_manager=container.resolve(BaseConnectionManager),
+            chats_repository=container.resolve(BaseChatsRepository),
+            notification_worker=container.resolve(NotificationDeliveryWorker),
         )
         new_listener_added_handler = ListenerAddedEventHandler(
             message_broker=container.resolve(BaseMessageBroker),
             broker_topic=config.new_listener_added_topic,
             connection_manager=container.resolve(BaseConnectionManager),
+            event_codecs=container.resolve(EventCodecRegistry),
         )
 
         # Register event
@@ -188,13 +453,21 @@ def _init_container() -> Container:
             [new_message_received_handler],
         )
         mediator.register_event(
-            NewMessageReceivedFromBrokerEvent,
-            [new_message_received_from_broker_event_handler],
+            MessageRecordReceivedFromBrokerEvent,
+            [message_record_received_from_broker_event_handler],
         )
         mediator.register_event(
             ChatDeletedEvent,
             [chat_deleted_event_handler],
         )
+        mediator.register_event(
+            ChatDeletedFromBrokerEvent,
+            [chat_deleted_from_broker_event_handler],
+        )
+        mediator.register_event(
+            ChatListenersNotificationEvent,
+            [chat_listeners_notification_handler],
+        )
         mediator.register_event(
             ListenerAddedEvent,
             [new_listener_added_handler],
@@ -209,6 +482,10 @@ def _init_container() -> Container:
             CreateMessageCommand,
             [create_message_handler],
         )
+        mediator.register_command(
+            CreateMessagesBatchCommand,
+            [create_messages_batch_handler],
+        )
         mediator.register_command(
             DeleteChatCommand,
             [delete_chat_handler],
@@ -227,6 +504,14 @@ def _init_container() -> Container:
             GetMessagesQuery,
             container.resolve(GetMessagesQueryHandler),
         )
+        mediator.register_query(
+            ExportMessagesQuery,
+            ExportMessagesQueryHandler(
+                chats_repository=container.resolve(BaseChatsRepository),
+                messages_repository=container.resolve(BaseMessagesRepository),
+                batch_size=config.messages_export_batch_size,
+            ),
+        )
         mediator.register_query(
             GetAllChatsQuery,
             container.resolve(GetAllChatsQueryHandler),
@@ -235,12 +520,14 @@ def _init_container() -> Container:
             GetAllChatsListenersQuery,
             container.resolve(GetAllChatsListenersQueryHandler),
         )
+        mediator.compile()
 
         return mediator
 
-    container.register(Mediator, factory=init_mediator)
-    container.register(EventMediator, factory=init_mediator)
+    container.register(Mediator, factory=init_mediator, scope=Scope.singleton)
+    container.register(EventMediator, factory=lambda: container.resolve(Mediator), scope=Scope.singleton)
 
     container.register(Scheduler, factory=lambda: Scheduler(), scope=Scope.singleton)
+    container.register(MetricsRegistry, instance=MetricsRegistry(), scope=Scope.singleton)
 
     return container
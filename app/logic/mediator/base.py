@@ -1,11 +1,22 @@
+import asyncio
 from collections import defaultdict
-from collections.abc import Iterable
+from collections.abc import (
+    Awaitable,
+    Iterable,
+)
 from dataclasses import (
     dataclass,
     field,
 )
+from enum import Enum
+
+from aiojobs import Scheduler
 
 from domain.events.base import BaseEvent
+from infra.repositories.transactions import (
+    BaseTransactionManager,
+    NullTransactionManager,
+)
 from logic.commands.base import (
     BaseCommand,
     CommandHandler,
@@ -17,8 +28,16 @@ from logic.events.base import (
     ET,
     EventHandler,
 )
-from logic.exceptions.mediator import CommandHandlersNotRegisteredException
+from logic.exceptions.mediator import (
+    CommandHandlersNotRegisteredException,
+    EventHandlersFailedException,
+    QueryHandlerNotRegisteredException,
+)
 from logic.mediator.command import CommandMediator
+from logic.mediator.dispatch import (
+    DispatchRegistry,
+    DispatchTable,
+)
 from logic.mediator.event import EventMediator
 from logic.mediator.query import QueryMediator
 from logic.queries.base import (
@@ -29,6 +48,25 @@ from logic.queries.base import (
 )
 
 
+class DispatchStrategy(str, Enum):
+    sequential = 'sequential'
+    concurrent = 'concurrent'
+    background = 'background'
+
+
+async def gather_results(awaitables: Iterable[Awaitable]) -> list:
+    results = await asyncio.gather(*awaitables, return_exceptions=True)
+    errors = [result for result in results if isinstance(result, Exception)]
+
+    if len(errors) == 1:
+        raise errors[0]
+
+    if errors:
+        raise EventHandlersFailedException(errors=errors) from errors[0]
+
+    return results
+
+
 @dataclass(eq=False)
 class Mediator(EventMediator, QueryMediator, CommandMediator):
     events_map: dict[ET, EventHandler] = field(
@@ -43,33 +81,122 @@ class Mediator(EventMediator, QueryMediator, CommandMediator):
         default_factory=dict,
         kw_only=True,
     )
+    dispatch_strategy: DispatchStrategy = field(
+        default=DispatchStrategy.sequential,
+        kw_only=True,
+    )
+    scheduler: Scheduler | None = field(
+        default=None,
+        kw_only=True,
+    )
+    transaction_manager: BaseTransactionManager = field(
+        default_factory=NullTransactionManager,
+        kw_only=True,
+    )
+
+    _registry: DispatchRegistry | None = field(default=None, init=False, repr=False)
 
     def register_event(self, event: ET, event_handlers: Iterable[EventHandler[ET, ER]]):
         self.events_map[event].extend(event_handlers)
+        self._registry = None
 
     def register_command(self, command: CT, command_handlers: Iterable[CommandHandler[CT, CR]]):
         self.commands_map[command].extend(command_handlers)
+        self._registry = None
 
     def register_query(self, query: QT, query_handler: BaseQueryHandler[QT, QR]) -> QR:
         self.queries_map[query] = query_handler
+        self._registry = None
+
+    def compile(self) -> DispatchRegistry:
+        """Builds the dispatch tables from the registered handlers, registering again recompiles them."""
+        self._registry = DispatchRegistry(
+            events=DispatchTable.compile(self.events_map, collect_bases=True),
+            commands=DispatchTable.compile(self.commands_map),
+            queries=DispatchTable.compile(self.queries_map),
+        )
+
+        return self._registry
 
     async def publish(self, events: Iterable[BaseEvent]) -> Iterable[ER]:
-        result = []
+        resolve_handlers = (self._registry or self.compile()).events.resolve
+
+        if self.dispatch_strategy == DispatchStrategy.sequential:
+            result = []
+
+            for event in events:
+                handlers = resolve_handlers(event.__class__)
+
+                if len(handlers) == 1:
+                    result.append(await handlers[0].handle(event))
+                else:
+                    for handler in handlers:
+                        result.append(await handler.handle(event))
+
+            return result
+
+        return await self._dispatch_handles(
+            [handler.handle(event) for event in events for handler in resolve_handlers(event.__class__)],
+        )
+
+    async def publish_batch(self, events: Iterable[BaseEvent]) -> Iterable[ER]:
+        """Hands events of the same type to each handler at once, so it can send them in a single round trip."""
+        resolve_handlers = (self._registry or self.compile()).events.resolve
+        events_by_type: dict[type, list[BaseEvent]] = defaultdict(list)
 
         for event in events:
-            handlers: Iterable[EventHandler] = self.events_map[event.__class__]
-            result.extend([await handler.handle(event) for handler in handlers])
+            events_by_type[event.__class__].append(event)
+
+        if self.dispatch_strategy == DispatchStrategy.sequential:
+            result = []
+
+            for event_type, typed_events in events_by_type.items():
+                for handler in resolve_handlers(event_type):
+                    result.extend(await handler.handle_many(typed_events))
+
+            return result
 
-        return result
+        results = await self._dispatch_handles(
+            [
+                handler.handle_many(typed_events)
+                for event_type, typed_events in events_by_type.items()
+                for handler in resolve_handlers(event_type)
+            ],
+        )
+
+        return [result for handler_results in results for result in handler_results]
+
+    async def _dispatch_handles(self, handles: list[Awaitable]) -> list:
+        if self.dispatch_strategy == DispatchStrategy.background:
+            # The caller does not wait for the handlers, failures are reported by the scheduler exception handler.
+            for handle in handles:
+                await self.scheduler.spawn(handle)
+
+            return []
+
+        return await gather_results(handles)
 
     async def handle_command(self, command: BaseCommand) -> Iterable[CR]:
         command_type = command.__class__
-        handlers = self.commands_map.get(command_type)
+        handlers = (self._registry or self.compile()).commands.resolve(command_type)
 
         if not handlers:
             raise CommandHandlersNotRegisteredException(command_type)
 
-        return [await handler.handle(command) for handler in handlers]
+        # Entity writes and the events they publish to the outbox commit together.
+        async with self.transaction_manager.transaction():
+            if len(handlers) == 1:
+                return [await handlers[0].handle(command)]
+
+            if self.dispatch_strategy == DispatchStrategy.sequential:
+                return [await handler.handle(command) for handler in handlers]
+
+            return await gather_results(handler.handle(command) for handler in handlers)
 
     async def handle_query(self, query: BaseQuery) -> QR:
-        return await self.queries_map[query.__class__].handle(query=query)
+        handlers = (self._registry or self.compile()).queries.resolve(query.__class__)
+
+        if not handlers:
+            raise QueryHandlerNotRegisteredException(query.__class__)
+
+        return await handlers[0].handle(query=query)
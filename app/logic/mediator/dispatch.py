@@ -0,0 +1,64 @@
+from collections.abc import Mapping
+from dataclasses import (
+    dataclass,
+    field,
+)
+from typing import (
+    Generic,
+    TypeVar,
+)
+
+
+HT = TypeVar('HT')
+
+
+@dataclass(frozen=True)
+class DispatchTable(Generic[HT]):
+    """Immutable handlers lookup by message type, resolved through the MRO and memoized per concrete type."""
+    handlers_map: Mapping[type, tuple[HT, ...]]
+    # Events are delivered to the handlers of every base class, commands and queries only to the closest one.
+    collect_bases: bool = False
+
+    _resolved_map: dict[type, tuple[HT, ...]] = field(default_factory=dict, init=False, compare=False)
+
+    @classmethod
+    def compile(cls, handlers_map: Mapping[type, list[HT] | HT], collect_bases: bool = False) -> 'DispatchTable[HT]':
+        return cls(
+            handlers_map={
+                message_type: tuple(handlers) if isinstance(handlers, list) else (handlers,)
+                for message_type, handlers in handlers_map.items()
+                if handlers
+            },
+            collect_bases=collect_bases,
+        )
+
+    def resolve(self, message_type: type) -> tuple[HT, ...]:
+        try:
+            return self._resolved_map[message_type]
+        except KeyError:
+            handlers = self._resolved_map[message_type] = self._resolve_by_mro(message_type)
+
+            return handlers
+
+    def _resolve_by_mro(self, message_type: type) -> tuple[HT, ...]:
+        handlers = ()
+
+        for base_type in message_type.__mro__:
+            base_handlers = self.handlers_map.get(base_type)
+
+            if not base_handlers:
+                continue
+
+            if not self.collect_bases:
+                return base_handlers
+
+            handlers += base_handlers
+
+        return handlers
+
+
+@dataclass(frozen=True)
+class DispatchRegistry:
+    events: DispatchTable
+    commands: DispatchTable
+    queries: DispatchTable
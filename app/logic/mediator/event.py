@@ -31,3 +31,7 @@ class EventMediator(ABC):
     @abstractmethod
     async def publish(self, events: Iterable[BaseEvent]) -> Iterable[ER]:
         ...
+
+    @abstractmethod
+    async def publish_batch(self, events: Iterable[BaseEvent]) -> Iterable[ER]:
+        ...
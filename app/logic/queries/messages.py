@@ -1,5 +1,11 @@
-from dataclasses import dataclass
-from typing import Iterable
+from dataclasses import (
+    dataclass,
+    field,
+)
+from typing import (
+    AsyncIterator,
+    Iterable,
+)
 
 from domain.entities.messages import (
     Chat,
@@ -8,12 +14,17 @@ from domain.entities.messages import (
 )
 from infra.repositories.filters.messages import (
     GetAllChatsFilters,
+    GetChatListenersFilters,
     GetMessagesFilters,
 )
 from infra.repositories.messages.base import (
     BaseChatsRepository,
     BaseMessagesRepository,
 )
+from infra.repositories.messages.read_models import (
+    ChatReadModel,
+    MessageReadModel,
+)
 from logic.exceptions.messages import ChatNotFoundException
 from logic.queries.base import (
     BaseQuery,
@@ -32,6 +43,11 @@ class GetMessagesQuery(BaseQuery):
     filters: GetMessagesFilters
 
 
+@dataclass(frozen=True)
+class ExportMessagesQuery(BaseQuery):
+    chat_oid: str
+
+
 @dataclass(frozen=True)
 class GetAllChatsQuery(BaseQuery):
     filters: GetAllChatsFilters
@@ -40,6 +56,7 @@ class GetAllChatsQuery(BaseQuery):
 @dataclass(frozen=True)
 class GetAllChatsListenersQuery(BaseQuery):
     chat_oid: str
+    filters: GetChatListenersFilters = field(default_factory=GetChatListenersFilters)
 
 
 @dataclass(frozen=True)
@@ -60,30 +77,44 @@ class GetChatDetailQueryHandler(BaseQueryHandler):
 class GetMessagesQueryHandler(BaseQueryHandler):
     messages_repository: BaseMessagesRepository
 
-    async def handle(self, query: GetMessagesQuery) -> Iterable[Message]:
-        return await self.messages_repository.get_messages(
+    async def handle(self, query: GetMessagesQuery) -> tuple[list[MessageReadModel], int | None]:
+        return await self.messages_repository.get_messages_read_models(
             chat_oid=query.chat_oid,
             filters=query.filters,
         )
 
 
 @dataclass(frozen=True)
-class GetAllChatsQueryHandler(BaseQueryHandler[GetAllChatsQuery, Iterable[Chat]]):
+class ExportMessagesQueryHandler(BaseQueryHandler[ExportMessagesQuery, AsyncIterator[Message]]):
+    chats_repository: BaseChatsRepository
+    messages_repository: BaseMessagesRepository
+    batch_size: int = field(default=1000, kw_only=True)
+
+    async def handle(self, query: ExportMessagesQuery) -> AsyncIterator[Message]:
+        chat = await self.chats_repository.get_chat_by_oid(oid=query.chat_oid)
+
+        if not chat:
+            raise ChatNotFoundException(chat_oid=query.chat_oid)
+
+        return self.messages_repository.iter_messages(chat_oid=query.chat_oid, batch_size=self.batch_size)
+
+
+@dataclass(frozen=True)
+class GetAllChatsQueryHandler(BaseQueryHandler[GetAllChatsQuery, tuple[list[ChatReadModel], int | None]]):
     chat_repository: BaseChatsRepository
 
-    async def handle(self, query: GetAllChatsQuery) -> Iterable[Chat]:
-        return await self.chat_repository.get_all_chats(filters=query.filters)
+    async def handle(self, query: GetAllChatsQuery) -> tuple[list[ChatReadModel], int | None]:
+        return await self.chat_repository.get_all_chats_read_models(filters=query.filters)
 
 
 @dataclass(frozen=True)
 class GetAllChatsListenersQueryHandler(BaseQueryHandler[GetAllChatsListenersQuery, Iterable[ChatListener]]):
     chat_repository: BaseChatsRepository
 
-    async def handle(self, query: GetAllChatsListenersQuery) -> ChatListener:
-        # TODO: переделать на 1 запрос, подумать над тем, чтобы вынести listeners в другую колекцию
+    async def handle(self, query: GetAllChatsListenersQuery) -> Iterable[ChatListener]:
         chat = await self.chat_repository.get_chat_by_oid(oid=query.chat_oid)
 
         if not chat:
             raise ChatNotFoundException(chat_oid=query.chat_oid)
 
-        return await self.chat_repository.get_all_chat_listeners(chat_oid=query.chat_oid)
+        return await self.chat_repository.get_all_chat_listeners(chat_oid=query.chat_oid, filters=query.filters)
@@ -1,4 +1,10 @@
-from pydantic import Field
+import socket
+from typing import Literal
+
+from pydantic import (
+    Field,
+    model_validator,
+)
 from pydantic_settings import BaseSettings
 
 
@@ -7,6 +13,60 @@ class Config(BaseSettings):
     mongodb_chat_database: str = Field(default='chat', alias='MONGODB_CHAT_DATABASE')
     mongodb_chat_collection: str = Field(default='chat', alias='MONGODB_CHAT_COLLECTION')
     mongodb_messages_collection: str = Field(default='messages', alias='MONGODB_MESSAGES_COLLECTION')
+    mongodb_messages_counters_collection: str = Field(
+        default='messages_counters',
+        alias='MONGODB_MESSAGES_COUNTERS_COLLECTION',
+    )
+    mongodb_listeners_collection: str = Field(default='chat_listeners', alias='MONGODB_LISTENERS_COLLECTION')
+    mongodb_presence_collection: str = Field(default='websocket_presence', alias='MONGODB_PRESENCE_COLLECTION')
+    mongodb_outbox_collection: str = Field(default='outbox', alias='MONGODB_OUTBOX_COLLECTION')
+    mongodb_ensure_indexes: bool = Field(default=True, alias='MONGODB_ENSURE_INDEXES')
+    # One-off migration for chats written before listeners got their own collection, their listeners stay
+    # invisible until it has run once. It scans the chats collection, so turn it off again afterwards.
+    mongodb_move_embedded_listeners: bool = Field(default=False, alias='MONGODB_MOVE_EMBEDDED_LISTENERS')
+
+    outbox_enabled: bool = Field(default=False, alias='OUTBOX_ENABLED')
+    outbox_relay_batch_size: int = Field(default=100, alias='OUTBOX_RELAY_BATCH_SIZE')
+    outbox_relay_poll_interval_ms: float = Field(default=500, alias='OUTBOX_RELAY_POLL_INTERVAL_MS')
+    outbox_retention_seconds: int = Field(default=24 * 60 * 60, alias='OUTBOX_RETENTION_SECONDS')
+    # Needs a replica set. Without it a crash between the entity write and the outbox write loses the event.
+    outbox_transactions_enabled: bool = Field(default=False, alias='OUTBOX_TRANSACTIONS_ENABLED')
+
+    chats_cache_enabled: bool = Field(default=True, alias='CHATS_CACHE_ENABLED')
+    chats_cache_max_size: int = Field(default=10_000, alias='CHATS_CACHE_MAX_SIZE')
+    chats_cache_ttl_seconds: float = Field(default=60, alias='CHATS_CACHE_TTL_SECONDS')
+
+    websocket_send_queue_size: int = Field(default=100, alias='WEBSOCKET_SEND_QUEUE_SIZE')
+    websocket_max_dropped_messages: int = Field(default=1000, alias='WEBSOCKET_MAX_DROPPED_MESSAGES')
+    websocket_routing_mode: Literal['broadcast', 'local'] = Field(default='broadcast', alias='WEBSOCKET_ROUTING_MODE')
+    websocket_presence_enabled: bool = Field(default=False, alias='WEBSOCKET_PRESENCE_ENABLED')
+    websocket_presence_ttl_seconds: int = Field(default=60, alias='WEBSOCKET_PRESENCE_TTL_SECONDS')
+    websocket_max_connections: int = Field(default=10_000, alias='WEBSOCKET_MAX_CONNECTIONS')
+    websocket_max_connections_per_chat: int = Field(default=1000, alias='WEBSOCKET_MAX_CONNECTIONS_PER_CHAT')
+    # Half-open sockets are closed by uvicorn's protocol pings (--ws-ping-interval, --ws-ping-timeout). The idle
+    # timeout is for clients that answer the {"type": "ping"} heartbeats, listen-only clients would be reaped by it.
+    websocket_heartbeat_interval_seconds: float = Field(default=30, alias='WEBSOCKET_HEARTBEAT_INTERVAL_SECONDS')
+    websocket_idle_timeout_seconds: float = Field(default=0, alias='WEBSOCKET_IDLE_TIMEOUT_SECONDS')
+    websocket_close_timeout_seconds: float = Field(default=5, alias='WEBSOCKET_CLOSE_TIMEOUT_SECONDS')
+    node_id: str = Field(default_factory=socket.gethostname, alias='NODE_ID')
+
+    telegram_notifications_enabled: bool = Field(default=False, alias='TELEGRAM_NOTIFICATIONS_ENABLED')
+    telegram_bot_token: str = Field(default='', alias='TELEGRAM_BOT_TOKEN')
+    telegram_api_url: str = Field(default='https://api.telegram.org', alias='TELEGRAM_API_URL')
+    telegram_rate_limit_per_second: float = Field(default=25, alias='TELEGRAM_RATE_LIMIT_PER_SECOND')
+    telegram_rate_limit_burst: int = Field(default=30, alias='TELEGRAM_RATE_LIMIT_BURST')
+    telegram_max_connections: int = Field(default=20, alias='TELEGRAM_MAX_CONNECTIONS')
+    telegram_request_timeout_seconds: float = Field(default=10, alias='TELEGRAM_REQUEST_TIMEOUT_SECONDS')
+    notifications_consumer_group: str = Field(default='chat-notifications', alias='NOTIFICATIONS_CONSUMER_GROUP')
+    notifications_max_concurrency: int = Field(default=10, alias='NOTIFICATIONS_MAX_CONCURRENCY')
+    notifications_max_retries: int = Field(default=3, alias='NOTIFICATIONS_MAX_RETRIES')
+    notifications_retry_backoff_ms: float = Field(default=500, alias='NOTIFICATIONS_RETRY_BACKOFF_MS')
+    notifications_coalesce_window_ms: float = Field(default=1000, alias='NOTIFICATIONS_COALESCE_WINDOW_MS')
+
+    mediator_dispatch_strategy: Literal['sequential', 'concurrent', 'background'] = Field(
+        default='sequential',
+        alias='MEDIATOR_DISPATCH_STRATEGY',
+    )
 
     new_chats_event_topic: str = Field(default='new-chats-topic')
     new_messages_received_topic: str = Field(default='new-messages')
@@ -14,3 +74,33 @@ class Config(BaseSettings):
     new_listener_added_topic: str = Field(default='listener-added-topic')
 
     kafka_url: str = Field(alias='KAFKA_URL')
+    broker_event_encoding: Literal['json', 'binary'] = Field(default='json', alias='BROKER_EVENT_ENCODING')
+    kafka_producer_linger_ms: int = Field(default=0, alias='KAFKA_PRODUCER_LINGER_MS')
+    kafka_producer_max_batch_size: int = Field(default=16384, alias='KAFKA_PRODUCER_MAX_BATCH_SIZE')
+    kafka_producer_compression_type: Literal['gzip', 'snappy', 'lz4', 'zstd'] | None = Field(
+        default=None,
+        alias='KAFKA_PRODUCER_COMPRESSION_TYPE',
+    )
+    kafka_producer_acks: Literal['all'] | int = Field(default=1, alias='KAFKA_PRODUCER_ACKS')
+    kafka_producer_wait_for_delivery: bool = Field(default=True, alias='KAFKA_PRODUCER_WAIT_FOR_DELIVERY')
+    consumer_workers_count: int = Field(default=8, alias='CONSUMER_WORKERS_COUNT')
+    consumer_max_in_flight: int = Field(default=1000, alias='CONSUMER_MAX_IN_FLIGHT')
+
+    message_write_batching_enabled: bool = Field(default=False, alias='MESSAGE_WRITE_BATCHING_ENABLED')
+    message_write_batch_max_size: int = Field(default=100, alias='MESSAGE_WRITE_BATCH_MAX_SIZE')
+    message_write_batch_max_latency_ms: float = Field(default=5, alias='MESSAGE_WRITE_BATCH_MAX_LATENCY_MS')
+    messages_import_chunk_size: int = Field(default=500, alias='MESSAGES_IMPORT_CHUNK_SIZE')
+    messages_export_batch_size: int = Field(default=1000, alias='MESSAGES_EXPORT_BATCH_SIZE')
+
+    @model_validator(mode='after')
+    def check_outbox_transactions(self) -> 'Config':
+        # A Mongo session can't be shared by concurrent handlers, and batched or background writes leave the command.
+        if self.outbox_transactions_enabled and (
+            self.mediator_dispatch_strategy != 'sequential' or self.message_write_batching_enabled
+        ):
+            raise ValueError(
+                'OUTBOX_TRANSACTIONS_ENABLED needs MEDIATOR_DISPATCH_STRATEGY=sequential '
+                'and MESSAGE_WRITE_BATCHING_ENABLED=false',
+            )
+
+        return self
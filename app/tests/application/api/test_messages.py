@@ -53,3 +53,57 @@ async def test_create_chat_fail_text_empty(
     json_data = responce.json()
 
     assert json_data['detail']['error']
+
+
+@pytest.mark.asyncio
+async def test_get_chat_messages_fail_invalid_cursor(
+    app: FastAPI,
+    client: TestClient,
+    faker: Faker,
+):
+    url = app.url_path_for('get_chat_messages_handler', chat_oid=faker.uuid4())
+    responce: Response = client.get(url=url, params={'before': 'not-a-cursor'})
+
+    assert responce.status_code == status.HTTP_400_BAD_REQUEST, responce.json()
+    json_data = responce.json()
+
+    assert json_data['detail']['error']
+
+
+@pytest.mark.asyncio
+async def test_create_messages_batch_fail_chat_not_found(
+    app: FastAPI,
+    client: TestClient,
+    faker: Faker,
+):
+    url = app.url_path_for('create_messages_batch_handler', chat_oid=faker.uuid4())
+    responce: Response = client.post(url=url, json={'texts': [faker.text()]})
+
+    assert responce.status_code == status.HTTP_400_BAD_REQUEST, responce.json()
+    json_data = responce.json()
+
+    assert json_data['detail']['error']
+
+
+@pytest.mark.asyncio
+async def test_export_chat_messages_fail_chat_not_found(
+    app: FastAPI,
+    client: TestClient,
+    faker: Faker,
+):
+    url = app.url_path_for('export_chat_messages_handler', chat_oid=faker.uuid4())
+    responce: Response = client.get(url=url)
+
+    assert responce.status_code == status.HTTP_400_BAD_REQUEST, responce.json()
+    json_data = responce.json()
+
+    assert json_data['detail']['error']
+
+
+def test_websocket_to_missing_chat_is_closed(
+    app: FastAPI,
+    client: TestClient,
+):
+    with client.websocket_connect('/chats/missing/') as websocket:
+        assert websocket.receive_json() == {'error': 'Chat not found'}
+        assert websocket.receive()['type'] == 'websocket.close'
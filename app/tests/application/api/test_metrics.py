@@ -0,0 +1,19 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import pytest
+from httpx import Response
+
+
+@pytest.mark.asyncio
+async def test_get_metrics_success(
+    app: FastAPI,
+    client: TestClient,
+):
+    url = app.url_path_for('get_metrics_handler')
+    responce: Response = client.get(url=url)
+
+    assert responce.is_success
+    json_data = responce.json()
+
+    assert json_data['chats_cache']['size'] == 0
@@ -77,3 +77,26 @@ def test_new_message_events():
     assert new_event.message_oid == message.oid
     assert new_event.message_text == message.text.as_generic_type()
     assert new_event.chat_oid == chat.oid
+
+
+def test_hydrate_message_skips_defaults_and_validation():
+    created_at = datetime(2024, 1, 1)
+    message = Message.hydrate(oid='oid', created_at=created_at, chat_oid='chat', text=Text.trusted(''))
+
+    assert message.oid == 'oid'
+    assert message.created_at == created_at
+    assert message.text.as_generic_type() == ''
+    assert not message.pull_events()
+    assert not hasattr(message, '__dict__')
+
+
+def test_hydrated_chat_registers_events():
+    chat = Chat.hydrate(oid='oid', created_at=datetime(2024, 1, 1), title=Title.trusted('title'), listeners=set())
+    message = Message(text=Text('hello'), chat_oid=chat.oid)
+    chat.add_message(message)
+
+    events = chat.pull_events()
+
+    assert message in chat.messages
+    assert [event.message_oid for event in events] == [message.oid]
+    assert not chat.pull_events()
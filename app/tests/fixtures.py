@@ -1,15 +1,7 @@
-from punq import (
-    Container,
-    Scope,
-)
+from punq import Container
 
-from infra.repositories.messages.base import BaseChatsRepository
-from infra.repositories.messages.memory import MemoryChatRepository
-from logic.init import _init_container
+from logic.init import init_memory_container
 
 
 def init_dummy_container() -> Container:
-    container = _init_container()
-    container.register(BaseChatsRepository, MemoryChatRepository, scope=Scope.singleton)
-
-    return container
+    return init_memory_container()
@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+from infra.batching import Batcher
+
+
+@pytest.mark.asyncio
+async def test_batcher_flushes_full_batches_together():
+    flushed_batches = []
+
+    async def flush(items: list[int]) -> None:
+        flushed_batches.append(items)
+
+    batcher = Batcher(flush=flush, max_batch_size=3, max_latency=10)
+    await asyncio.gather(*(batcher.submit(item) for item in range(6)))
+
+    assert flushed_batches == [[0, 1, 2], [3, 4, 5]]
+
+
+@pytest.mark.asyncio
+async def test_batcher_flushes_after_max_latency():
+    flushed_batches = []
+
+    async def flush(items: list[int]) -> None:
+        flushed_batches.append(items)
+
+    batcher = Batcher(flush=flush, max_batch_size=100, max_latency=0.001)
+    await asyncio.gather(batcher.submit(1), batcher.submit(2))
+
+    assert flushed_batches == [[1, 2]]
+
+
+@pytest.mark.asyncio
+async def test_batcher_propagates_flush_errors():
+    async def flush(items: list[int]) -> None:
+        raise RuntimeError('flush failed')
+
+    batcher = Batcher(flush=flush, max_batch_size=2, max_latency=10)
+    results = await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
@@ -0,0 +1,46 @@
+import pytest
+from faker import Faker
+
+from domain.entities.messages import Chat
+from domain.values.messages import Title
+from infra.caches import LRUTTLCache
+from infra.repositories.messages.cached import CachedChatsRepository
+from infra.repositories.messages.memory import MemoryChatRepository
+
+
+def test_cache_evicts_least_recently_used():
+    cache = LRUTTLCache(max_size=2)
+    cache.set('first', 1)
+    cache.set('second', 2)
+    cache.get('first')
+    cache.set('third', 3)
+
+    assert cache.get('second') is None
+    assert cache.get('first') == 1
+    assert cache.stats == {'hits': 2, 'misses': 1, 'size': 2}
+
+
+def test_cache_expires_items_after_ttl():
+    now = 0.0
+    cache = LRUTTLCache(ttl=10, clock=lambda: now)
+    cache.set('key', 'value')
+
+    now = 11.0
+
+    assert cache.get('key') is None
+
+
+@pytest.mark.asyncio
+async def test_cached_chats_repository_invalidates_on_delete(faker: Faker):
+    chats_repository = MemoryChatRepository()
+    cached_repository = CachedChatsRepository(chats_repository=chats_repository, cache=LRUTTLCache())
+    chat = Chat(title=Title(faker.text(max_nb_chars=50)))
+    await chats_repository.add_chat(chat)
+
+    first, second = await cached_repository.get_chat_by_oid(chat.oid), await cached_repository.get_chat_by_oid(chat.oid)
+    await cached_repository.delete_chat_by_oid(chat.oid)
+
+    assert first == second == chat
+    assert first is not second
+    assert cached_repository.cache_stats['hits'] == 1
+    assert await cached_repository.get_chat_by_oid(chat.oid) is None
@@ -0,0 +1,82 @@
+from datetime import (
+    datetime,
+    timezone,
+)
+
+import orjson
+import pytest
+
+from domain.events.messages import (
+    ChatDeletedEvent,
+    ListenerAddedEvent,
+    NewChatCreatedEvent,
+    NewMessageReceivedEvent,
+)
+from infra.message_brokers.base import BrokerRecord
+from infra.message_brokers.codecs import (
+    BINARY_CONTENT_TYPE,
+    BinaryEventCodec,
+    EVENT_SCHEMAS,
+    EventCodecRegistry,
+    EventSchema,
+    JSON_CONTENT_TYPE,
+)
+
+
+EVENTS = (
+    NewMessageReceivedEvent(
+        message_text='привет 👋',
+        message_oid='1b2b1f4e-3c2a-4d3e-9f0a-5b6c7d8e9f00',
+        chat_oid='chat',
+    ),
+    NewChatCreatedEvent(chat_oid='0e6a7c1d-2b3c-4d5e-8f90-a1b2c3d4e5f6', chat_title='Title'),
+    ChatDeletedEvent(chat_oid='chat'),
+    ListenerAddedEvent(listener_oid='12345'),
+    ChatDeletedEvent(chat_oid='chat', occurred_at=datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)),
+)
+
+
+def encode_as_record(registry: EventCodecRegistry, event) -> BrokerRecord:
+    value, headers = registry.encode(event)
+
+    return BrokerRecord(topic='topic', key=None, value=value, headers=headers)
+
+
+def test_every_broker_event_has_a_schema():
+    assert {schema.event_type for schema in EVENT_SCHEMAS} == {event.__class__ for event in EVENTS}
+
+
+@pytest.mark.parametrize('event', EVENTS)
+def test_binary_codec_round_trips_to_what_json_consumers_see(event):
+    json_registry = EventCodecRegistry()
+    binary_registry = EventCodecRegistry(default_content_type=BINARY_CONTENT_TYPE)
+    json_record = encode_as_record(json_registry, event)
+    binary_record = encode_as_record(binary_registry, event)
+
+    assert binary_record.get_header('content-type') == BINARY_CONTENT_TYPE.encode()
+    assert binary_record.get_header('event-type') == event.__class__.__name__.encode()
+    assert len(binary_record.value) < len(json_record.value)
+    assert binary_registry.decode(binary_record) == json_registry.decode(json_record)
+    assert json_registry.decode(json_record) == orjson.loads(orjson.dumps(event))
+    assert orjson.loads(binary_registry.to_json(binary_record)) == orjson.loads(json_record.value)
+
+
+def test_json_records_are_relayed_untouched_and_legacy_records_are_json():
+    registry = EventCodecRegistry()
+    record = encode_as_record(registry, ChatDeletedEvent(chat_oid='chat'))
+    legacy_record = BrokerRecord(topic='topic', key=b'chat', value=record.value)
+
+    assert registry.to_json(record) is record.value
+    assert registry.get_content_type(legacy_record) == JSON_CONTENT_TYPE
+    assert registry.decode(legacy_record)['chat_oid'] == 'chat'
+
+
+def test_binary_decoder_skips_fields_of_newer_schema_versions():
+    event = ChatDeletedEvent(chat_oid='chat')
+    newer_schema = EventSchema(event_type=ChatDeletedEvent, version=2, fields=('event_id', 'occurred_at', 'chat_oid'))
+    older_schema = EventSchema(event_type=ChatDeletedEvent, version=1, fields=('event_id', 'occurred_at'))
+    codec = BinaryEventCodec()
+
+    decoded = codec.decode(codec.encode(event, newer_schema), older_schema)
+
+    assert decoded == {'event_id': str(event.event_id), 'occurred_at': event.occurred_at.isoformat()}
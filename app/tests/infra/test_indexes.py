@@ -0,0 +1,58 @@
+from dataclasses import (
+    dataclass,
+    field,
+)
+
+import pytest
+
+from infra.repositories.indexes import IndexSpec
+from infra.repositories.mongo import (
+    BaseMongoDBRepository,
+    MongoDBIndexManager,
+)
+
+
+@dataclass
+class DummyCollection:
+    name: str
+    indexes_map: dict[str, dict] = field(default_factory=dict)
+
+    async def index_information(self) -> dict[str, dict]:
+        return dict(self.indexes_map)
+
+    async def create_index(self, keys: list[tuple[str, int]], unique: bool, name: str) -> str:
+        self.indexes_map[name] = {'key': keys, 'unique': unique}
+        return name
+
+
+@dataclass
+class DummyRepository(BaseMongoDBRepository):
+    indexes = (
+        IndexSpec.on('oid', unique=True),
+        IndexSpec.on('chat_oid', 'created_at'),
+    )
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_creates_missing_and_reports_extra():
+    collection = DummyCollection(
+        name='messages',
+        indexes_map={
+            '_id_': {'key': [('_id', 1)]},
+            'text_1': {'key': [('text', 1)]},
+            'oid_1': {'key': [('oid', 1)], 'unique': True},
+        },
+    )
+    repository = DummyRepository(
+        mongo_db_client={'chat': {'messages': collection}},
+        mongo_db_db_name='chat',
+        mongo_db_collection_name='messages',
+    )
+
+    report, = await MongoDBIndexManager(repositories=[repository]).ensure_indexes()
+
+    assert report.missing == ['chat_oid_1_created_at_1']
+    assert report.created == ['chat_oid_1_created_at_1']
+    assert report.extra == ['text_1']
+    assert report.is_consistent
+    assert collection.indexes_map['chat_oid_1_created_at_1']['key'] == [('chat_oid', 1), ('created_at', 1)]
@@ -0,0 +1,102 @@
+import asyncio
+from dataclasses import dataclass
+
+import pytest
+
+from infra.message_brokers.base import BrokerRecord
+from infra.message_brokers.kafka import KafkaMessageBroker
+
+
+class DummyProducer:
+    def __init__(self):
+        self.delivery_futures: list[asyncio.Future] = []
+        self.is_stopped = False
+
+    async def send(self, key: bytes, topic: str, value: bytes, headers: list | None = None) -> asyncio.Future:
+        delivery_future = asyncio.get_running_loop().create_future()
+        self.delivery_futures.append(delivery_future)
+
+        return delivery_future
+
+    async def stop(self):
+        self.is_stopped = True
+
+
+@dataclass
+class DummyRecord:
+    key: bytes | None
+    value: bytes
+    topic: str = 'topic'
+    partition: int = 0
+    offset: int = 0
+    headers: tuple[tuple[str, bytes], ...] = ()
+
+
+class DummyConsumer:
+    def __init__(self, records: list[DummyRecord]):
+        self.records = records
+
+    async def start(self):
+        ...
+
+    def subscribe(self, topics: list[str]):
+        ...
+
+    def highwater(self, partition) -> int:
+        return len(self.records)
+
+    async def __aiter__(self):
+        for record in self.records:
+            yield record
+
+
+@pytest.mark.asyncio
+async def test_kafka_broker_waits_for_delivery():
+    producer = DummyProducer()
+    message_broker = KafkaMessageBroker(producer=producer, consumer_factory=lambda group_id: None)
+
+    send_task = asyncio.create_task(message_broker.send_message(key=b'key', topic='topic', value=b'{}'))
+    await asyncio.sleep(0)
+
+    assert not send_task.done()
+
+    producer.delivery_futures[0].set_result(None)
+    await send_task
+
+
+@pytest.mark.asyncio
+async def test_kafka_broker_tracks_deliveries_in_background():
+    producer = DummyProducer()
+    message_broker = KafkaMessageBroker(
+        producer=producer,
+        consumer_factory=lambda group_id: None,
+        wait_for_delivery=False,
+    )
+
+    await message_broker.send_message(key=b'key', topic='topic', value=b'{}')
+
+    assert len(message_broker.pending_deliveries) == 1
+
+    producer.delivery_futures[0].set_exception(RuntimeError('delivery failed'))
+    await message_broker.close()
+
+    assert not message_broker.pending_deliveries
+    assert producer.is_stopped
+
+
+@pytest.mark.asyncio
+async def test_kafka_broker_yields_records_without_decoding_them():
+    consumer = DummyConsumer([
+        DummyRecord(key=b'chat', value=b'not json', headers=(('content-type', b'application/json'),)),
+        DummyRecord(key=None, value=b'{}', offset=1),
+    ])
+    message_broker = KafkaMessageBroker(producer=DummyProducer(), consumer_factory=lambda group_id: consumer)
+
+    records = [record async for record in message_broker.start_consuming_records('topic')]
+
+    assert records == [
+        BrokerRecord(topic='topic', key=b'chat', value=b'not json', headers=(('content-type', b'application/json'),)),
+        BrokerRecord(topic='topic', key=None, value=b'{}'),
+    ]
+    assert records[0].get_header('content-type') == b'application/json'
+    assert message_broker.get_consumer_lag('topic') == 0
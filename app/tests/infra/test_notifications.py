@@ -0,0 +1,109 @@
+import httpx
+import pytest
+
+from infra.integrations.notifications.clients.telegram import TelegramNotificationClient
+from infra.integrations.notifications.delivery import NotificationDeliveryWorker
+from infra.integrations.notifications.dtos import Notification
+from infra.integrations.notifications.exceptions import NotificationDeliveryException
+from infra.rate_limiting import TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def create_telegram_client(handler) -> TelegramNotificationClient:
+    return TelegramNotificationClient(
+        bot_token='token',
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        send_url='http://telegram.test',
+    )
+
+
+def test_token_bucket_allows_bursts_then_spaces_out_acquisitions():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, capacity=2, clock=clock)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1)
+    assert bucket.reserve() == pytest.approx(0.2)
+
+    clock.now = 1
+    assert bucket.reserve() == 0
+
+
+@pytest.mark.asyncio
+async def test_telegram_client_posts_message_to_bot():
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={'ok': True})
+
+    client = create_telegram_client(handler)
+    await client.send(Notification(recipient_id='42', title='chat', text='hello'))
+
+    request, = requests
+    assert request.method == 'POST'
+    assert request.url == 'http://telegram.test/bottoken/sendMessage'
+    assert request.content == b'{"chat_id": "42", "text": "chat\\nhello"}'
+
+
+@pytest.mark.asyncio
+async def test_telegram_client_reports_retry_after_when_throttled():
+    client = create_telegram_client(
+        lambda request: httpx.Response(429, json={'ok': False, 'parameters': {'retry_after': 3}}),
+    )
+
+    with pytest.raises(NotificationDeliveryException) as error:
+        await client.send(Notification(recipient_id='42', title='chat', text='hello'))
+
+    assert error.value.retry_after == 3
+    assert error.value.is_retryable
+
+
+@pytest.mark.asyncio
+async def test_delivery_worker_coalesces_bursts_per_recipient():
+    texts: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        texts.append(request.read().decode())
+        return httpx.Response(200, json={'ok': True})
+
+    worker = NotificationDeliveryWorker(client=create_telegram_client(handler), coalesce_window=60)
+
+    for text in ('first', 'second'):
+        worker.submit(Notification(recipient_id='1', title='chat', text=text))
+    worker.submit(Notification(recipient_id='2', title='chat', text='third'))
+
+    await worker.close()
+
+    assert sorted(texts) == [
+        '{"chat_id": "1", "text": "chat\\nfirst\\nsecond"}',
+        '{"chat_id": "2", "text": "chat\\nthird"}',
+    ]
+    assert worker.stats == {'delivered': 2, 'failed': 0, 'pending': 0, 'in_flight': 0}
+
+
+@pytest.mark.asyncio
+async def test_delivery_worker_retries_server_errors_but_not_bad_requests():
+    status_codes = {'1': [503, 503, 200], '2': [400, 200]}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        chat_id = request.read().decode().split('"')[3]
+        return httpx.Response(status_codes[chat_id].pop(0), json={})
+
+    worker = NotificationDeliveryWorker(client=create_telegram_client(handler), coalesce_window=0, retry_backoff=0)
+
+    worker.submit(Notification(recipient_id='1', title='chat', text='hello'))
+    worker.submit(Notification(recipient_id='2', title='chat', text='hello'))
+    await worker.close()
+
+    assert status_codes == {'1': [], '2': [200]}
+    assert worker.delivered == 1
+    assert worker.failed == 1
@@ -0,0 +1,117 @@
+import asyncio
+from datetime import (
+    datetime,
+    timezone,
+)
+
+import pytest
+
+from infra.message_brokers.memory import MemoryMessageBroker
+from infra.message_brokers.outbox import (
+    OutboxMessageBroker,
+    OutboxRelay,
+)
+from infra.repositories.outbox.base import (
+    BaseOutboxRepository,
+    OutboxMessage,
+)
+from infra.repositories.outbox.memory import MemoryOutboxRepository
+from infra.repositories.transactions import NullTransactionManager
+from logic.init import init_memory_container
+
+
+class FailingMessageBroker(MemoryMessageBroker):
+    async def send_message(self, key: bytes, topic: str, value: bytes, headers: tuple = ()):
+        raise RuntimeError('broker is down')
+
+
+@pytest.mark.asyncio
+async def test_outbox_relay_sends_pending_messages_once():
+    outbox_repository = MemoryOutboxRepository()
+    message_broker = MemoryMessageBroker()
+    relay = OutboxRelay(outbox_repository=outbox_repository, message_broker=message_broker)
+    outbox_broker = OutboxMessageBroker(
+        message_broker=message_broker,
+        outbox_repository=outbox_repository,
+        relay=relay,
+    )
+
+    await outbox_broker.send_message(key=b'chat', topic='topic', value=b'{}')
+
+    assert message_broker.sent_messages == []
+    assert await relay.relay_pending_messages() == 1
+    assert message_broker.sent_messages == [('topic', b'chat', b'{}')]
+    assert await relay.relay_pending_messages() == 0
+
+
+@pytest.mark.asyncio
+async def test_outbox_relay_retries_failed_messages_later():
+    outbox_repository = MemoryOutboxRepository()
+    relay = OutboxRelay(outbox_repository=outbox_repository, message_broker=FailingMessageBroker())
+    outbox_broker = OutboxMessageBroker(
+        message_broker=relay.message_broker,
+        outbox_repository=outbox_repository,
+        relay=relay,
+    )
+
+    await outbox_broker.send_message(key=b'chat', topic='topic', value=b'{}')
+
+    assert await relay.relay_pending_messages() == 0
+
+    message, = outbox_repository._saved_messages.values()
+    assert message.attempts == 1
+    assert message.sent_at is None
+    assert message.available_at > datetime.now(timezone.utc)
+
+
+class UnackedProducer:
+    def __init__(self):
+        self.delivery_futures: list[asyncio.Future] = []
+
+    async def send(self, key: bytes, topic: str, value: bytes, headers: list | None = None) -> asyncio.Future:
+        delivery_future = asyncio.get_running_loop().create_future()
+        self.delivery_futures.append(delivery_future)
+
+        return delivery_future
+
+
+@pytest.mark.asyncio
+async def test_outbox_relay_waits_for_kafka_acks_without_waiting_producer(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv('OUTBOX_ENABLED', 'true')
+    monkeypatch.setenv('KAFKA_PRODUCER_WAIT_FOR_DELIVERY', 'false')
+    container = init_memory_container()
+    outbox_repository = MemoryOutboxRepository()
+    container.register(BaseOutboxRepository, instance=outbox_repository)
+    relay: OutboxRelay = container.resolve(OutboxRelay)
+    producer = relay.message_broker.producer = UnackedProducer()
+
+    await outbox_repository.add_messages([OutboxMessage(topic='topic', key=b'chat', value=b'{}')])
+    relay_task = asyncio.create_task(relay.relay_pending_messages())
+    await asyncio.sleep(0.01)
+
+    message, = outbox_repository._saved_messages.values()
+    assert not relay_task.done()
+    assert message.sent_at is None
+
+    producer.delivery_futures[0].set_exception(RuntimeError('delivery failed'))
+
+    assert await relay_task == 0
+    assert message.sent_at is None
+    assert message.attempts == 1
+
+
+@pytest.mark.asyncio
+async def test_outbox_relay_is_woken_after_command_commits():
+    outbox_repository = MemoryOutboxRepository()
+    relay = OutboxRelay(outbox_repository=outbox_repository, message_broker=MemoryMessageBroker())
+    outbox_broker = OutboxMessageBroker(
+        message_broker=relay.message_broker,
+        outbox_repository=outbox_repository,
+        relay=relay,
+    )
+
+    async with NullTransactionManager().transaction():
+        await outbox_broker.send_message(key=b'chat', topic='topic', value=b'{}')
+        assert not relay._wake_up_event.is_set()
+
+    assert relay._wake_up_event.is_set()
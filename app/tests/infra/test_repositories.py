@@ -0,0 +1,29 @@
+import pytest
+from faker import Faker
+from pymongo.errors import DuplicateKeyError
+
+from domain.entities.messages import Chat
+from domain.values.messages import Title
+from infra.repositories.messages.mongo import MongoDBChatsRepository
+from logic.exceptions.messages import ChatWithThatTitleAlreadyExistException
+
+
+class DuplicateTitleCollection:
+    async def insert_one(self, document: dict, session=None) -> None:
+        raise DuplicateKeyError('E11000 duplicate key error collection: chat.chats index: title_1')
+
+
+@pytest.mark.asyncio
+async def test_add_chat_with_taken_title_raises_title_exception(faker: Faker):
+    repository = MongoDBChatsRepository(
+        mongo_db_client={'chat': {'chats': DuplicateTitleCollection()}},
+        mongo_db_db_name='chat',
+        mongo_db_collection_name='chats',
+        mongo_db_listeners_collection_name='chat_listeners',
+    )
+    title = faker.text(max_nb_chars=50)
+
+    with pytest.raises(ChatWithThatTitleAlreadyExistException) as exception_info:
+        await repository.add_chat(Chat(title=Title(title)))
+
+    assert exception_info.value.title == title
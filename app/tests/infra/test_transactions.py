@@ -0,0 +1,89 @@
+import pytest
+from pydantic import ValidationError
+
+from infra.repositories.transactions import (
+    call_after_commit,
+    get_current_session,
+    MongoDBTransactionManager,
+)
+from settings.config import Config
+
+
+class DummySession:
+    def __init__(self):
+        self.is_committed = False
+        self.is_aborted = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        ...
+
+    def start_transaction(self) -> 'DummySession':
+        return DummyTransaction(self)
+
+
+class DummyTransaction:
+    def __init__(self, session: DummySession):
+        self.session = session
+
+    async def __aenter__(self):
+        ...
+
+    async def __aexit__(self, exception_type, *args):
+        self.session.is_committed = exception_type is None
+        self.session.is_aborted = exception_type is not None
+
+
+class DummyMongoClient:
+    def __init__(self):
+        self.sessions: list[DummySession] = []
+
+    async def start_session(self) -> DummySession:
+        self.sessions.append(DummySession())
+        return self.sessions[-1]
+
+
+@pytest.mark.asyncio
+async def test_writes_share_one_session_and_callbacks_wait_for_commit():
+    client = DummyMongoClient()
+    transaction_manager = MongoDBTransactionManager(mongo_db_client=client)
+    called = []
+
+    async with transaction_manager.transaction():
+        session = get_current_session()
+
+        async with transaction_manager.transaction():
+            assert get_current_session() is session
+
+        await call_after_commit(lambda: called.append(session.is_committed))
+        assert called == []
+
+    assert called == [True]
+    assert client.sessions == [session]
+    assert get_current_session() is None
+
+
+@pytest.mark.asyncio
+async def test_failed_transaction_is_aborted_without_callbacks():
+    client = DummyMongoClient()
+    transaction_manager = MongoDBTransactionManager(mongo_db_client=client)
+    called = []
+
+    with pytest.raises(RuntimeError):
+        async with transaction_manager.transaction():
+            await call_after_commit(lambda: called.append(True))
+            raise RuntimeError('write failed')
+
+    session, = client.sessions
+    assert session.is_aborted
+    assert called == []
+
+
+def test_outbox_transactions_need_sequential_unbatched_writes(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv('OUTBOX_TRANSACTIONS_ENABLED', 'true')
+    monkeypatch.setenv('MEDIATOR_DISPATCH_STRATEGY', 'concurrent')
+
+    with pytest.raises(ValidationError):
+        Config()
@@ -0,0 +1,208 @@
+import asyncio
+from dataclasses import (
+    dataclass,
+    field,
+)
+
+import pytest
+
+from infra.repositories.presence.memory import MemoryPresenceRepository
+from infra.websockets.exceptions import ConnectionLimitExceededException
+from infra.websockets.managers import ConnectionManager
+
+
+@dataclass(eq=False)
+class DummyWebSocket:
+    send_delay: float = 0
+    is_broken: bool = False
+    received: list[bytes | str] = field(default_factory=list)
+    messages: list[dict] = field(default_factory=list)
+    is_closed: bool = False
+
+    async def accept(self):
+        ...
+
+    async def send(self, message: dict):
+        if self.is_broken:
+            raise RuntimeError('Connection is closed')
+
+        # Only broadcasts are slow to read, the goodbye frame of disconnect_all is not.
+        if 'bytes' in message:
+            await asyncio.sleep(self.send_delay)
+
+        self.messages.append(message)
+        self.received.append(message.get('bytes') or message.get('text'))
+
+    async def close(self, code: int = 1000, reason: str | None = None):
+        self.is_closed = True
+
+
+@pytest.mark.asyncio
+async def test_send_all_is_not_blocked_by_slow_consumer():
+    connection_manager = ConnectionManager()
+    slow_websocket, fast_websocket = DummyWebSocket(send_delay=10), DummyWebSocket()
+    await connection_manager.accept_connection(websocket=slow_websocket, key='chat')
+    await connection_manager.accept_connection(websocket=fast_websocket, key='chat')
+
+    await asyncio.wait_for(connection_manager.send_all(key='chat', bytes_=b'message'), timeout=1)
+    await asyncio.sleep(0.01)
+
+    assert fast_websocket.received == [b'message']
+    await connection_manager.disconnect_all(key='chat')
+
+
+@pytest.mark.asyncio
+async def test_send_all_removes_broken_connection():
+    connection_manager = ConnectionManager()
+    broken_websocket, websocket = DummyWebSocket(is_broken=True), DummyWebSocket()
+    await connection_manager.accept_connection(websocket=broken_websocket, key='chat')
+    await connection_manager.accept_connection(websocket=websocket, key='chat')
+
+    await connection_manager.send_all(key='chat', bytes_=b'message')
+    await asyncio.sleep(0.01)
+
+    assert connection_manager.connections_map['chat'] == [websocket]
+    assert websocket.received == [b'message']
+    await connection_manager.disconnect_all(key='chat')
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_is_disconnected_after_drop_threshold():
+    connection_manager = ConnectionManager(send_queue_size=1, max_dropped_messages=2)
+    slow_websocket = DummyWebSocket(send_delay=10)
+    await connection_manager.accept_connection(websocket=slow_websocket, key='chat')
+
+    for _ in range(4):
+        await connection_manager.send_all(key='chat', bytes_=b'message')
+
+    assert slow_websocket.is_closed
+    assert not connection_manager.connections_map['chat']
+
+
+@pytest.mark.asyncio
+async def test_consumer_that_catches_up_is_not_disconnected_by_occasional_drops():
+    connection_manager = ConnectionManager(send_queue_size=1, max_dropped_messages=2)
+    lagging_websocket = DummyWebSocket(send_delay=0.01)
+    await connection_manager.accept_connection(websocket=lagging_websocket, key='chat')
+
+    for _ in range(3):
+        for _ in range(2):
+            await connection_manager.send_all(key='chat', bytes_=b'message')
+
+        await asyncio.sleep(0.05)
+
+    assert not lagging_websocket.is_closed
+    assert connection_manager.connections_map['chat'] == [lagging_websocket]
+    assert lagging_websocket.received == [b'message'] * 3
+    await connection_manager.disconnect_all(key='chat')
+
+
+@pytest.mark.asyncio
+async def test_presence_follows_first_and_last_connection_of_chat():
+    presence_repository = MemoryPresenceRepository()
+    connection_manager = ConnectionManager(presence_repository=presence_repository, node_id='node')
+    first_websocket, second_websocket = DummyWebSocket(), DummyWebSocket()
+
+    await connection_manager.accept_connection(websocket=first_websocket, key='chat')
+    await connection_manager.accept_connection(websocket=second_websocket, key='chat')
+    assert await presence_repository.get_chat_nodes('chat') == {'node'}
+    assert connection_manager.has_connections('chat')
+
+    await connection_manager.remove_connection(websocket=first_websocket, key='chat')
+    assert await presence_repository.get_chat_nodes('chat') == {'node'}
+
+    await connection_manager.remove_connection(websocket=second_websocket, key='chat')
+    assert await presence_repository.get_chat_nodes('chat') == set()
+    assert not connection_manager.has_connections('chat')
+
+
+@pytest.mark.asyncio
+async def test_broadcast_frames_are_encoded_once_for_all_subscribers():
+    connection_manager = ConnectionManager()
+    websockets = [DummyWebSocket() for _ in range(3)]
+
+    for websocket in websockets:
+        await connection_manager.accept_connection(websocket=websocket, key='chat')
+
+    await connection_manager.send_all(key='chat', bytes_=b'message')
+    await asyncio.sleep(0.01)
+    await connection_manager.disconnect_all(key='chat')
+
+    first_websocket, *other_websockets = websockets
+    assert first_websocket.received == [b'message', '{"message":"Chat has been deleted"}']
+
+    for websocket in other_websockets:
+        assert all(
+            message is first_message for message, first_message in zip(websocket.messages, first_websocket.messages)
+        )
+        assert websocket.is_closed
+
+
+@pytest.mark.asyncio
+async def test_connections_over_capacity_are_rejected():
+    connection_manager = ConnectionManager(max_connections=3, max_connections_per_chat=2)
+
+    for key in ('first', 'first', 'second'):
+        await connection_manager.accept_connection(websocket=DummyWebSocket(), key=key)
+
+    with pytest.raises(ConnectionLimitExceededException):
+        await connection_manager.accept_connection(websocket=DummyWebSocket(), key='first')
+
+    with pytest.raises(ConnectionLimitExceededException):
+        await connection_manager.accept_connection(websocket=DummyWebSocket(), key='third')
+
+    assert connection_manager.stats['connections'] == 3
+    assert connection_manager.stats['rejected'] == 2
+    assert 'third' not in connection_manager.connections_map
+    await connection_manager.disconnect_all(key='first')
+    await connection_manager.disconnect_all(key='second')
+
+
+@pytest.mark.asyncio
+async def test_empty_chats_and_their_locks_are_released():
+    connection_manager = ConnectionManager()
+    websockets = [DummyWebSocket() for _ in range(3)]
+
+    for websocket in websockets:
+        await connection_manager.accept_connection(websocket=websocket, key='chat')
+
+    await asyncio.gather(
+        *(connection_manager.remove_connection(websocket=websocket, key='chat') for websocket in websockets),
+    )
+
+    assert connection_manager.connections_map == {}
+    assert connection_manager.lock_map == {}
+    assert connection_manager.senders_map == {}
+
+
+@pytest.mark.asyncio
+async def test_heartbeats_ping_live_connections_and_reap_idle_ones():
+    now = 0
+    connection_manager = ConnectionManager(idle_timeout=60, clock=lambda: now)
+    idle_websocket, live_websocket = DummyWebSocket(), DummyWebSocket()
+    await connection_manager.accept_connection(websocket=idle_websocket, key='chat')
+    await connection_manager.accept_connection(websocket=live_websocket, key='chat')
+
+    now = 61
+    connection_manager.mark_alive(live_websocket)
+    await connection_manager.send_heartbeats()
+    await asyncio.sleep(0.01)
+
+    assert idle_websocket.is_closed
+    assert connection_manager.connections_map['chat'] == [live_websocket]
+    assert live_websocket.received == ['{"type":"ping"}']
+    assert connection_manager.stats['reaped'] == 1
+    await connection_manager.disconnect_all(key='chat')
+
+
+@pytest.mark.asyncio
+async def test_disconnect_all_does_not_wait_for_stuck_connections():
+    connection_manager = ConnectionManager(close_timeout=0.01)
+    stuck_websocket, websocket = DummyWebSocket(), DummyWebSocket()
+    await connection_manager.accept_connection(websocket=stuck_websocket, key='chat')
+    await connection_manager.accept_connection(websocket=websocket, key='chat')
+    stuck_websocket.close = lambda **kwargs: asyncio.sleep(10)
+
+    await asyncio.wait_for(connection_manager.disconnect_all(key='chat'), timeout=1)
+
+    assert websocket.is_closed
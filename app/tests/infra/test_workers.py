@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+from infra.workers import KeyedWorkerPool
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_keeps_order_per_key():
+    handled = []
+
+    async def handle(item: tuple[str, int]):
+        await asyncio.sleep(0)
+        handled.append(item)
+
+    worker_pool = KeyedWorkerPool(handle=handle, workers_count=4, max_in_flight=8)
+    worker_pool.start()
+
+    for number in range(20):
+        for key in ('first', 'second', 'third'):
+            await worker_pool.submit(key=key, item=(key, number))
+
+    await worker_pool.join()
+    await worker_pool.close()
+
+    for key in ('first', 'second', 'third'):
+        assert [number for item_key, number in handled if item_key == key] == list(range(20))
+
+    assert worker_pool.metrics.processed == 60
+    assert worker_pool.metrics.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_survives_handler_errors():
+    async def handle(item: int):
+        if item % 2:
+            raise ValueError(item)
+
+    worker_pool = KeyedWorkerPool(handle=handle, workers_count=2)
+    worker_pool.start()
+
+    for number in range(4):
+        await worker_pool.submit(key=str(number), item=number)
+
+    await worker_pool.join()
+    await worker_pool.close()
+
+    assert worker_pool.metrics.processed == 2
+    assert worker_pool.metrics.failed == 2
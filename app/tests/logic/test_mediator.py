@@ -0,0 +1,97 @@
+import asyncio
+import time
+from dataclasses import dataclass
+
+import pytest
+from punq import Container
+
+from domain.events.base import BaseEvent
+from domain.exceptions.base import ApplicationException
+from logic.events.base import EventHandler
+from logic.exceptions.mediator import EventHandlersFailedException
+from logic.mediator.base import (
+    DispatchStrategy,
+    Mediator,
+)
+from logic.mediator.event import EventMediator
+
+
+@dataclass
+class DummyEvent(BaseEvent):
+    delay: float = 0
+    error: str | None = None
+
+
+@dataclass
+class DummyEventHandler(EventHandler[DummyEvent, float]):
+    async def handle(self, event: DummyEvent) -> float:
+        await asyncio.sleep(event.delay)
+
+        if event.error:
+            raise ValueError(event.error)
+
+        return event.delay
+
+
+def create_mediator(dispatch_strategy: DispatchStrategy) -> Mediator:
+    mediator = Mediator(dispatch_strategy=dispatch_strategy)
+    mediator.register_event(
+        DummyEvent,
+        [DummyEventHandler(message_broker=None, connection_manager=None) for _ in range(3)],
+    )
+
+    return mediator
+
+
+@pytest.mark.asyncio
+async def test_concurrent_publish_waits_for_slowest_handler():
+    mediator = create_mediator(DispatchStrategy.concurrent)
+
+    started_at = time.perf_counter()
+    results = await mediator.publish([DummyEvent(delay=0.05), DummyEvent(delay=0.05)])
+
+    assert results == [0.05] * 6
+    assert time.perf_counter() - started_at < 0.2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_publish_aggregates_handler_errors():
+    mediator = create_mediator(DispatchStrategy.concurrent)
+
+    with pytest.raises(EventHandlersFailedException) as exception_info:
+        await mediator.publish([DummyEvent(error='boom')])
+
+    assert len(exception_info.value.errors) == 3
+    assert not isinstance(exception_info.value, ApplicationException)
+
+
+@dataclass
+class DerivedDummyEvent(DummyEvent):
+    ...
+
+
+@pytest.mark.asyncio
+async def test_publish_routes_subclassed_events_to_base_handlers():
+    mediator = create_mediator(DispatchStrategy.sequential)
+    mediator.register_event(DerivedDummyEvent, [DummyEventHandler(message_broker=None, connection_manager=None)])
+
+    assert await mediator.publish([DerivedDummyEvent(delay=0)]) == [0] * 4
+    assert await mediator.publish([DummyEvent(delay=0)]) == [0] * 3
+
+
+@pytest.mark.asyncio
+async def test_registering_handlers_recompiles_dispatch_tables():
+    mediator = Mediator()
+
+    assert await mediator.publish([DummyEvent()]) == []
+
+    mediator.register_event(DummyEvent, [DummyEventHandler(message_broker=None, connection_manager=None)])
+
+    assert await mediator.publish([DummyEvent()]) == [0]
+
+
+def test_container_builds_mediator_once(container: Container):
+    mediator = container.resolve(Mediator)
+
+    assert container.resolve(Mediator) is mediator
+    assert container.resolve(EventMediator) is mediator
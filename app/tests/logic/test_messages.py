@@ -1,12 +1,58 @@
+from dataclasses import (
+    dataclass,
+    field,
+)
+
 import pytest
 from faker import Faker
+from punq import Container
 
 from domain.entities.messages import Chat
+from domain.exceptions.chats import ListenerAlreadyExistException
 from domain.values.messages import Title
-from infra.repositories.messages.base import BaseChatsRepository
-from logic.commands.messages import CreateChatCommand
+from infra.caches import LRUTTLCache
+from infra.integrations.notifications.clients.base import BaseNotificationClient
+from infra.integrations.notifications.delivery import NotificationDeliveryWorker
+from infra.integrations.notifications.dtos import Notification
+from infra.message_brokers.base import BaseMessageBroker
+from infra.repositories.filters.messages import (
+    CountMode,
+    GetChatListenersFilters,
+    GetMessagesFilters,
+    MessagesCursor,
+)
+from infra.repositories.messages.base import (
+    BaseChatsRepository,
+    BaseMessagesRepository,
+)
+from logic.commands.messages import (
+    AddTelegramListenerCommand,
+    CreateChatCommand,
+    CreateMessageCommand,
+    CreateMessagesBatchCommand,
+)
+from logic.events.messages import (
+    ChatDeletedFromBrokerEvent,
+    ChatListenersNotificationEvent,
+)
 from logic.exceptions.messages import ChatWithThatTitleAlreadyExistException
 from logic.mediator.base import Mediator
+from logic.queries.messages import (
+    ExportMessagesQuery,
+    GetAllChatsListenersQuery,
+    GetMessagesQuery,
+)
+
+
+@dataclass
+class DummyNotificationClient(BaseNotificationClient):
+    sent: list[Notification] = field(default_factory=list)
+
+    async def _format_notification(self, notification: Notification) -> str:
+        return notification.text
+
+    async def send(self, notification: Notification):
+        self.sent.append(notification)
 
 
 @pytest.mark.asyncio
@@ -36,3 +82,150 @@ async def test_create_chat_command_title_already_exists(
         await mediator.handle_command(CreateChatCommand(title=title_text))
 
     assert len(chat_repository._saved_chats) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_messages_by_cursor(
+    mediator: Mediator,
+    faker: Faker,
+):
+    chat, *_ = await mediator.handle_command(CreateChatCommand(title=faker.text()))
+    created_messages = [
+        (await mediator.handle_command(CreateMessageCommand(text=faker.text(), chat_oid=chat.oid)))[0]
+        for _ in range(5)
+    ]
+    middle = created_messages[2]
+    cursor = MessagesCursor(created_at=middle.created_at, oid=middle.oid)
+
+    older, count = await mediator.handle_query(
+        GetMessagesQuery(chat_oid=chat.oid, filters=GetMessagesFilters(limit=10, before=cursor)),
+    )
+    newer, _ = await mediator.handle_query(
+        GetMessagesQuery(chat_oid=chat.oid, filters=GetMessagesFilters(limit=1, after=cursor)),
+    )
+
+    assert count == 5
+    assert [message['oid'] for message in older] == [message.oid for message in created_messages[:2]]
+    assert [message['oid'] for message in newer] == [created_messages[3].oid]
+
+
+@pytest.mark.asyncio
+async def test_get_messages_without_count(
+    mediator: Mediator,
+    faker: Faker,
+):
+    chat, *_ = await mediator.handle_command(CreateChatCommand(title=faker.text()))
+    await mediator.handle_command(CreateMessageCommand(text=faker.text(), chat_oid=chat.oid))
+
+    messages, count = await mediator.handle_query(
+        GetMessagesQuery(chat_oid=chat.oid, filters=GetMessagesFilters(count=CountMode.none)),
+    )
+
+    assert len(list(messages)) == 1
+    assert count is None
+
+
+def test_messages_cursor_round_trip(faker: Faker):
+    cursor = MessagesCursor(created_at=faker.date_time(), oid=faker.uuid4())
+
+    assert MessagesCursor.decode(cursor.encode()) == cursor
+
+    with pytest.raises(ValueError):
+        MessagesCursor.decode('not-a-cursor')
+
+
+@pytest.mark.asyncio
+async def test_chat_deleted_from_broker_invalidates_chats_cache(
+    container: Container,
+    mediator: Mediator,
+    faker: Faker,
+):
+    chats_cache: LRUTTLCache = container.resolve(LRUTTLCache)
+    chat_oid = faker.uuid4()
+    chats_cache.set(chat_oid, object())
+
+    await mediator.publish([ChatDeletedFromBrokerEvent(chat_oid=chat_oid)])
+
+    assert chats_cache.get(chat_oid) is None
+
+
+@pytest.mark.asyncio
+async def test_create_messages_batch_reports_invalid_texts(
+    container: Container,
+    mediator: Mediator,
+    faker: Faker,
+):
+    chat, *_ = await mediator.handle_command(CreateChatCommand(title=faker.text()))
+    texts = (faker.text(), '', faker.text())
+
+    results, *_ = await mediator.handle_command(CreateMessagesBatchCommand(texts=texts, chat_oid=chat.oid))
+
+    assert [result.error for result in results] == [None, 'Empty text', None]
+    assert [result.message.text.as_generic_type() for result in results if result.message] == [texts[0], texts[2]]
+
+    messages_repository: BaseMessagesRepository = container.resolve(BaseMessagesRepository)
+    messages, count = await messages_repository.get_messages(
+        chat_oid=chat.oid,
+        filters=GetMessagesFilters(count=CountMode.exact),
+    )
+    assert count == 2
+
+    message_broker: BaseMessageBroker = container.resolve(BaseMessageBroker)
+    assert len(message_broker.sent_messages) == 3
+
+
+@pytest.mark.asyncio
+async def test_export_messages_streams_chat_history_in_order(
+    mediator: Mediator,
+    faker: Faker,
+):
+    chat, *_ = await mediator.handle_command(CreateChatCommand(title=faker.text()))
+    texts = tuple(faker.text() for _ in range(5))
+    await mediator.handle_command(CreateMessagesBatchCommand(texts=texts, chat_oid=chat.oid))
+
+    messages = [message async for message in await mediator.handle_query(ExportMessagesQuery(chat_oid=chat.oid))]
+
+    assert sorted(message.text.as_generic_type() for message in messages) == sorted(texts)
+    assert messages == sorted(messages, key=lambda message: (message.created_at, message.oid))
+
+
+@pytest.mark.asyncio
+async def test_add_listener_rejects_duplicates_and_paginates(
+    mediator: Mediator,
+    faker: Faker,
+):
+    chat, *_ = await mediator.handle_command(CreateChatCommand(title=faker.text()))
+
+    for telegram_chat_id in ('1', '2', '3'):
+        await mediator.handle_command(AddTelegramListenerCommand(chat_oid=chat.oid, telegram_chat_id=telegram_chat_id))
+
+    with pytest.raises(ListenerAlreadyExistException):
+        await mediator.handle_command(AddTelegramListenerCommand(chat_oid=chat.oid, telegram_chat_id='2'))
+
+    listeners = await mediator.handle_query(
+        GetAllChatsListenersQuery(chat_oid=chat.oid, filters=GetChatListenersFilters(limit=2, offset=1)),
+    )
+
+    assert [listener.oid for listener in listeners] == ['2', '3']
+
+
+@pytest.mark.asyncio
+async def test_chat_listeners_notification_fans_out_to_every_listener(
+    container: Container,
+    faker: Faker,
+):
+    notification_worker = NotificationDeliveryWorker(client=DummyNotificationClient(), coalesce_window=60)
+    container.register(NotificationDeliveryWorker, instance=notification_worker)
+    mediator: Mediator = container.resolve(Mediator)
+
+    chat, *_ = await mediator.handle_command(CreateChatCommand(title=faker.text()))
+
+    for telegram_chat_id in ('1', '2'):
+        await mediator.handle_command(AddTelegramListenerCommand(chat_oid=chat.oid, telegram_chat_id=telegram_chat_id))
+
+    await mediator.publish([
+        ChatListenersNotificationEvent(message_text='hello', message_oid='message', chat_oid=chat.oid),
+    ])
+    await notification_worker.close()
+
+    assert sorted(notification.recipient_id for notification in notification_worker.client.sent) == ['1', '2']